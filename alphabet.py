@@ -0,0 +1,101 @@
+from array import array
+from typing import Dict, FrozenSet, Hashable, List, Set, Tuple
+from automaton import Automaton, NO_TRANSITION
+
+# Epsilon symbol of the NFA transition dicts; it is never put in a class
+EPSILON = 'e'
+
+# Members of each symbol class, each sorted, classes ordered by their first
+# member; a compressed automaton names class i by its first member
+SymbolClasses = List[List[str]]
+
+
+def nfa_symbol_classes(transitions: Dict[str, Dict[str, Set[str]]]) -> SymbolClasses:
+    """Partition an NFA's symbols into classes with the same targets from every state.
+
+    One pass over the transitions: each symbol's signature is the set of
+    (state, targets) pairs it labels, and symbols with equal signatures
+    are interchangeable for determinization.
+    """
+    signatures: Dict[str, List[Tuple[str, FrozenSet[str]]]] = {}
+    for state, sym_trans in transitions.items():
+        for sym, targets in sym_trans.items():
+            if sym == EPSILON:
+                continue
+            signature = signatures.setdefault(sym, [])
+            if targets:
+                signature.append((state, frozenset(targets)))
+    groups: Dict[FrozenSet[Tuple[str, FrozenSet[str]]], List[str]] = {}
+    for sym, signature in signatures.items():
+        groups.setdefault(frozenset(signature), []).append(sym)
+    return sorted(sorted(members) for members in groups.values())
+
+
+def dfa_symbol_classes(automaton: Automaton) -> SymbolClasses:
+    """Partition an Automaton's symbols into classes with identical table columns."""
+    k = automaton.num_symbols
+    table = automaton.table
+    groups: Dict[bytes, List[str]] = {}
+    for a in range(k):
+        groups.setdefault(table[a::k].tobytes(), []).append(automaton.symbols[a])
+    return sorted(sorted(members) for members in groups.values())
+
+
+def compress_nfa(transitions: Dict[str, Dict[str, Set[str]]],
+                 classes: SymbolClasses) -> Dict[str, Dict[str, Set[str]]]:
+    """The NFA transitions restricted to one representative symbol per class."""
+    keep = {members[0] for members in classes}
+    keep.add(EPSILON)
+    return {
+        state: {sym: targets for sym, targets in sym_trans.items() if sym in keep}
+        for state, sym_trans in transitions.items()
+    }
+
+
+def compress_automaton(automaton: Automaton, classes: SymbolClasses) -> Automaton:
+    """The Automaton with one column per class, named by the class representative."""
+    n, k, m = automaton.num_states, automaton.num_symbols, len(classes)
+    table = array('i', [NO_TRANSITION]) * (n * m)
+    for j, members in enumerate(classes):
+        a = automaton.symbol_id(members[0])
+        if a != NO_TRANSITION:
+            table[j::m] = automaton.table[a::k]
+    return Automaton(automaton.labels, [members[0] for members in classes], automaton.start,
+                     automaton.accepting, table)
+
+
+def expand_automaton(automaton: Automaton, classes: SymbolClasses) -> Automaton:
+    """Inverse of compress_automaton: every member symbol gets its class's column."""
+    n, m = automaton.num_states, automaton.num_symbols
+    symbols = sorted(sym for members in classes for sym in members)
+    column = {sym: automaton.symbol_id(members[0]) for members in classes for sym in members}
+    k = len(symbols)
+    table = array('i', [NO_TRANSITION]) * (n * k)
+    for a, sym in enumerate(symbols):
+        if column[sym] != NO_TRANSITION:
+            table[a::k] = automaton.table[column[sym]::m]
+    return Automaton(automaton.labels, symbols, automaton.start, automaton.accepting, table)
+
+
+def expand_transitions(transitions: Dict[Tuple[Hashable, str], Hashable],
+                       classes: SymbolClasses) -> Dict[Tuple[Hashable, str], Hashable]:
+    """Dict-format DFA transitions over representatives, expanded to every member symbol."""
+    members_of = {members[0]: members for members in classes}
+    return {
+        (state, sym): target
+        for (state, representative), target in transitions.items()
+        for sym in members_of[representative]
+    }
+
+
+def class_names(classes: SymbolClasses) -> List[str]:
+    """Compact display name of each class, runs of characters written as ranges (a-z)."""
+    from display import symbol_ranges
+    return [symbol_ranges(members) for members in classes]
+
+
+def with_class_names(automaton: Automaton, classes: SymbolClasses) -> Automaton:
+    """One column per class, named by class_names, for output (expanded or compressed input)."""
+    compressed = compress_automaton(automaton, classes)
+    return Automaton(compressed.labels, class_names(classes), compressed.start,
+                     compressed.accepting, compressed.table)
@@ -0,0 +1,150 @@
+from array import array
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+# Optional NumPy view of the transition table
+NUMPY_AVAILABLE = False
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+
+# Marker stored in the transition table for "no transition"
+NO_TRANSITION = -1
+
+
+class Automaton:
+    """Compact DFA: states and symbols are dense ints, transitions a flat table.
+
+    ``table[state * num_symbols + symbol]`` holds the target state id or
+    ``NO_TRANSITION``. ``labels`` and ``symbols`` map ids back to the original
+    state labels and symbol strings.
+    """
+
+    __slots__ = ("labels", "symbols", "start", "accepting", "table", "_symbol_ids", "_state_ids")
+
+    def __init__(
+        self,
+        labels: List[Hashable],
+        symbols: List[str],
+        start: int,
+        accepting: bytearray,
+        table: array
+    ):
+        self.labels = labels
+        self.symbols = symbols
+        self.start = start
+        self.accepting = accepting
+        self.table = table
+        self._symbol_ids = {sym: i for i, sym in enumerate(symbols)}
+        self._state_ids = None
+
+    @property
+    def num_states(self) -> int:
+        return len(self.labels)
+
+    @property
+    def num_symbols(self) -> int:
+        return len(self.symbols)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __repr__(self) -> str:
+        return f"Automaton(states={self.num_states}, symbols={self.num_symbols}, start={self.start})"
+
+    def symbol_id(self, symbol: str) -> int:
+        """Id of a symbol, or NO_TRANSITION if it is not in the alphabet."""
+        return self._symbol_ids.get(symbol, NO_TRANSITION)
+
+    def state_id(self, label: Hashable) -> int:
+        """Id of a state label (index built on first use)."""
+        if self._state_ids is None:
+            self._state_ids = {label: i for i, label in enumerate(self.labels)}
+        return self._state_ids[label]
+
+    def next_state(self, state: int, symbol: int) -> int:
+        return self.table[state * len(self.symbols) + symbol]
+
+    def is_final(self, state: int) -> bool:
+        return bool(self.accepting[state])
+
+    def finals(self) -> List[int]:
+        return [i for i, flag in enumerate(self.accepting) if flag]
+
+    def num_transitions(self) -> int:
+        return sum(1 for target in self.table if target != NO_TRANSITION)
+
+    def iter_transitions(self) -> Iterator[Tuple[int, int, int]]:
+        """Yield (from_id, symbol_id, to_id) for every defined transition."""
+        k = len(self.symbols)
+        for index, target in enumerate(self.table):
+            if target != NO_TRANSITION:
+                yield index // k, index % k, target
+
+    def as_numpy(self) -> Any:
+        """Transition table as a (states, symbols) int32 NumPy array (a view, no copy)."""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy is not installed")
+        return np.frombuffer(self.table, dtype=np.int32).reshape(len(self.labels), len(self.symbols))
+
+    @classmethod
+    def from_dict(
+        cls,
+        states: Set[Hashable],
+        start: Hashable,
+        finals: Set[Hashable],
+        transitions: Dict[Tuple[Hashable, str], Hashable]
+    ) -> "Automaton":
+        """Build from the (states, start, finals, transitions) tuple used across the toolkit."""
+        labels = list(states)
+        state_ids = {label: i for i, label in enumerate(labels)}
+        # States referenced only by transitions still get an id
+        for (from_state, _), to_state in transitions.items():
+            for label in (from_state, to_state):
+                if label not in state_ids:
+                    state_ids[label] = len(labels)
+                    labels.append(label)
+        if start not in state_ids:
+            state_ids[start] = len(labels)
+            labels.append(start)
+
+        symbols = sorted({sym for (_, sym) in transitions.keys()})
+        symbol_ids = {sym: i for i, sym in enumerate(symbols)}
+        k = len(symbols)
+
+        table = array('i', [NO_TRANSITION]) * (len(labels) * k)
+        for (from_state, sym), to_state in transitions.items():
+            table[state_ids[from_state] * k + symbol_ids[sym]] = state_ids[to_state]
+
+        accepting = bytearray(len(labels))
+        for label in finals:
+            if label in state_ids:
+                accepting[state_ids[label]] = 1
+
+        automaton = cls(labels, symbols, state_ids[start], accepting, table)
+        automaton._state_ids = state_ids
+        return automaton
+
+    def to_dict(self) -> Tuple[Set[Hashable], Hashable, Set[Hashable], Dict[Tuple[Hashable, str], Hashable]]:
+        """Convert back to the (states, start, finals, transitions) tuple format."""
+        labels = self.labels
+        symbols = self.symbols
+        transitions = {
+            (labels[from_id], symbols[sym_id]): labels[to_id]
+            for from_id, sym_id, to_id in self.iter_transitions()
+        }
+        finals = {labels[i] for i, flag in enumerate(self.accepting) if flag}
+        return set(labels), labels[self.start], finals, transitions
+
+
+def as_automaton(
+    states: Any,
+    start: Optional[Hashable] = None,
+    finals: Optional[Set[Hashable]] = None,
+    transitions: Optional[Dict[Tuple[Hashable, str], Hashable]] = None
+) -> Automaton:
+    """Accept either an Automaton or the dict format and return an Automaton."""
+    if isinstance(states, Automaton):
+        return states
+    return Automaton.from_dict(states, start, finals, transitions)
@@ -0,0 +1,274 @@
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Set, Tuple
+from automaton import Automaton
+from dfa_minimizer import minimize_dfa
+from nfa_to_dfa import convert_nfa_to_dfa, StateLimitExceeded
+
+NFA = Tuple[Set[str], str, Set[str], Dict[str, Dict[str, Set[str]]]]
+
+DEFAULT_CHECKPOINT = "batch_checkpoint.json"
+
+
+class JobTimeout(Exception):
+    pass
+
+
+def parse_id_range(text: Optional[str]) -> Tuple[int, float]:
+    """Parse an id range such as 10-200, 10- or 42 into inclusive bounds."""
+    if not text:
+        return 0, float("inf")
+    low, sep, high = text.partition("-")
+    if not sep:
+        return int(low), int(low)
+    return int(low or 0), int(high) if high else float("inf")
+
+
+def select_jobs(source: str, id_range: Tuple[int, float], name_filter: Optional[str]) -> List[Tuple[int, str]]:
+    """(id, name) of the NFAs to process, in id order.
+
+    source "v2" reads AutomataDB.fetch_nfas, "v3" the NFA rows of the
+    FiniteAutomatonDBV3 Automata table.
+    """
+    if source == "v2":
+        from database import AutomataDB
+        candidates = AutomataDB().fetch_nfas()
+    else:
+        from db_operation import list_NFA
+        from db_config import db_config
+        candidates = [(row["automaton_id"], row["name"]) for row in list_NFA(db_config) or []]
+    low, high = id_range
+    return sorted(
+        (nfa_id, name) for nfa_id, name in candidates
+        if low <= nfa_id <= high and (not name_filter or name_filter in name)
+    )
+
+
+def _v3_nfa(fa_data: Dict[str, Any]) -> NFA:
+    """NFA tuple of a load_fa record; the "nt" pseudo-state means no transition."""
+    transitions: Dict[str, Dict[str, Set[str]]] = {}
+    for from_state, symbol, to_state in fa_data["transitions"]:
+        if from_state != "nt" and to_state != "nt":
+            transitions.setdefault(from_state, {}).setdefault(symbol, set()).add(to_state)
+    states = {s for s in fa_data["states"] if s != "nt"}
+    finals = {s for s in fa_data["acceptingStates"] if s != "nt"}
+    return states, fa_data["startState"], finals, transitions
+
+
+_worker_db = None
+
+
+def _load_nfa(source: str, nfa_id: int) -> Optional[NFA]:
+    global _worker_db
+    if source == "v2":
+        if _worker_db is None:
+            from database import AutomataDB
+            _worker_db = AutomataDB(pool_size=1)
+        nfa = _worker_db.fetch_nfa(nfa_id)
+        return nfa if nfa[0] else None
+    from db_operation import load_fa
+    from db_config import db_config
+    fa_data = load_fa(nfa_id, db_config)
+    return _v3_nfa(fa_data) if fa_data else None
+
+
+def _on_alarm(signum, frame):
+    raise JobTimeout()
+
+
+def run_job(source: str, nfa_id: int, timeout: Optional[float], max_states: Optional[int]) -> Dict[str, Any]:
+    """Load, convert and minimize one NFA in a worker process.
+
+    The timeout covers conversion and minimization and is enforced with
+    SIGALRM where the platform has it. The minimized DFA is returned with
+    states relabelled q0, q1, ... so it fits the VARCHAR state columns.
+    """
+    result: Dict[str, Any] = {"id": nfa_id, "status": "ok", "timings": {}}
+    started = time.perf_counter()
+    nfa = _load_nfa(source, nfa_id)
+    result["timings"]["load"] = time.perf_counter() - started
+    if nfa is None:
+        result["status"] = "missing"
+        return result
+    result["nfa_states"] = len(nfa[0])
+
+    use_alarm = timeout and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        started = time.perf_counter()
+        dfa = convert_nfa_to_dfa(*nfa, compact=True, max_states=max_states)
+        result["timings"]["convert"] = time.perf_counter() - started
+        result["dfa_states"] = dfa.num_states
+        started = time.perf_counter()
+        # Complete DFAs, like the ones main.py saves
+        minimized = minimize_dfa(dfa, prune=False)
+        result["timings"]["minimize"] = time.perf_counter() - started
+    except JobTimeout:
+        result["status"] = "timeout"
+        return result
+    except StateLimitExceeded as err:
+        result["status"] = "too_large"
+        result["error"] = str(err)
+        return result
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    result["min_states"] = minimized.num_states
+    result["dfa"] = Automaton([f"q{i}" for i in range(minimized.num_states)], minimized.symbols,
+                              minimized.start, minimized.accepting, minimized.table)
+    return result
+
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    try:
+        with open(path) as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return {"done": {}, "failed": {}}
+    return {"done": checkpoint.get("done", {}), "failed": checkpoint.get("failed", {})}
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Any]) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(checkpoint, f, indent=1, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+class BatchRunner:
+    """Convert and minimize many stored NFAs, saving results in bulk.
+
+    Finished jobs are buffered and written with AutomataDB.save_dfas every
+    ``flush_every`` results; the checkpoint is rewritten after each flush, so
+    an interrupted run resumes without redoing or duplicating saved work.
+    With save=False (a dry run) the checkpoint is read but never written.
+    """
+
+    def __init__(self, source: str = "v2", workers: Optional[int] = None, timeout: Optional[float] = None,
+                 max_states: Optional[int] = None, checkpoint_path: str = DEFAULT_CHECKPOINT,
+                 flush_every: int = 50, save: bool = True, hash_language: bool = True):
+        self.source = source
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_states = max_states
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint = load_checkpoint(checkpoint_path)
+        self.flush_every = flush_every
+        self.hash_language = hash_language
+        self.db = None
+        if save:
+            from database import AutomataDB
+            self.db = AutomataDB()
+        self.pending: List[Tuple[Dict[str, Any], str]] = []
+        self.counts = {"ok": 0, "timeout": 0, "too_large": 0, "missing": 0, "error": 0}
+        self.states_processed = 0
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        if self.db is None:
+            # Dry run: nothing was saved, so nothing may be marked done
+            self.pending.clear()
+            return
+        # Only V2 NFAs can be referenced by DFAs.source_nfa_id
+        dfa_ids = self.db.save_dfas([
+            (f"{name} (minimized)", result["dfa"], result["id"] if self.source == "v2" else None)
+            for result, name in self.pending
+        ], minimal=True, hash_language=self.hash_language)
+        if not dfa_ids:
+            print(f"Bulk save of {len(self.pending)} DFAs failed; they will be rerun on resume")
+            self.pending.clear()
+            return
+        for (result, _), dfa_id in zip(self.pending, dfa_ids):
+            self.checkpoint["done"][str(result["id"])] = dfa_id
+            self.checkpoint["failed"].pop(str(result["id"]), None)
+        self.pending.clear()
+        save_checkpoint(self.checkpoint_path, self.checkpoint)
+
+    def record(self, result: Dict[str, Any], name: str) -> None:
+        status = result["status"]
+        self.counts[status] = self.counts.get(status, 0) + 1
+        timings = result["timings"]
+        print(f"{result['id']:>8} {status:<10} {result.get('nfa_states', '-'):>8} {result.get('dfa_states', '-'):>8} "
+              f"{result.get('min_states', '-'):>8} " +
+              " ".join(f"{timings.get(p, 0.0):>8.3f}" for p in ("load", "convert", "minimize")))
+        if status == "ok":
+            self.states_processed += result["dfa_states"]
+            self.pending.append((result, name))
+            if len(self.pending) >= self.flush_every:
+                self.flush()
+        elif self.db is not None:
+            self.checkpoint["failed"][str(result["id"])] = result.get("error", status)
+            save_checkpoint(self.checkpoint_path, self.checkpoint)
+
+    def run(self, jobs: List[Tuple[int, str]], retry_failed: bool = False) -> int:
+        skip = set(self.checkpoint["done"])
+        if not retry_failed:
+            skip |= set(self.checkpoint["failed"])
+        todo = [(nfa_id, name) for nfa_id, name in jobs if str(nfa_id) not in skip]
+        print(f"{len(todo)} of {len(jobs)} NFAs to process ({len(jobs) - len(todo)} already in the checkpoint)")
+        print(f"{'id':>8} {'status':<10} {'nfa':>8} {'dfa':>8} {'min':>8} {'load':>8} {'convert':>8} {'minimize':>8}")
+
+        started = time.perf_counter()
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            futures = {
+                executor.submit(run_job, self.source, nfa_id, self.timeout, self.max_states): (nfa_id, name)
+                for nfa_id, name in todo
+            }
+            for future in as_completed(futures):
+                nfa_id, name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as err:
+                    result = {"id": nfa_id, "status": "error", "error": repr(err), "timings": {}}
+                self.record(result, name)
+        except KeyboardInterrupt:
+            print("Interrupted; saving finished jobs to the checkpoint")
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.flush()
+            return 130
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.flush()
+
+        elapsed = time.perf_counter() - started
+        finished = sum(self.counts.values())
+        print(f"\nProcessed {finished} NFAs in {elapsed:.2f}s "
+              f"({finished / elapsed if elapsed > 0 else 0:.1f} jobs/s, "
+              f"{self.states_processed / elapsed if elapsed > 0 else 0:.0f} DFA states/s)")
+        print(", ".join(f"{status}: {count}" for status, count in self.counts.items()))
+        return 0 if finished == self.counts["ok"] else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert and minimize stored NFAs in bulk")
+    parser.add_argument("--source", choices=["v2", "v3"], default="v2",
+                        help="AutomataDB NFAs table (v2) or the V3 Automata table")
+    parser.add_argument("--ids", help="inclusive id range, e.g. 10-200, 500- or 42")
+    parser.add_argument("--name", help="only NFAs whose name contains this text")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per job")
+    parser.add_argument("--max-states", type=int, default=None,
+                        help="give up on NFAs whose DFA exceeds this many states")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--flush-every", type=int, default=50, help="results per bulk insert")
+    parser.add_argument("--retry-failed", action="store_true", help="rerun jobs the checkpoint marks as failed")
+    parser.add_argument("--dry-run", action="store_true", help="do not save DFAs or write the checkpoint")
+    parser.add_argument("--no-hashes", action="store_true",
+                        help="save without language hashes (fill them in later with backfill_language_hashes)")
+    args = parser.parse_args()
+
+    runner = BatchRunner(args.source, args.workers, args.timeout, args.max_states,
+                         args.checkpoint, args.flush_every, save=not args.dry_run,
+                         hash_language=not args.no_hashes)
+    jobs = select_jobs(args.source, parse_id_range(args.ids), args.name)
+    sys.exit(runner.run(jobs, args.retry_failed))
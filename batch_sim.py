@@ -0,0 +1,173 @@
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Set, Tuple, Union
+import sys
+import time
+from automaton import Automaton, as_automaton
+
+# Conditional import: NumPy drives the vectorized path, plain Python is the fallback
+NUMPY_AVAILABLE = False
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+
+DFATuple = Tuple[Set[Hashable], Hashable, Set[Hashable], Dict[Tuple[Hashable, str], Hashable]]
+
+
+class CompiledDFA:
+    """Dense transition table ready for batch simulation.
+
+    Row ``sink`` is an absorbing rejecting state used for missing transitions.
+    Column ``unknown`` is taken by symbols outside the alphabet and column
+    ``pad`` leaves every state unchanged, so padded positions are no-ops.
+    """
+
+    __slots__ = ("symbol_ids", "start", "sink", "unknown", "pad", "width", "table", "accepting", "char_lookup")
+
+    def __init__(self, automaton: Automaton):
+        n = automaton.num_states
+        k = automaton.num_symbols
+        self.symbol_ids = {sym: i for i, sym in enumerate(automaton.symbols)}
+        self.start = automaton.start
+        self.sink = n
+        self.unknown = k
+        self.pad = k + 1
+        self.width = k + 2
+
+        table = [self.sink] * ((n + 1) * self.width)
+        for q in range(n + 1):
+            table[q * self.width + self.pad] = q
+        for from_id, sym_id, to_id in automaton.iter_transitions():
+            table[from_id * self.width + sym_id] = to_id
+        accepting = list(automaton.accepting) + [0]
+
+        # Single-character alphabets can be encoded straight from code points
+        self.char_lookup = None
+        if NUMPY_AVAILABLE:
+            self.table = np.array(table, dtype=np.int32)
+            self.accepting = np.array(accepting, dtype=bool)
+            if all(isinstance(sym, str) and len(sym) == 1 for sym in automaton.symbols):
+                top = max((ord(sym) for sym in automaton.symbols), default=0) + 1
+                lookup = np.full(top + 1, self.unknown, dtype=np.int32)
+                for sym, i in self.symbol_ids.items():
+                    lookup[ord(sym)] = i
+                self.char_lookup = lookup
+        else:
+            self.table = table
+            self.accepting = [bool(flag) for flag in accepting]
+
+
+def compile_dfa(
+    dfa: Union[Automaton, DFATuple, CompiledDFA]
+) -> CompiledDFA:
+    """Compile minimize_dfa / fetch_dfa output (or an Automaton) for batch runs."""
+    if isinstance(dfa, CompiledDFA):
+        return dfa
+    if isinstance(dfa, Automaton):
+        return CompiledDFA(dfa)
+    return CompiledDFA(as_automaton(*dfa))
+
+
+def _encode(compiled: CompiledDFA, strings: Sequence[Sequence[str]], lengths: Any) -> Any:
+    """Flat array of symbol ids for the concatenation of ``strings``."""
+    total = int(lengths.sum())
+    if compiled.char_lookup is not None and all(isinstance(s, str) for s in strings):
+        codes = np.frombuffer("".join(strings).encode("utf-32-le"), dtype=np.uint32)
+        codes = np.minimum(codes, len(compiled.char_lookup) - 1)
+        return compiled.char_lookup[codes]
+    symbol_ids = compiled.symbol_ids
+    unknown = compiled.unknown
+    return np.fromiter((symbol_ids.get(sym, unknown) for s in strings for sym in s), dtype=np.int32, count=total)
+
+
+def _simulate_numpy(compiled: CompiledDFA, strings: Sequence[Sequence[str]]) -> Any:
+    count = len(strings)
+    if count == 0:
+        return np.zeros(0, dtype=bool)
+    lengths = np.fromiter(map(len, strings), dtype=np.int64, count=count)
+    width = int(lengths.max())
+
+    # Padded (strings x positions) matrix, row-major fill matches concatenation order
+    matrix = np.full((count, width), compiled.pad, dtype=np.int32)
+    if width:
+        matrix[np.arange(width) < lengths[:, None]] = _encode(compiled, strings, lengths)
+
+    # Longest strings first: at position j only the first ``active`` rows still read input
+    order = np.argsort(-lengths, kind="stable")
+    matrix = matrix[order]
+    sorted_lengths = lengths[order]
+    ascending = sorted_lengths[::-1]
+    current = np.full(count, compiled.start, dtype=np.int64)
+    for j in range(width):
+        active = count - int(np.searchsorted(ascending, j, side="right"))
+        rows = current[:active]
+        current[:active] = compiled.table[rows * compiled.width + matrix[:active, j]]
+
+    result = np.empty(count, dtype=bool)
+    result[order] = compiled.accepting[current]
+    return result
+
+
+def _simulate_python(compiled: CompiledDFA, strings: Sequence[Sequence[str]]) -> List[bool]:
+    table = compiled.table
+    width = compiled.width
+    symbol_ids = compiled.symbol_ids
+    unknown = compiled.unknown
+    sink = compiled.sink
+    results = []
+    for string in strings:
+        state = compiled.start
+        for sym in string:
+            state = table[state * width + symbol_ids.get(sym, unknown)]
+            if state == sink:
+                break
+        results.append(compiled.accepting[state])
+    return results
+
+
+def simulate_batch(
+    dfa: Union[Automaton, DFATuple, CompiledDFA],
+    strings: Sequence[Sequence[str]],
+    batch_size: int = 100000,
+    stats: Optional[Dict[str, float]] = None
+) -> Any:
+    """Acceptance of every string as a boolean array (a list without NumPy).
+
+    Strings are processed ``batch_size`` at a time; every batch advances all
+    of its strings one position per step. If ``stats`` is given it receives
+    the string count, elapsed seconds and strings per second.
+    """
+    compiled = compile_dfa(dfa)
+    started = time.perf_counter()
+    if NUMPY_AVAILABLE:
+        parts = [_simulate_numpy(compiled, strings[i:i + batch_size]) for i in range(0, len(strings), batch_size)]
+        result = np.concatenate(parts) if parts else np.zeros(0, dtype=bool)
+    else:
+        result = _simulate_python(compiled, strings)
+    elapsed = time.perf_counter() - started
+
+    if stats is not None:
+        stats["strings"] = len(strings)
+        stats["seconds"] = elapsed
+        stats["strings_per_second"] = len(strings) / elapsed if elapsed > 0 else float("inf")
+    return result
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python batch_sim.py <dfa_id> <words_file>")
+        sys.exit(1)
+
+    from database import AutomataDB
+
+    dfa = AutomataDB().fetch_dfa(int(sys.argv[1]))
+    if not dfa[0]:
+        print("NOT_FOUND")
+        sys.exit(1)
+    with open(sys.argv[2]) as f:
+        words = [line.rstrip("\n") for line in f]
+
+    stats = {}
+    accepted = simulate_batch(dfa, words, stats=stats)
+    print(f"Accepted {int(sum(accepted))} of {len(words)} strings")
+    print(f"Throughput: {stats['strings_per_second']:.0f} strings/s")
@@ -0,0 +1,520 @@
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from typing import Any, Callable, Dict, List, Set, Tuple
+from automaton import Automaton
+from dfa_minimizer import minimize_dfa
+
+NFA = Tuple[Set[str], str, Set[str], Dict[str, Dict[str, Set[str]]]]
+
+
+def random_dfa(num_states: int, num_symbols: int, seed: int = 0, final_ratio: float = 0.3) -> Automaton:
+    """Complete random DFA over symbols s0..s{k-1} as an Automaton."""
+    rng = random.Random(seed)
+    table = array('i', (rng.randrange(num_states) for _ in range(num_states * num_symbols)))
+    accepting = bytearray(1 if rng.random() < final_ratio else 0 for _ in range(num_states))
+    labels = [f"q{i}" for i in range(num_states)]
+    symbols = [f"s{a}" for a in range(num_symbols)]
+    return Automaton(labels, symbols, 0, accepting, table)
+
+
+def random_nfa(num_states: int, num_symbols: int = 2, density: float = 1.5,
+               epsilon_ratio: float = 0.1, seed: int = 0, final_ratio: float = 0.2) -> NFA:
+    """Random NFA: each (state, symbol) has on average ``density`` targets.
+
+    ``epsilon_ratio`` is the share of states that also get 'e' moves.
+    """
+    rng = random.Random(seed)
+    states = [f"n{i}" for i in range(num_states)]
+    symbols = [f"s{a}" for a in range(num_symbols)]
+    transitions: Dict[str, Dict[str, Set[str]]] = {}
+    for state in states:
+        for sym in symbols:
+            targets = {rng.choice(states) for _ in range(max(int(rng.expovariate(1 / density)), 0))}
+            if targets:
+                transitions.setdefault(state, {})[sym] = targets
+        if rng.random() < epsilon_ratio:
+            transitions.setdefault(state, {})['e'] = {rng.choice(states)}
+    finals = {state for state in states if rng.random() < final_ratio} or {states[-1]}
+    return set(states), states[0], finals, transitions
+
+
+def nth_from_end_nfa(n: int) -> NFA:
+    """NFA for "the n-th symbol from the end is a" over {a, b}; its DFA has 2^n states."""
+    states = [f"p{i}" for i in range(n + 1)]
+    transitions = {"p0": {"a": {"p0", "p1"}, "b": {"p0"}}}
+    for i in range(1, n):
+        transitions[states[i]] = {"a": {states[i + 1]}, "b": {states[i + 1]}}
+    return set(states), "p0", {states[n]}, transitions
+
+
+def widen_alphabet(nfa: NFA, copies: int) -> NFA:
+    """Replace every symbol s by ``copies`` interchangeable symbols s.0, s.1, ..."""
+    states, start, finals, transitions = nfa
+    wide = {
+        state: {(sym if sym == 'e' else f"{sym}.{i}"): targets
+                for sym, targets in sym_trans.items() for i in range(1 if sym == 'e' else copies)}
+        for state, sym_trans in transitions.items()
+    }
+    return states, start, finals, wide
+
+
+def measure(stage: str, params: Dict[str, Any], run: Callable[[], Tuple[int, int]],
+            track_memory: bool = True) -> Dict[str, Any]:
+    """Time ``run`` (which returns the states and transitions it processed).
+
+    Peak memory comes from a second, tracemalloc-instrumented run so the
+    timing is not distorted by tracing.
+    """
+    started = time.perf_counter()
+    states, transitions = run()
+    elapsed = time.perf_counter() - started
+    peak = None
+    if track_memory:
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    result = {
+        "stage": stage,
+        "params": params,
+        "seconds": elapsed,
+        "peak_memory_bytes": peak,
+        "states": states,
+        "transitions": transitions,
+        "states_per_second": states / elapsed if elapsed > 0 else None,
+        "transitions_per_second": transitions / elapsed if elapsed > 0 else None,
+    }
+    print(f"{stage:<10} {json.dumps(params, sort_keys=True):<60} {elapsed:>9.4f}s "
+          f"{(peak or 0) / 1e6:>9.1f} MB")
+    return result
+
+
+def _nfa_transition_count(nfa: NFA) -> int:
+    return sum(len(targets) for sym_trans in nfa[3].values() for targets in sym_trans.values())
+
+
+def run_suite(scale: float, seed: int, track_memory: bool, with_db: bool) -> List[Dict[str, Any]]:
+    """Every pipeline stage on generated automata; returns one record per case."""
+    import io
+    from contextlib import redirect_stdout
+    from display import format_state, print_automaton
+    from nfa_to_dfa import convert_nfa_to_dfa, epsilon_closure
+
+    results = []
+    sizes = [max(int(n * scale), 2) for n in (200, 2000)]
+
+    for n in sizes:
+        for epsilon_ratio in (0.1, 0.5):
+            nfa = random_nfa(n, 2, density=1.2, epsilon_ratio=epsilon_ratio, seed=seed)
+            params = {"nfa_states": n, "epsilon_ratio": epsilon_ratio}
+
+            def closures(nfa=nfa):
+                for state in nfa[0]:
+                    epsilon_closure({state}, nfa[3])
+                return len(nfa[0]), _nfa_transition_count(nfa)
+            results.append(measure("closure", params, closures, track_memory))
+
+    for n in sizes:
+        nfa = random_nfa(n, 2, density=1.0, epsilon_ratio=0.1, seed=seed)
+        for engine in ("bitset", "set"):
+            def convert(nfa=nfa, engine=engine):
+                dfa_states, _, _, dfa_transitions = convert_nfa_to_dfa(*nfa, engine=engine)
+                return len(dfa_states), len(dfa_transitions)
+            results.append(measure("convert", {"nfa_states": n, "family": "random", "engine": engine},
+                                   convert, track_memory))
+
+    for k in (8, 12):
+        nfa = nth_from_end_nfa(max(int(k + math.log2(max(scale, 1e-9))), 2))
+        for engine in ("bitset", "set"):
+            def blowup(nfa=nfa, engine=engine):
+                dfa_states, _, _, dfa_transitions = convert_nfa_to_dfa(*nfa, engine=engine)
+                return len(dfa_states), len(dfa_transitions)
+            results.append(measure("convert", {"n": len(nfa[0]) - 1, "family": "nth_from_end", "engine": engine},
+                                   blowup, track_memory))
+
+    for n in [max(int(n * scale), 2) for n in (10000, 100000)]:
+        dfa = random_dfa(n, 2, seed)
+
+        def minimize(dfa=dfa):
+            minimize_dfa(dfa)
+            return dfa.num_states, dfa.num_transitions()
+        results.append(measure("minimize", {"dfa_states": n, "engine": "hopcroft"}, minimize, track_memory))
+
+    for n in [max(int(n * scale), 2) for n in (1000, 10000)]:
+        dfa = convert_nfa_to_dfa(*random_nfa(n, 2, density=1.0, epsilon_ratio=0.1, seed=seed))
+
+        def printing(dfa=dfa):
+            with redirect_stdout(io.StringIO()):
+                print_automaton(*dfa, title="Benchmark")
+            return len(dfa[0]), len(dfa[3])
+        results.append(measure("print", {"dfa_states": len(dfa[0])}, printing, track_memory))
+
+        def formatting(dfa=dfa):
+            for state in dfa[0]:
+                format_state(state)
+            return len(dfa[0]), 0
+        results.append(measure("format", {"dfa_states": len(dfa[0])}, formatting, track_memory))
+
+    if with_db:
+        from database import AutomataDB
+
+        db = AutomataDB(batch_size=5000)
+        if db.connect() is None:
+            print("Skipping database stages: MySQL is not reachable")
+        else:
+            for n in [max(int(n * scale), 2) for n in (1000, 20000)]:
+                dfa = random_dfa(n, 2, seed)
+                saved = []
+
+                def save(dfa=dfa, saved=saved):
+                    saved.append(db.save_dfa("benchmark suite", dfa))
+                    return dfa.num_states, dfa.num_transitions()
+                results.append(measure("db_save", {"dfa_states": n}, save, False))
+
+                def fetch(saved=saved):
+                    states, _, _, transitions = db.fetch_dfa(saved[-1])
+                    return len(states), len(transitions)
+                results.append(measure("db_fetch", {"dfa_states": n}, fetch, track_memory))
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def write_results(path: str, results: List[Dict[str, Any]]) -> None:
+    with open(path, "w") as f:
+        json.dump({
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {path}")
+
+
+def compare_results(baseline_path: str, current_path: str, threshold: float) -> int:
+    """Print per-case time ratios; returns 1 if any case slowed down past threshold."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(current_path) as f:
+        current = json.load(f)
+
+    def key(record):
+        return record["stage"], json.dumps(record["params"], sort_keys=True)
+
+    before = {key(r): r for r in baseline["results"]}
+    regressions = 0
+    print(f"{baseline.get('commit', '?')} -> {current.get('commit', '?')}")
+    for record in current["results"]:
+        old = before.get(key(record))
+        if old is None or not old["seconds"]:
+            continue
+        ratio = record["seconds"] / old["seconds"]
+        flag = "  REGRESSION" if ratio > 1 + threshold else ""
+        regressions += bool(flag)
+        print(f"{record['stage']:<10} {key(record)[1]:<60} {ratio:>6.2f}x{flag}")
+    return 1 if regressions else 0
+
+
+def bench_minimize(sizes, num_symbols: int, engine: str, seed: int) -> None:
+    print(f"{'states':>10} {'transitions':>12} {'seconds':>10} {'us/(m log n)':>14}")
+    for n in sizes:
+        dfa = random_dfa(n, num_symbols, seed)
+        started = time.perf_counter()
+        minimize_dfa(dfa, engine=engine)
+        elapsed = time.perf_counter() - started
+        m = n * num_symbols
+        per_unit = elapsed * 1e6 / (m * max(math.log2(n), 1))
+        print(f"{n:>10} {m:>12} {elapsed:>10.3f} {per_unit:>14.3f}")
+
+
+def bench_parallel(n: int, max_workers: int) -> None:
+    """Scaling of the parallel subset construction on the 2^n-state blowup family."""
+    from nfa_to_dfa import convert_nfa_to_dfa
+    nfa = nth_from_end_nfa(n)
+    started = time.perf_counter()
+    convert_nfa_to_dfa(*nfa, compact=True)
+    serial = time.perf_counter() - started
+    print(f"n={n}: {2 ** n} DFA states, bitset engine {serial:.3f}s, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'seconds':>10} {'speedup':>8}")
+    for workers in range(1, max_workers + 1):
+        started = time.perf_counter()
+        convert_nfa_to_dfa(*nfa, compact=True, engine="parallel", workers=workers)
+        elapsed = time.perf_counter() - started
+        note = "  (more workers than CPUs)" if workers > (os.cpu_count() or 1) else ""
+        print(f"{workers:>8} {elapsed:>10.3f} {serial / elapsed:>7.2f}x{note}")
+
+
+def calibrate_parallel(n: int, worker_counts: List[int], repeat: int = 15) -> None:
+    """Break-even frontier size of the parallel engine, from measured costs.
+
+    A level of F subsets costs F * c in the parent. Farmed out to W workers
+    it costs d_W + F * (e + c / W): d_W is the fixed cost of one pool.map
+    over the engine's W * 4 chunks and e the per-subset pickling cost. Both
+    are fitted from a one-process pool, so this runs on any machine; the
+    level is worth farming out once F > d_W / (c * (1 - 1/W) - e).
+    """
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    from nfa_to_dfa import _expand_chunk, _init_worker, _prepare_bitset, _successors
+    _, _, step, _, initial = _prepare_bitset(*nth_from_end_nfa(n))
+    masks, seen, queue = [], {initial}, deque([initial])
+    while queue:
+        current = queue.popleft()
+        masks.append(current)
+        for target in _successors(step, current):
+            if target and target not in seen:
+                seen.add(target)
+                queue.append(target)
+    started = time.perf_counter()
+    for current in masks:
+        _successors(step, current)
+    c = (time.perf_counter() - started) / len(masks)
+    print(f"serial expansion c = {c * 1e6:.2f} us/subset ({len(masks)} subsets)")
+    print(f"{'workers':>8} {'d_W us':>8} {'e us':>6} {'break-even':>11}")
+    frontier_sizes = [size for size in (16, 64, 256, 1024, 4096) if size <= len(masks)]
+    with ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(step,)) as pool:
+        list(pool.map(_expand_chunk, [[initial]]))
+        for workers in worker_counts:
+            points = []
+            for size in frontier_sizes:
+                chunk = -(-size // (workers * 4))
+                chunks = [masks[i:i + chunk] for i in range(0, size, chunk)]
+                times = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    list(pool.map(_expand_chunk, chunks))
+                    times.append(time.perf_counter() - started)
+                times.sort()
+                points.append((size, times[len(times) // 2] - size * c))
+            # Least-squares line through (F, overhead): intercept d_W, slope e
+            mean_f = sum(f for f, _ in points) / len(points)
+            mean_t = sum(t for _, t in points) / len(points)
+            e = (sum((f - mean_f) * (t - mean_t) for f, t in points) /
+                 sum((f - mean_f) ** 2 for f, _ in points))
+            d = mean_t - e * mean_f
+            gain = c * (1 - 1 / workers) - e
+            break_even = f"{d / gain:>11.0f}" if gain > 0 else f"{'never':>11}"
+            print(f"{workers:>8} {d * 1e6:>8.0f} {e * 1e6:>6.2f} {break_even}")
+
+
+def bench_alphabet(sizes, num_symbols: int, copies: int, seed: int) -> None:
+    """Convert and minimize over a widened alphabet, with and without symbol classes."""
+    from nfa_to_dfa import convert_nfa_to_dfa
+    print(f"{'nfa':>8} {'symbols':>8} {'classes':>8} {'dfa':>8} {'convert s':>10} {'minimize s':>11}")
+    for n in sizes:
+        nfa = widen_alphabet(random_nfa(n, num_symbols, density=1.0, epsilon_ratio=0.1, seed=seed), copies)
+        results = []
+        for compress in (False, True):
+            started = time.perf_counter()
+            dfa = convert_nfa_to_dfa(*nfa, compact=True, compress_alphabet=compress)
+            convert_time = time.perf_counter() - started
+            started = time.perf_counter()
+            minimal = minimize_dfa(dfa, compress_alphabet=compress)
+            minimize_time = time.perf_counter() - started
+            results.append(minimal.to_dict())
+            print(f"{n:>8} {num_symbols * copies:>8} {num_symbols if compress else '-':>8} "
+                  f"{dfa.num_states:>8} {convert_time:>10.3f} {minimize_time:>11.3f}")
+        if results[0] != results[1]:
+            raise AssertionError(f"alphabet compression changed the result (n={n})")
+
+
+def bench_incremental(sizes, num_symbols: int, edits: int, seed: int) -> None:
+    """Single-edge edits: IncrementalMinimizer.commit vs minimize_dfa from scratch.
+
+    Every incremental result is checked against the full recomputation.
+    """
+    from incremental_min import IncrementalMinimizer
+    rng = random.Random(seed)
+    print(f"{'states':>10} {'setup s':>9} {'commit ms':>10} {'scratch ms':>11} {'speedup':>8}")
+    for n in sizes:
+        dfa = random_dfa(n, num_symbols, seed)
+        started = time.perf_counter()
+        inc = IncrementalMinimizer(dfa)
+        setup = time.perf_counter() - started
+        commit_time = scratch_time = 0.0
+        for _ in range(edits):
+            inc.set_transition(dfa.labels[rng.randrange(n)], dfa.symbols[rng.randrange(num_symbols)],
+                               dfa.labels[rng.randrange(n)])
+            started = time.perf_counter()
+            minimal, _ = inc.commit()
+            commit_time += time.perf_counter() - started
+            edited = inc.automaton
+            started = time.perf_counter()
+            expected = minimize_dfa(edited, prune=False)
+            scratch_time += time.perf_counter() - started
+            if minimal.table != expected.table or minimal.labels != expected.labels:
+                raise AssertionError(f"incremental result differs from full minimization (n={n})")
+        print(f"{n:>10} {setup:>9.3f} {commit_time * 1000 / edits:>10.2f} "
+              f"{scratch_time * 1000 / edits:>11.2f} {scratch_time / commit_time:>7.1f}x")
+
+
+def bench_fetch(total_rows: int, dfa_states: int, num_symbols: int, repeat: int,
+                automaton_id: int, seed: int) -> None:
+    """Time fetch_dfa (and load_fa) once DFA_Transitions holds total_rows rows."""
+    from database import AutomataDB
+
+    db = AutomataDB(batch_size=5000)
+    probe = random_dfa(dfa_states, num_symbols, seed)
+    probe_id = db.save_dfa("benchmark probe", probe)
+
+    chunk = max(total_rows // 100, dfa_states * num_symbols)
+    written = dfa_states * num_symbols
+    filler = 0
+    while written < total_rows:
+        n = max(chunk // num_symbols, 1)
+        db.save_dfa(f"benchmark filler {filler}", random_dfa(n, num_symbols, seed + filler + 1))
+        written += n * num_symbols
+        filler += 1
+    print(f"DFA_Transitions rows written: {written}")
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        db.fetch_dfa(probe_id)
+        timings.append(time.perf_counter() - started)
+    print(f"fetch_dfa({dfa_states * num_symbols} transitions): best {min(timings) * 1000:.1f} ms, "
+          f"mean {sum(timings) / len(timings) * 1000:.1f} ms")
+
+    if automaton_id is not None:
+        from db_config import db_config
+        from db_operation import load_fa
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            load_fa(automaton_id, db_config)
+            timings.append(time.perf_counter() - started)
+        print(f"load_fa({automaton_id}): best {min(timings) * 1000:.1f} ms, "
+              f"mean {sum(timings) / len(timings) * 1000:.1f} ms")
+
+
+def _load_one(path: str, fmt: str) -> None:
+    """Child process of bench_load: load one file and report time and RSS growth."""
+    import resource
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    if fmt == "json":
+        from binary_format import load_dfa_json
+        dfa = load_dfa_json(path)
+        state = dfa.start
+        for _ in range(1000):
+            state = dfa.next_state(state, 0)
+    else:
+        from binary_format import MappedDFA
+        dfa = MappedDFA(path)
+        state = dfa.start
+        for _ in range(1000):
+            state = dfa.next_state(state, 0)
+    elapsed = time.perf_counter() - started
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": elapsed, "rss_kb": after - before}))
+
+
+def bench_load(sizes, num_symbols: int, seed: int) -> None:
+    """Compare opening a DFA from nested JSON against the mmap binary format."""
+    from binary_format import write_binary
+
+    print(f"{'states':>10} {'format':>8} {'file MB':>9} {'seconds':>10} {'RSS MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            dfa = random_dfa(n, num_symbols, seed)
+            json_path = os.path.join(tmp, f"dfa_{n}.json")
+            binary_path = os.path.join(tmp, f"dfa_{n}.dfab")
+            labels = dfa.labels
+            with open(json_path, "w") as f:
+                json.dump({
+                    "states": [[label] for label in labels],
+                    "startState": [labels[dfa.start]],
+                    "acceptingStates": [[labels[q]] for q in dfa.finals()],
+                    "transitions": [
+                        {"from": [labels[q]], "symbol": dfa.symbols[a], "to": [labels[t]]}
+                        for q, a, t in dfa.iter_transitions()
+                    ]
+                }, f, indent=2)
+            write_binary(binary_path, dfa)
+
+            for fmt, path in (("json", json_path), ("binary", binary_path)):
+                child = subprocess.run([sys.executable, __file__, "_load-one", "--path", path, "--format", fmt],
+                                       capture_output=True, text=True, check=True)
+                result = json.loads(child.stdout.strip().splitlines()[-1])
+                print(f"{n:>10} {fmt:>8} {os.path.getsize(path) / 1e6:>9.1f} "
+                      f"{result['seconds']:>10.4f} {result['rss_kb'] / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Automata toolkit benchmarks")
+    parser.add_argument("stage", choices=["suite", "compare", "minimize", "incremental", "parallel",
+                                          "parallel-calibrate", "alphabet", "fetch", "load", "_load-one"])
+    parser.add_argument("--sizes", default="1000,10000,100000,500000",
+                        help="comma-separated state counts")
+    parser.add_argument("--symbols", type=int, default=2)
+    parser.add_argument("--engine", default="hopcroft", choices=["hopcroft", "classic"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--edits", type=int, default=20,
+                        help="incremental: single-edge edits per size")
+    parser.add_argument("--copies", type=int, default=128,
+                        help="alphabet: interchangeable copies of each symbol")
+    parser.add_argument("--nth", type=int, default=16,
+                        help="parallel: n of the n-th-symbol-from-the-end NFA")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="parallel: largest worker count to time")
+    parser.add_argument("--rows", type=int, default=2000000,
+                        help="fetch: total DFA_Transitions rows to populate")
+    parser.add_argument("--dfa-states", type=int, default=5000,
+                        help="fetch: states of the DFA that is fetched")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--automaton-id", type=int, default=None,
+                        help="fetch: also time load_fa on this V3 automaton")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="suite: multiply generated automaton sizes")
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="suite: JSON file for the results")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="suite: skip the tracemalloc peak-memory runs")
+    parser.add_argument("--db", action="store_true",
+                        help="suite: include AutomataDB save/fetch against local MySQL")
+    parser.add_argument("--baseline", help="compare: earlier results JSON")
+    parser.add_argument("--current", help="compare: newer results JSON")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="compare: slowdown ratio reported as a regression")
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    parser.add_argument("--format", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sizes = [int(n) for n in args.sizes.split(",")]
+    if args.stage == "suite":
+        write_results(args.output, run_suite(args.scale, args.seed, not args.no_memory, args.db))
+    elif args.stage == "compare":
+        sys.exit(compare_results(args.baseline, args.current, args.threshold))
+    elif args.stage == "minimize":
+        bench_minimize(sizes, args.symbols, args.engine, args.seed)
+    elif args.stage == "incremental":
+        bench_incremental(sizes, args.symbols, args.edits, args.seed)
+    elif args.stage == "parallel":
+        bench_parallel(args.nth, args.workers)
+    elif args.stage == "parallel-calibrate":
+        calibrate_parallel(args.nth, sorted({2, 4, 8, args.workers} - {1}))
+    elif args.stage == "alphabet":
+        bench_alphabet(sizes, args.symbols, args.copies, args.seed)
+    elif args.stage == "fetch":
+        bench_fetch(args.rows, args.dfa_states, args.symbols, args.repeat, args.automaton_id, args.seed)
+    elif args.stage == "load":
+        bench_load(sizes, args.symbols, args.seed)
+    elif args.stage == "_load-one":
+        _load_one(args.path, args.format)
@@ -0,0 +1,282 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+from automaton import Automaton, NO_TRANSITION
+from stream_io import decode_label, encode_label
+
+# File layout (little-endian, every section 8-byte aligned):
+#   header | symbol offsets (k+1 x u64) + UTF-8 symbol blob
+#          | label offsets (n+1 x u64) + JSON label blob
+#          | dense table (n*k x i32)  or  CSR row pointers (n+1 x u64) + (symbol, target) pairs (2 x i32 each)
+#          | accepting bitmap (ceil(n/8) bytes)
+MAGIC = b"AUTDFA01"
+FORMAT_VERSION = 1
+FLAG_CSR = 1
+HEADER = struct.Struct("<8sIIIIiIQQQQQ")
+
+# Below this fill ratio the transition table is written in CSR form
+CSR_DENSITY = 0.5
+
+
+def _pad(data: bytearray) -> None:
+    data.extend(b"\0" * (-len(data) % 8))
+
+
+def _blob_section(items: List[bytes]) -> bytes:
+    offsets = array('Q', [0])
+    for item in items:
+        offsets.append(offsets[-1] + len(item))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    section = bytearray(offsets.tobytes())
+    section.extend(b"".join(items))
+    _pad(section)
+    return bytes(section)
+
+
+def _int_bytes(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_binary(path: str, automaton: Automaton, layout: Optional[str] = None) -> None:
+    """Write an Automaton as a memory-mappable binary DFA.
+
+    layout is "dense", "csr" or None to pick CSR for sparse tables.
+    """
+    n = automaton.num_states
+    k = automaton.num_symbols
+    transitions = automaton.num_transitions()
+    if layout is None:
+        layout = "csr" if n * k and transitions / (n * k) < CSR_DENSITY else "dense"
+    if layout not in ("dense", "csr"):
+        raise ValueError(f"Unknown layout: {layout}")
+
+    symbols = _blob_section([sym.encode("utf-8") for sym in automaton.symbols])
+    labels = _blob_section([
+        json.dumps(encode_label(label), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        for label in automaton.labels
+    ])
+
+    table = bytearray()
+    if layout == "dense":
+        table.extend(_int_bytes(automaton.table))
+    else:
+        row_ptr = array('Q', [0])
+        pairs = array('i')
+        for q in range(n):
+            for a in range(k):
+                target = automaton.table[q * k + a]
+                if target != NO_TRANSITION:
+                    pairs.append(a)
+                    pairs.append(target)
+            row_ptr.append(len(pairs) // 2)
+        table.extend(_int_bytes(row_ptr))
+        table.extend(_int_bytes(pairs))
+    _pad(table)
+
+    bitmap = bytearray((n + 7) // 8)
+    for q in range(n):
+        if automaton.accepting[q]:
+            bitmap[q >> 3] |= 1 << (q & 7)
+
+    symbols_off = HEADER.size + (-HEADER.size % 8)
+    labels_off = symbols_off + len(symbols)
+    table_off = labels_off + len(labels)
+    accepting_off = table_off + len(table)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, FLAG_CSR if layout == "csr" else 0, n, k,
+                         automaton.start, 0, transitions, symbols_off, labels_off, table_off, accepting_off)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(b"\0" * (symbols_off - HEADER.size))
+        f.write(symbols)
+        f.write(labels)
+        f.write(table)
+        f.write(bitmap)
+
+
+class MappedDFA:
+    """A binary DFA opened with mmap and queried in place.
+
+    Opening only parses the fixed header; symbols and labels are decoded on
+    first use and transitions are read straight from the mapped pages.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, flags, self.num_states, self.num_symbols, self.start, _, self.num_transitions,
+         self._symbols_off, self._labels_off, self._table_off, self._accepting_off) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a binary DFA file")
+        if version > FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported binary DFA version {version}")
+        if sys.byteorder != "little":
+            self.close()
+            raise ValueError("Memory-mapped DFAs require a little-endian host")
+        self.csr = bool(flags & FLAG_CSR)
+
+        view = memoryview(self._map)
+        n, k = self.num_states, self.num_symbols
+        if self.csr:
+            pairs_off = self._table_off + (n + 1) * 8
+            self._row_ptr = view[self._table_off:pairs_off].cast('Q')
+            self._pairs = view[pairs_off:pairs_off + self.num_transitions * 8].cast('i')
+        else:
+            self._table = view[self._table_off:self._table_off + n * k * 4].cast('i')
+        self._bitmap = view[self._accepting_off:self._accepting_off + (n + 7) // 8]
+        self._symbol_ids = None
+
+    def _blob(self, offset: int, count: int, index: int) -> bytes:
+        offsets = memoryview(self._map)[offset:offset + (count + 1) * 8].cast('Q')
+        base = offset + (count + 1) * 8
+        return bytes(self._map[base + offsets[index]:base + offsets[index + 1]])
+
+    def symbol(self, symbol_id: int) -> str:
+        return self._blob(self._symbols_off, self.num_symbols, symbol_id).decode("utf-8")
+
+    def symbol_id(self, symbol: str) -> int:
+        if self._symbol_ids is None:
+            self._symbol_ids = {self.symbol(i): i for i in range(self.num_symbols)}
+        return self._symbol_ids.get(symbol, NO_TRANSITION)
+
+    def label(self, state: int) -> Hashable:
+        return decode_label(json.loads(self._blob(self._labels_off, self.num_states, state)))
+
+    def is_final(self, state: int) -> bool:
+        return bool(self._bitmap[state >> 3] & (1 << (state & 7)))
+
+    def next_state(self, state: int, symbol_id: int) -> int:
+        if not self.csr:
+            return self._table[state * self.num_symbols + symbol_id]
+        lo, hi = self._row_ptr[state], self._row_ptr[state + 1]
+        symbols = self._pairs[2 * lo:2 * hi:2]
+        i = bisect_left(symbols, symbol_id)
+        if i < len(symbols) and symbols[i] == symbol_id:
+            return self._pairs[2 * (lo + i) + 1]
+        return NO_TRANSITION
+
+    def accepts(self, string: Sequence[str]) -> bool:
+        state = self.start
+        for symbol in string:
+            symbol_id = self.symbol_id(symbol)
+            if symbol_id == NO_TRANSITION:
+                return False
+            state = self.next_state(state, symbol_id)
+            if state == NO_TRANSITION:
+                return False
+        return self.is_final(state)
+
+    def to_automaton(self) -> Automaton:
+        """Fully deserialize into an in-memory Automaton."""
+        n, k = self.num_states, self.num_symbols
+        if self.csr:
+            table = array('i', [NO_TRANSITION]) * (n * k)
+            for q in range(n):
+                for i in range(self._row_ptr[q], self._row_ptr[q + 1]):
+                    table[q * k + self._pairs[2 * i]] = self._pairs[2 * i + 1]
+        else:
+            table = array('i', self._table)
+        accepting = bytearray(1 if self.is_final(q) else 0 for q in range(n))
+        labels = [self.label(q) for q in range(n)]
+        symbols = [self.symbol(a) for a in range(k)]
+        return Automaton(labels, symbols, self.start, accepting, table)
+
+    def close(self) -> None:
+        for name in ("_table", "_row_ptr", "_pairs", "_bitmap"):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedDFA":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def open_binary(path: str) -> MappedDFA:
+    return MappedDFA(path)
+
+
+def read_binary(path: str) -> Automaton:
+    with MappedDFA(path) as dfa:
+        return dfa.to_automaton()
+
+
+def load_dfa_json(path: str) -> Automaton:
+    """Read dfa_output.json / minimized.json (nested state lists) as an Automaton."""
+    with open(path) as f:
+        data = json.load(f)
+    states = {decode_label(s) for s in data["states"]}
+    start = decode_label(data["startState"])
+    finals = {decode_label(s) for s in data["acceptingStates"]}
+    transitions = {}
+    for t in data["transitions"]:
+        if isinstance(t, dict):
+            transitions[(decode_label(t["from"]), t["symbol"])] = decode_label(t["to"])
+        else:
+            from_state, symbol, to_state = t
+            transitions[(decode_label(from_state), symbol)] = decode_label(to_state)
+    return Automaton.from_dict(states, start, finals, transitions)
+
+
+def save_dfa_json(path: str, automaton: Automaton) -> None:
+    """Write an Automaton in the dfa_output.json format that load_dfa_json reads."""
+    states, start, finals, transitions = automaton.to_dict()
+    result = {
+        "states": [encode_label(s) for s in states],
+        "startState": encode_label(start),
+        "acceptingStates": [encode_label(s) for s in finals],
+        "transitions": [
+            {"from": encode_label(from_state), "symbol": symbol, "to": encode_label(to_state)}
+            for (from_state, symbol), to_state in transitions.items()
+        ]
+    }
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    usage = ("Usage: python binary_format.py from-json <json_file> <dfa_file>\n"
+             "       python binary_format.py from-db <dfa_id> <dfa_file>\n"
+             "       python binary_format.py to-json <dfa_file> <json_file>\n"
+             "       python binary_format.py to-db <dfa_file> <name>\n"
+             "       python binary_format.py info <dfa_file>")
+    if len(sys.argv) < 3:
+        print(usage)
+        sys.exit(1)
+    command = sys.argv[1]
+
+    if command == "from-json" and len(sys.argv) == 4:
+        write_binary(sys.argv[3], load_dfa_json(sys.argv[2]))
+    elif command == "from-db" and len(sys.argv) == 4:
+        from database import AutomataDB
+        dfa = AutomataDB().fetch_dfa(int(sys.argv[2]))
+        if not dfa[0]:
+            print("NOT_FOUND")
+            sys.exit(1)
+        write_binary(sys.argv[3], Automaton.from_dict(*dfa))
+    elif command == "to-json" and len(sys.argv) == 4:
+        save_dfa_json(sys.argv[3], read_binary(sys.argv[2]))
+    elif command == "to-db" and len(sys.argv) == 4:
+        from database import AutomataDB
+        dfa_id = AutomataDB().save_dfa(sys.argv[3], read_binary(sys.argv[2]))
+        print(f"Saved as DFA {dfa_id}")
+    elif command == "info":
+        with MappedDFA(sys.argv[2]) as dfa:
+            print(f"States: {dfa.num_states}, symbols: {dfa.num_symbols}, "
+                  f"transitions: {dfa.num_transitions}, layout: {'csr' if dfa.csr else 'dense'}")
+    else:
+        print(usage)
+        sys.exit(1)
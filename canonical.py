@@ -0,0 +1,126 @@
+import hashlib
+import json
+from array import array
+from collections import deque
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+from automaton import Automaton, NO_TRANSITION, as_automaton
+from dfa_minimizer import minimize_dfa
+from nfa_to_dfa import convert_nfa_to_dfa, StateLimitExceeded
+
+# Subset-construction bound for hashing NFAs on insert; larger ones are
+# stored with a NULL hash and left to the explicit backfill
+HASH_MAX_STATES = 10000
+
+
+def canonical_form(
+    states: Any,
+    start: Optional[Hashable] = None,
+    finals: Optional[Set[Hashable]] = None,
+    transitions: Optional[Dict[Tuple[Hashable, str], Hashable]] = None,
+    minimal: bool = False
+) -> Automaton:
+    """Unique representative of a DFA's language.
+
+    The DFA is minimized, dead states (those that cannot reach a final
+    state) are dropped along with the transitions into them, and the rest
+    is renumbered in BFS order from the start state, visiting symbols in
+    sorted order. Two DFAs accept the same language exactly when their
+    canonical forms are equal. Labels are the new integer ids.
+    minimal=True skips minimization for DFAs the caller already minimized.
+    """
+    dfa = as_automaton(states, start, finals, transitions)
+    if not minimal:
+        dfa = minimize_dfa(dfa, prune=True)
+    n = dfa.num_states
+    k = dfa.num_symbols
+    table = dfa.table
+
+    # States that can reach a final state, by a backward pass
+    predecessors: List[List[int]] = [[] for _ in range(n)]
+    for from_id, _, to_id in dfa.iter_transitions():
+        predecessors[to_id].append(from_id)
+    live = bytearray(dfa.accepting)
+    queue = deque(q for q in range(n) if live[q])
+    while queue:
+        q = queue.popleft()
+        for p in predecessors[q]:
+            if not live[p]:
+                live[p] = 1
+                queue.append(p)
+
+    symbols = sorted(dfa.symbols)
+    order = [dfa.symbol_id(sym) for sym in symbols]
+    if not live[dfa.start]:
+        return Automaton([0], [], 0, bytearray(1), array('i'))
+
+    new_id = {dfa.start: 0}
+    queue = deque([dfa.start])
+    rows = []
+    while queue:
+        q = queue.popleft()
+        row = []
+        for a in order:
+            t = table[q * k + a]
+            if t == NO_TRANSITION or not live[t]:
+                row.append(NO_TRANSITION)
+                continue
+            if t not in new_id:
+                new_id[t] = len(new_id)
+                queue.append(t)
+            row.append(new_id[t])
+        rows.append(row)
+
+    # Keep only symbols that still label some transition
+    used = [i for i in range(len(symbols)) if any(row[i] != NO_TRANSITION for row in rows)]
+    flat = array('i', (row[i] for row in rows for i in used))
+    accepting = bytearray(len(rows))
+    for q, i in new_id.items():
+        accepting[i] = dfa.accepting[q]
+    return Automaton(list(range(len(rows))), [symbols[i] for i in used], 0, accepting, flat)
+
+
+def language_hash(
+    states: Any,
+    start: Optional[Hashable] = None,
+    finals: Optional[Set[Hashable]] = None,
+    transitions: Optional[Dict[Tuple[Hashable, str], Hashable]] = None,
+    minimal: bool = False
+) -> str:
+    """SHA-256 of the canonical form: equal hashes mean equal languages."""
+    canon = canonical_form(states, start, finals, transitions, minimal)
+    encoded = json.dumps({
+        "symbols": canon.symbols,
+        "finals": canon.finals(),
+        "table": list(canon.table),
+    }, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def language_hash_from_json(fa_data: Dict[str, Any], max_states: Optional[int] = HASH_MAX_STATES) -> Optional[str]:
+    """Language hash of an automaton in the V3 JSON format used by db_operation.
+
+    NFAs (type "NFA") are determinized first; the "nt" pseudo-state means
+    "no transition" and is dropped. Returns None when the determinized NFA
+    would exceed ``max_states`` states (None: no bound).
+    """
+    states = {s for s in fa_data.get("states", []) if s != "nt"}
+    start = fa_data.get("startState", "")
+    finals = {s for s in fa_data.get("acceptingStates", []) if s != "nt"}
+    triples = [tuple(t) for t in fa_data.get("transitions", []) if len(t) == 3]
+    if fa_data.get("type", "DFA") == "NFA":
+        nfa_transitions: Dict[str, Dict[str, Set[str]]] = {}
+        for from_state, symbol, to_state in triples:
+            if from_state == "nt" or to_state == "nt":
+                continue
+            nfa_transitions.setdefault(from_state, {}).setdefault(symbol, set()).add(to_state)
+        try:
+            dfa = convert_nfa_to_dfa(states, start, finals, nfa_transitions, compact=True, max_states=max_states)
+        except StateLimitExceeded:
+            return None
+        return language_hash(dfa)
+    transitions = {
+        (from_state, symbol): to_state
+        for from_state, symbol, to_state in triples
+        if from_state != "nt" and to_state != "nt"
+    }
+    return language_hash(states | {start}, start, finals, transitions)
@@ -1,9 +1,43 @@
 import mysql.connector
+import json
+import time
+import zlib
+from array import array
 from collections import defaultdict
-from typing import Tuple, Set, Dict, Optional, List, FrozenSet
+from contextlib import contextmanager
+from typing import Tuple, Set, Dict, Optional, List, FrozenSet, Union, Iterator, Any, Hashable
+from automaton import Automaton, NO_TRANSITION
+from db_pool import get_pool, PooledConnection
+from migrations import apply_migrations, AUTOMATA_DB_MIGRATIONS
+from canonical import language_hash
+from stream_io import encode_label, decode_label
+
+# INSERT statements for the row groups collected by AutomataDB._add_dfa
+DFA_ROW_SQL = {
+    "states": "INSERT INTO DFA_States (dfa_id, state, is_start, is_final) VALUES (%s, %s, %s, %s)",
+    "transitions": "INSERT INTO DFA_Transitions (dfa_id, from_state, symbol, to_state) VALUES (%s, %s, %s, %s)",
+    "id_states": "INSERT INTO DFA_Id_States (dfa_id, state_id, is_final) VALUES (%s, %s, %s)",
+    "id_transitions": "INSERT INTO DFA_Id_Transitions (dfa_id, from_state, symbol, to_state) VALUES (%s, %s, %s, %s)",
+    "members": "INSERT INTO DFA_State_Members (dfa_id, labels) VALUES (%s, %s)",
+}
+
+
+def pack_labels(labels: List[Hashable]) -> bytes:
+    """zlib-compressed JSON of the state labels, indexed by state id."""
+    encoded = json.dumps([encode_label(label) for label in labels], separators=(",", ":"), ensure_ascii=False)
+    return zlib.compress(encoded.encode("utf-8"))
+
+
+def unpack_labels(blob: bytes) -> List[Hashable]:
+    return [decode_label(label) for label in json.loads(zlib.decompress(blob).decode("utf-8"))]
+
 
 class AutomataDB:
-    def __init__(self):
+    def __init__(self, batch_size: int = 1000, pool_size: int = 5, state_ids: bool = False):
+        """state_ids makes save_dfa/save_dfas store integer state ids by default."""
+        self.batch_size = batch_size
+        self.state_ids = state_ids
+        self.last_save_stats = {"rows": 0, "seconds": 0.0}
         self.config = {
             'host': 'localhost',
             'user': 'root',
@@ -12,8 +46,15 @@ class AutomataDB:
             'autocommit': True
         }
         self.initialize_database()
+        self.pool = get_pool(self.config, pool_size)
+
+    # Databases already migrated by this process; later AutomataDB() calls skip the check
+    _initialized: Set[str] = set()
 
     def initialize_database(self):
+        """Create the database if needed and apply pending schema migrations."""
+        if self.config['database'] in AutomataDB._initialized:
+            return
         try:
             temp_config = {k: v for k, v in self.config.items() if k != 'database'}
             conn = mysql.connector.connect(**temp_config)
@@ -21,80 +62,37 @@ class AutomataDB:
             
             cursor.execute("CREATE DATABASE IF NOT EXISTS FiniteAutomatonDBV2")
             cursor.execute("USE FiniteAutomatonDBV2")
-
-            # NFA Tables
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS NFAs (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    name VARCHAR(255) NOT NULL
-                )
-            """)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS NFA_States (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    nfa_id INT NOT NULL,
-                    state VARCHAR(255) NOT NULL,
-                    is_start BOOLEAN DEFAULT FALSE,
-                    is_final BOOLEAN DEFAULT FALSE,
-                    FOREIGN KEY (nfa_id) REFERENCES NFAs(id)
-                )
-            """)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS NFA_Transitions (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    nfa_id INT NOT NULL,
-                    from_state VARCHAR(255) NOT NULL,
-                    symbol VARCHAR(255) NOT NULL,
-                    to_state VARCHAR(255) NOT NULL,
-                    FOREIGN KEY (nfa_id) REFERENCES NFAs(id)
-                )
-            """)
-
-            # DFA Tables
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS DFAs (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    name VARCHAR(255) NOT NULL,
-                    source_nfa_id INT,
-                    FOREIGN KEY (source_nfa_id) REFERENCES NFAs(id)
-                )
-            """)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS DFA_States (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    dfa_id INT NOT NULL,
-                    state VARCHAR(255) NOT NULL,
-                    is_start BOOLEAN DEFAULT FALSE,
-                    is_final BOOLEAN DEFAULT FALSE,
-                    FOREIGN KEY (dfa_id) REFERENCES DFAs(id)
-                )
-            """)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS DFA_Transitions (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    dfa_id INT NOT NULL,
-                    from_state VARCHAR(255) NOT NULL,
-                    symbol VARCHAR(255) NOT NULL,
-                    to_state VARCHAR(255) NOT NULL,
-                    FOREIGN KEY (dfa_id) REFERENCES DFAs(id)
-                )
-            """)
-
-            conn.commit()
             cursor.close()
+
+            apply_migrations(conn, AUTOMATA_DB_MIGRATIONS)
             conn.close()
+            AutomataDB._initialized.add(self.config['database'])
 
         except mysql.connector.Error as err:
             print(f"Database initialization failed: {err}")
 
-    def connect(self) -> Optional[mysql.connector.MySQLConnection]:
+    def connect(self) -> Optional[PooledConnection]:
+        """Check a connection out of the shared pool; close() returns it."""
         try:
-            conn = mysql.connector.connect(**self.config)
-            return conn
+            return self.pool.get_connection()
         except mysql.connector.Error as err:
             print(f"Database connection failed: {err}")
             return None
 
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """Run several operations on one checked-out connection:
+
+            with db.connection():
+                db.fetch_dfa(1)
+                db.save_dfa(...)
+        """
+        with self.pool.connection() as conn:
+            yield conn
+
+    def pool_metrics(self) -> Dict[str, Any]:
+        return self.pool.metrics()
+
     def fetch_nfas(self) -> List[Tuple[int, str]]:
         try:
             with self.connect() as conn:
@@ -149,10 +147,22 @@ class AutomataDB:
             print(f"Error fetching DFAs: {err}")
             return []
 
-    def fetch_dfa(self, dfa_id: int) -> Tuple[Set[str], str, Set[str], Dict[Tuple[str, str], str]]:
+    def fetch_dfa(self, dfa_id: int, compact: bool = False,
+                  labels: bool = False) -> Union[Tuple[Set[str], str, Set[str], Dict[Tuple[str, str], str]], Automaton]:
+        """Load a DFA; with compact=True it is returned as an Automaton.
+
+        DFAs saved with integer state ids come back with int states; the
+        subset labels are only read and decompressed when labels=True.
+        """
         try:
             with self.connect() as conn:
                 with conn.cursor() as cursor:
+                    cursor.execute("SELECT state_ids, start_state FROM DFAs WHERE id = %s", (dfa_id,))
+                    row = cursor.fetchone()
+                    if row and row[0]:
+                        automaton = self._fetch_id_dfa(cursor, dfa_id, row[1], labels)
+                        return automaton if compact else automaton.to_dict()
+
                     cursor.execute("""
                         SELECT state, is_start, is_final FROM DFA_States 
                         WHERE dfa_id = %s ORDER BY state
@@ -177,89 +187,316 @@ class AutomataDB:
                     for from_state, symbol, to_state in cursor:
                         transitions[(from_state, symbol)] = to_state
 
+                    if compact:
+                        return Automaton.from_dict(states, start, finals, transitions)
                     return states, start, finals, transitions
 
         except mysql.connector.Error as err:
             print(f"Error fetching DFA {dfa_id}: {err}")
             return set(), "", set(), {}
 
-    def save_dfa(self, name: str, states: Set[FrozenSet[str]], start: FrozenSet[str], 
-                 finals: Set[FrozenSet[str]], 
-                 transitions: Dict[Tuple[FrozenSet[str], str], FrozenSet[str]], 
-                 source_nfa_id: Optional[int] = None) -> int:
+    def _fetch_id_dfa(self, cursor, dfa_id: int, start: int, labels: bool) -> Automaton:
+        cursor.execute("""
+            SELECT is_final FROM DFA_Id_States
+            WHERE dfa_id = %s ORDER BY state_id
+        """, (dfa_id,))
+        accepting = bytearray(1 if is_final else 0 for (is_final,) in cursor)
+        cursor.execute("""
+            SELECT from_state, symbol, to_state
+            FROM DFA_Id_Transitions
+            WHERE dfa_id = %s
+            ORDER BY from_state, symbol
+        """, (dfa_id,))
+        rows = cursor.fetchall()
+        symbols = sorted({symbol for _, symbol, _ in rows})
+        symbol_ids = {symbol: i for i, symbol in enumerate(symbols)}
+        k = len(symbols)
+        table = array('i', [NO_TRANSITION]) * (len(accepting) * k)
+        for from_state, symbol, to_state in rows:
+            table[from_state * k + symbol_ids[symbol]] = to_state
+        state_labels = self._read_state_labels(cursor, dfa_id) if labels else None
+        return Automaton(state_labels or list(range(len(accepting))), symbols, start, accepting, table)
+
+    def _read_state_labels(self, cursor, dfa_id: int) -> Optional[List[Hashable]]:
+        cursor.execute("SELECT labels FROM DFA_State_Members WHERE dfa_id = %s", (dfa_id,))
+        row = cursor.fetchone()
+        return unpack_labels(bytes(row[0])) if row else None
+
+    def fetch_state_labels(self, dfa_id: int) -> Optional[List[Hashable]]:
+        """Original state labels of a DFA saved with state ids, indexed by id.
+
+        None if the DFA was saved without its membership table.
+        """
         try:
             with self.connect() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute("""
-                        INSERT INTO DFAs (name, source_nfa_id)
-                        VALUES (%s, %s)
-                    """, (name, source_nfa_id))
-                    dfa_id = cursor.lastrowid
-
-                    def frozenset_to_str(fs: FrozenSet) -> str:
-                        if not fs:
-                            return "{}"
-                        if isinstance(next(iter(fs)), frozenset):
-                            return '{' + ','.join(sorted(frozenset_to_str(s) for s in fs)) + '}'
-                        else:
-                            return '{' + ','.join(sorted(fs)) + '}'
-
-                    state_map = {}
-                    for state in states:
-                        state_str = frozenset_to_str(state)
-                        state_map[state] = state_str
-                        is_start = (state == start)
-                        is_final = (state in finals)
-                        cursor.execute("""
-                            INSERT INTO DFA_States (dfa_id, state, is_start, is_final)
-                            VALUES (%s, %s, %s, %s)
-                        """, (dfa_id, state_str, is_start, is_final))
-
-                    for (from_state, symbol), to_state in transitions.items():
-                        from_str = state_map[from_state]
-                        to_str = state_map[to_state]
-                        cursor.execute("""
-                            INSERT INTO DFA_Transitions (dfa_id, from_state, symbol, to_state)
-                            VALUES (%s, %s, %s, %s)
-                        """, (dfa_id, from_str, symbol, to_str))
+                    return self._read_state_labels(cursor, dfa_id)
+        except mysql.connector.Error as err:
+            print(f"Error fetching state labels of DFA {dfa_id}: {err}")
+            return None
 
-                    conn.commit()
-                    return dfa_id
+    def _insert_many(self, cursor, sql: str, rows: List[tuple], batch_size: int) -> int:
+        """Insert rows in chunks of batch_size with executemany (multi-row INSERTs)."""
+        for i in range(0, len(rows), batch_size):
+            cursor.executemany(sql, rows[i:i + batch_size])
+        return len(rows)
+
+    def save_dfa(self, name: str, states: Union[Set[FrozenSet[str]], Automaton], start: Optional[FrozenSet[str]] = None, 
+                 finals: Optional[Set[FrozenSet[str]]] = None, 
+                 transitions: Optional[Dict[Tuple[FrozenSet[str], str], FrozenSet[str]]] = None, 
+                 source_nfa_id: Optional[int] = None,
+                 batch_size: Optional[int] = None,
+                 state_ids: Optional[bool] = None,
+                 memberships: bool = True,
+                 minimal: bool = False,
+                 hash_language: bool = True) -> int:
+        """Saves a DFA in one transaction using batched inserts.
+
+        With state_ids (default: the instance setting) states are stored as
+        integer ids, and their labels go to the compressed membership table
+        unless memberships=False. The language hash is computed before the
+        transaction opens; minimal=True tells it the DFA is already
+        minimized, and hash_language=False leaves it NULL for
+        backfill_language_hashes.
+        """
+        dfa = states if isinstance(states, Automaton) else (states, start, finals, transitions)
+        batch_size = batch_size or self.batch_size
+        started = time.perf_counter()
+        lang_hash = self._language_hash(dfa, minimal) if hash_language else None
+        conn = self.connect()
+        if conn is None:
+            return -1
+        try:
+            conn.start_transaction()
+            rows = defaultdict(list)
+            with conn.cursor() as cursor:
+                dfa_id = self._add_dfa(cursor, name, dfa, source_nfa_id, lang_hash, state_ids, memberships, rows)
+                inserted = 1 + self._insert_dfa_rows(cursor, rows, batch_size)
+
+            conn.commit()
+            self._report_save("DFA", name, inserted, started)
+            return dfa_id
 
         except mysql.connector.Error as err:
+            conn.rollback()
             print(f"Error saving DFA: {err}")
             return -1
+        except Exception:
+            # Never hand a pooled connection back mid-transaction
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def save_dfas(self, dfas: List[Tuple[str, Union[Tuple, Automaton], Optional[int]]],
+                  batch_size: Optional[int] = None, state_ids: Optional[bool] = None,
+                  memberships: bool = True, minimal: bool = False, hash_language: bool = True) -> List[int]:
+        """Saves many (name, dfa, source_nfa_id) entries in one transaction.
 
-    def save_nfa(self, name: str, states: Set[str], start: str, finals: Set[str], transitions: Dict[str, Dict[str, Set[str]]]) -> int:
-        """Saves an NFA to the database."""
+        The state and transition rows of all DFAs go through the same
+        executemany batches. Returns the new DFA ids, or [] on error.
+        minimal=True: every DFA is already minimized; hash_language=False
+        skips the hashes, e.g. for bulk loads (see save_dfa).
+        """
+        batch_size = batch_size or self.batch_size
+        started = time.perf_counter()
+        hashes = [self._language_hash(dfa, minimal) if hash_language else None for _, dfa, _ in dfas]
+        conn = self.connect()
+        if conn is None:
+            return []
         try:
-            with self.connect() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("INSERT INTO NFAs (name) VALUES (%s)", (name,))
-                    nfa_id = cursor.lastrowid
-
-                    for state in states:
-                        is_start = state == start
-                        is_final = state in finals
-                        cursor.execute("""
-                            INSERT INTO NFA_States (nfa_id, state, is_start, is_final)
-                            VALUES (%s, %s, %s, %s)
-                        """, (nfa_id, state, is_start, is_final))
-
-                    for from_state, sym_trans in transitions.items():
-                        for symbol, to_states in sym_trans.items():
-                            for to_state in to_states:
-                                cursor.execute("""
-                                    INSERT INTO NFA_Transitions (nfa_id, from_state, symbol, to_state)
-                                    VALUES (%s, %s, %s, %s)
-                                """, (nfa_id, from_state, symbol, to_state))
-                    
-                    conn.commit()
-                    return nfa_id
+            conn.start_transaction()
+            rows = defaultdict(list)
+            with conn.cursor() as cursor:
+                dfa_ids = [self._add_dfa(cursor, name, dfa, source_nfa_id, lang_hash, state_ids, memberships, rows)
+                           for (name, dfa, source_nfa_id), lang_hash in zip(dfas, hashes)]
+                inserted = len(dfa_ids) + self._insert_dfa_rows(cursor, rows, batch_size)
+            conn.commit()
+            self._report_save("DFAs", f"{len(dfa_ids)} automata", inserted, started)
+            return dfa_ids
 
         except mysql.connector.Error as err:
+            conn.rollback()
+            print(f"Error saving DFAs: {err}")
+            return []
+        except Exception:
+            # Never hand a pooled connection back mid-transaction
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _language_hash(dfa: Union[Tuple, Automaton], minimal: bool) -> str:
+        return language_hash(dfa, minimal=minimal) if isinstance(dfa, Automaton) else language_hash(*dfa, minimal)
+
+    def _add_dfa(self, cursor, name: str, dfa: Union[Tuple, Automaton], source_nfa_id: Optional[int],
+                 lang_hash: Optional[str], state_ids: Optional[bool], memberships: bool,
+                 rows: Dict[str, List[tuple]]) -> int:
+        """Insert the DFAs row and collect the DFA's other rows into ``rows``."""
+        if self.state_ids if state_ids is None else state_ids:
+            automaton = dfa if isinstance(dfa, Automaton) else Automaton.from_dict(*dfa)
+            cursor.execute("""
+                INSERT INTO DFAs (name, source_nfa_id, language_hash, state_ids, start_state)
+                VALUES (%s, %s, %s, TRUE, %s)
+            """, (name, source_nfa_id, lang_hash, automaton.start))
+            dfa_id = cursor.lastrowid
+            n, k = automaton.num_states, automaton.num_symbols
+            table = automaton.table
+            rows["id_states"].extend((dfa_id, q, bool(automaton.accepting[q])) for q in range(n))
+            rows["id_transitions"].extend(
+                (dfa_id, q, automaton.symbols[a], table[q * k + a])
+                for q in range(n) for a in range(k) if table[q * k + a] != NO_TRANSITION
+            )
+            if memberships:
+                rows["members"].append((dfa_id, pack_labels(automaton.labels)))
+            return dfa_id
+
+        states, start, finals, transitions = dfa.to_dict() if isinstance(dfa, Automaton) else dfa
+        cursor.execute("""
+            INSERT INTO DFAs (name, source_nfa_id, language_hash)
+            VALUES (%s, %s, %s)
+        """, (name, source_nfa_id, lang_hash))
+        dfa_id = cursor.lastrowid
+        state_rows, transition_rows = self._dfa_rows(dfa_id, states, start, finals, transitions)
+        rows["states"].extend(state_rows)
+        rows["transitions"].extend(transition_rows)
+        return dfa_id
+
+    def _dfa_rows(self, dfa_id: int, states, start, finals, transitions) -> Tuple[List[tuple], List[tuple]]:
+        def frozenset_to_str(fs: FrozenSet) -> str:
+            if isinstance(fs, str):
+                return fs
+            if not isinstance(fs, (frozenset, set)):
+                # Integer state ids, e.g. from a DFA fetched from the id tables
+                return str(fs)
+            return '{' + ','.join(sorted(frozenset_to_str(s) for s in fs)) + '}'
+
+        state_map = {state: frozenset_to_str(state) for state in states}
+        state_rows = [(dfa_id, state_str, state == start, state in finals)
+                      for state, state_str in state_map.items()]
+        transition_rows = [(dfa_id, state_map[from_state], symbol, state_map[to_state])
+                           for (from_state, symbol), to_state in transitions.items()]
+        return state_rows, transition_rows
+
+    def _insert_dfa_rows(self, cursor, rows: Dict[str, List[tuple]], batch_size: int) -> int:
+        return sum(self._insert_many(cursor, sql, rows[group], batch_size)
+                   for group, sql in DFA_ROW_SQL.items() if rows.get(group))
+
+    def save_nfa(self, name: str, states: Set[str], start: str, finals: Set[str], transitions: Dict[str, Dict[str, Set[str]]],
+                 batch_size: Optional[int] = None) -> int:
+        """Saves an NFA to the database in one transaction using batched inserts."""
+        batch_size = batch_size or self.batch_size
+        started = time.perf_counter()
+        conn = self.connect()
+        if conn is None:
+            return -1
+        try:
+            conn.start_transaction()
+            with conn.cursor() as cursor:
+                cursor.execute("INSERT INTO NFAs (name) VALUES (%s)", (name,))
+                nfa_id = cursor.lastrowid
+
+                state_rows = [(nfa_id, state, state == start, state in finals) for state in states]
+                transition_rows = [(nfa_id, from_state, symbol, to_state)
+                                   for from_state, sym_trans in transitions.items()
+                                   for symbol, to_states in sym_trans.items()
+                                   for to_state in to_states]
+
+                rows = 1
+                rows += self._insert_many(cursor, """
+                    INSERT INTO NFA_States (nfa_id, state, is_start, is_final)
+                    VALUES (%s, %s, %s, %s)
+                """, state_rows, batch_size)
+                rows += self._insert_many(cursor, """
+                    INSERT INTO NFA_Transitions (nfa_id, from_state, symbol, to_state)
+                    VALUES (%s, %s, %s, %s)
+                """, transition_rows, batch_size)
+
+            conn.commit()
+            self._report_save("NFA", name, rows, started)
+            return nfa_id
+
+        except mysql.connector.Error as err:
+            conn.rollback()
             print(f"Error saving NFA: {err}")
             return -1
+        except Exception:
+            # Never hand a pooled connection back mid-transaction
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def find_dfas_by_language(self, states: Union[Set[FrozenSet[str]], Automaton], start: Optional[FrozenSet[str]] = None,
+                              finals: Optional[Set[FrozenSet[str]]] = None,
+                              transitions: Optional[Dict[Tuple[FrozenSet[str], str], FrozenSet[str]]] = None) -> List[Tuple[int, str]]:
+        """Stored DFAs accepting the same language, found by one indexed lookup."""
+        lang_hash = language_hash(states, start, finals, transitions)
+        try:
+            with self.connect() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT id, name FROM DFAs
+                        WHERE language_hash = %s ORDER BY id
+                    """, (lang_hash,))
+                    return cursor.fetchall()
+        except mysql.connector.Error as err:
+            print(f"Error looking up DFA language: {err}")
+            return []
+
+    def backfill_language_hashes(self) -> int:
+        """Compute language_hash for DFAs saved before the column existed or with hash_language=False."""
+        try:
+            with self.connect() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT id FROM DFAs WHERE language_hash IS NULL")
+                    missing = [row[0] for row in cursor.fetchall()]
+            for dfa_id in missing:
+                states, start, finals, transitions = self.fetch_dfa(dfa_id)
+                if not states:
+                    continue
+                with self.connect() as conn:
+                    with conn.cursor() as cursor:
+                        cursor.execute("UPDATE DFAs SET language_hash = %s WHERE id = %s",
+                                       (language_hash(states, start, finals, transitions), dfa_id))
+                        conn.commit()
+            return len(missing)
+        except mysql.connector.Error as err:
+            print(f"Error backfilling language hashes: {err}")
+            return 0
+
+    def fetch_cached_result(self, cache_key: str, kind: str) -> Optional[bytes]:
+        """Payload stored by the result cache's database tier, if any."""
+        try:
+            with self.connect() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT payload FROM ResultCache
+                        WHERE cache_key = %s AND kind = %s
+                    """, (cache_key, kind))
+                    row = cursor.fetchone()
+                    return bytes(row[0]) if row else None
+        except mysql.connector.Error as err:
+            print(f"Error reading result cache: {err}")
+            return None
+
+    def save_cached_result(self, cache_key: str, kind: str, payload: bytes) -> None:
+        try:
+            with self.connect() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        REPLACE INTO ResultCache (cache_key, kind, payload)
+                        VALUES (%s, %s, %s)
+                    """, (cache_key, kind, payload))
+                    conn.commit()
+        except mysql.connector.Error as err:
+            print(f"Error writing result cache: {err}")
+
+    def _report_save(self, kind: str, name: str, rows: int, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        self.last_save_stats = {"rows": rows, "seconds": elapsed}
+        print(f"Saved {kind} '{name}': {rows} rows in {elapsed:.3f}s")
 
 def insert_sample_nfas(db: AutomataDB):
     """Inserts two sample NFAs into the database."""
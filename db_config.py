@@ -4,4 +4,7 @@ db_config = {
     "user": "root",
     "password": "root",
     "database": "FiniteAutomatonDBV3"
-}
\ No newline at end of file
+}
+
+# Connections kept open by the shared pool (see db_pool.get_pool)
+pool_size = 5
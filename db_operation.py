@@ -1,15 +1,35 @@
-from db_config import db_config
+from db_config import db_config, pool_size
+from db_pool import get_pool
+from migrations import apply_migrations, V3_MIGRATIONS
+from worker_client import run_cli
+from canonical import language_hash_from_json
+from stream_io import AutomatonWriter, is_jsonl, iter_records, read_header, STATE_RECORD
 import mysql.connector
 import sys
 import json
 
+_migrated = set()
+
+def connect(db_config):
+    """Pooled connection to the V3 database; pending index migrations run on first use."""
+    pool = get_pool(db_config, pool_size)
+    if db_config['database'] not in _migrated:
+        try:
+            with pool.connection() as conn:
+                apply_migrations(conn, V3_MIGRATIONS)
+            # Only once it succeeded; a failed migration is retried on the next connect
+            _migrated.add(db_config['database'])
+        except mysql.connector.Error as err:
+            print(f"Schema migration failed: {err}")
+    return pool.get_connection()
+
 def insert_fa(json_file, db_config):
     try:
         # Read JSON file
         with open(json_file, 'r') as f:
             fa_data = json.load(f)
         
-        db = mysql.connector.connect(**db_config)
+        db = connect(db_config)
         cursor = db.cursor()
         
         # Extract basic info
@@ -20,13 +40,15 @@ def insert_fa(json_file, db_config):
         num_accepting = fa_data.get('numOfAcceptingStates', 0)
         start_state_name = fa_data.get('startState', '')
         
+        lang_hash = language_hash_from_json(fa_data)
+        
         print(f"Inserting {fa_type}: {fa_name}")  # Debug info
         
         # 1. Insert main automaton record with type
         cursor.execute("""
-        INSERT INTO Automata (name, type, num_of_states, num_of_alphabet_symbols, num_of_accepting_states)
-        VALUES (%s, %s, %s, %s, %s)
-        """, (fa_name, fa_type, num_states, num_alphabet, num_accepting))
+        INSERT INTO Automata (name, type, num_of_states, num_of_alphabet_symbols, num_of_accepting_states, language_hash)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        """, (fa_name, fa_type, num_states, num_alphabet, num_accepting, lang_hash))
         
         automaton_id = cursor.lastrowid
         print(f"Created automaton with ID: {automaton_id}")
@@ -124,9 +146,235 @@ def insert_fa(json_file, db_config):
             db.close()
 
 
+def insert_fa_stream(jsonl_file, db_config, batch_size=1000):
+    """Insert an automaton JSON Lines file in one transaction with constant memory per transition.
+
+    State records must precede transition records (as AutomatonWriter writes
+    them). Only the state and symbol id maps are kept in memory; transitions
+    are streamed into batched INSERTs. Unlike insert_fa, which hashes the
+    whole automaton up front, this path never holds it in memory, so the
+    language hash is left NULL for backfill_language_hashes to fill in.
+    """
+    try:
+        header = read_header(jsonl_file)
+        fa_name = header.get('name', 'Unnamed')
+        fa_type = header.get('type', 'DFA')
+        start_state_name = header.get('startState', '')
+        print(f"Inserting {fa_type}: {fa_name}")
+
+        db = connect(db_config)
+        db.start_transaction()
+        cursor = db.cursor()
+        cursor.execute("""
+        INSERT INTO Automata (name, type, num_of_states, num_of_alphabet_symbols, num_of_accepting_states)
+        VALUES (%s, %s, 0, 0, 0)
+        """, (fa_name, fa_type))
+        automaton_id = cursor.lastrowid
+
+        state_names = []
+        accepting = []
+        state_ids = None
+        symbol_ids = {}
+        batch = []
+        transition_count = 0
+
+        def flush_states():
+            for i in range(0, len(state_names), batch_size):
+                cursor.executemany("""
+                INSERT INTO States (automaton_id, state_name)
+                VALUES (%s, %s)
+                """, [(automaton_id, name) for name in state_names[i:i + batch_size]])
+            cursor.execute("SELECT state_id, state_name FROM States WHERE automaton_id = %s", (automaton_id,))
+            ids = {name: state_id for state_id, name in cursor.fetchall()}
+            if start_state_name in ids:
+                cursor.execute("UPDATE Automata SET start_state_id = %s WHERE automaton_id = %s",
+                               (ids[start_state_name], automaton_id))
+            cursor.executemany("""
+            INSERT INTO AcceptingStates (automaton_id, state_id)
+            VALUES (%s, %s)
+            """, [(automaton_id, ids[name]) for name in accepting if name in ids])
+            return ids
+
+        def flush_transitions():
+            cursor.executemany("""
+            INSERT INTO Transitions (automaton_id, current_state_id, next_state_id, symbol_id)
+            VALUES (%s, %s, %s, %s)
+            """, batch)
+            batch.clear()
+
+        for record in iter_records(jsonl_file):
+            if record[0] == STATE_RECORD:
+                _, name, is_accepting = record
+                if name == 'nt':  # Skip "no transition" state
+                    continue
+                state_names.append(name)
+                if is_accepting:
+                    accepting.append(name)
+                continue
+
+            if state_ids is None:
+                state_ids = flush_states()
+            _, from_state, symbol, to_state = record
+            if from_state not in state_ids or to_state not in state_ids:
+                continue
+            if symbol not in symbol_ids:
+                cursor.execute("""
+                INSERT INTO AlphabetSymbols (automaton_id, symbol_value)
+                VALUES (%s, %s)
+                """, (automaton_id, symbol))
+                symbol_ids[symbol] = cursor.lastrowid
+            batch.append((automaton_id, state_ids[from_state], state_ids[to_state], symbol_ids[symbol]))
+            transition_count += 1
+            if len(batch) >= batch_size:
+                flush_transitions()
+
+        if state_ids is None:
+            state_ids = flush_states()
+        if batch:
+            flush_transitions()
+
+        cursor.execute("""
+        UPDATE Automata SET num_of_states = %s, num_of_alphabet_symbols = %s, num_of_accepting_states = %s
+        WHERE automaton_id = %s
+        """, (len(state_ids), len(symbol_ids), len(accepting), automaton_id))
+        db.commit()
+        print(f"✅ {fa_type} '{fa_name}' saved successfully with {transition_count} transitions.")
+        return True
+
+    except mysql.connector.Error as err:
+        print(f"❌ Database error: {err}")
+        if 'db' in locals():
+            db.rollback()
+        return False
+    except (ValueError, OSError) as err:
+        print(f"❌ Input error: {err}")
+        if 'db' in locals():
+            db.rollback()
+        return False
+    finally:
+        if 'cursor' in locals():
+            cursor.close()
+        if 'db' in locals():
+            db.close()
+
+
+def export_fa_stream(automaton_id, output_file, db_config):
+    """Write a stored automaton as JSON Lines, streaming transitions from the cursor."""
+    try:
+        db = connect(db_config)
+        cursor = db.cursor()
+        cursor.execute("""
+        SELECT a.name, COALESCE(a.type, 'DFA'), s.state_name
+        FROM Automata a
+        LEFT JOIN States s ON a.start_state_id = s.state_id
+        WHERE a.automaton_id = %s
+        """, (automaton_id,))
+        automaton = cursor.fetchone()
+        if not automaton:
+            print(f" Automaton with ID {automaton_id} not found.")
+            return False
+        name, fa_type, start_state = automaton
+
+        with AutomatonWriter(output_file, fa_type, start_state, name) as out:
+            cursor.execute("""
+            SELECT s.state_name, acc.state_id IS NOT NULL
+            FROM States s
+            LEFT JOIN AcceptingStates acc ON acc.state_id = s.state_id AND acc.automaton_id = s.automaton_id
+            WHERE s.automaton_id = %s
+            ORDER BY s.state_id
+            """, (automaton_id,))
+            for state_name, is_accepting in cursor:
+                out.state(state_name, bool(is_accepting))
+
+            cursor.execute("""
+            SELECT s1.state_name, al.symbol_value, s2.state_name
+            FROM Transitions t
+            JOIN States s1 ON t.current_state_id = s1.state_id
+            JOIN AlphabetSymbols al ON t.symbol_id = al.symbol_id
+            JOIN States s2 ON t.next_state_id = s2.state_id
+            WHERE t.automaton_id = %s
+            """, (automaton_id,))
+            for from_state, symbol, to_state in cursor:
+                out.transition(from_state, symbol, to_state)
+        return True
+
+    except mysql.connector.Error as err:
+        print(f" Database error: {err}")
+        return False
+    finally:
+        if 'cursor' in locals():
+            cursor.close()
+        if 'db' in locals():
+            db.close()
+
+
+def find_fa_by_language(json_file, db_config):
+    """Stored automata accepting the same language as the one in json_file."""
+    try:
+        with open(json_file, 'r') as f:
+            fa_data = json.load(f)
+        lang_hash = language_hash_from_json(fa_data)
+        if lang_hash is None:
+            print("NFA too large to determinize for a language hash")
+            return []
+
+        db = connect(db_config)
+        cursor = db.cursor(dictionary=True)
+        cursor.execute("""
+        SELECT automaton_id, name, type FROM Automata
+        WHERE language_hash = %s ORDER BY automaton_id
+        """, (lang_hash,))
+        return cursor.fetchall()
+    except mysql.connector.Error as err:
+        print(f"ERROR: {err}")
+        return None
+    finally:
+        if 'cursor' in locals():
+            cursor.close()
+        if 'db' in locals():
+            db.close()
+
+
+def backfill_language_hashes(db_config, max_states=None):
+    """Fill in language_hash for Automata rows stored without one.
+
+    That is rows from insert_fa_stream, from before the column existed, and
+    NFAs whose determinization exceeded the insert-time bound; max_states
+    bounds this run too (None: no bound). Returns the number of rows filled.
+    """
+    try:
+        db = connect(db_config)
+        cursor = db.cursor()
+        cursor.execute("SELECT automaton_id, type FROM Automata WHERE language_hash IS NULL")
+        missing = cursor.fetchall()
+        filled = 0
+        for automaton_id, fa_type in missing:
+            fa_data = load_fa(automaton_id, db_config)
+            if not fa_data:
+                continue
+            fa_data["type"] = fa_type
+            lang_hash = language_hash_from_json(fa_data, max_states)
+            if lang_hash is None:
+                print(f"Automaton {automaton_id} exceeds {max_states} DFA states; left without a hash")
+                continue
+            cursor.execute("UPDATE Automata SET language_hash = %s WHERE automaton_id = %s",
+                           (lang_hash, automaton_id))
+            db.commit()
+            filled += 1
+        return filled
+    except mysql.connector.Error as err:
+        print(f"ERROR: {err}")
+        return 0
+    finally:
+        if 'cursor' in locals():
+            cursor.close()
+        if 'db' in locals():
+            db.close()
+
+
 def list_DFA(db_config):
     try:
-        db = mysql.connector.connect(**db_config)
+        db = connect(db_config)
         cursor = db.cursor(dictionary=True)
 
         cursor.execute("SELECT automaton_id,name,type FROM automata WHERE type = 'DFA' order by automaton_id")
@@ -148,7 +396,7 @@ def list_DFA(db_config):
 
 def list_fa(db_config):
     try:
-        db = mysql.connector.connect(**db_config)
+        db = connect(db_config)
         cursor = db.cursor(dictionary=True)
 
         cursor.execute("""
@@ -178,7 +426,7 @@ def list_fa(db_config):
             db.close()
 def list_NFA(db_config):
     try:
-        db = mysql.connector.connect(**db_config)
+        db = connect(db_config)
         cursor = db.cursor(dictionary=True)
 
         cursor.execute("select automaton_id, name, type from Automata where type = 'NFA' order by automaton_id")
@@ -198,9 +446,12 @@ def list_NFA(db_config):
         if 'db' in locals():
             db.close()
             
-def load_fa(automaton_id, db_config):
+def load_fa(automaton_id, db_config, cache=None):
+    """Load an automaton as a JSON-ready dict; cache (a dict) keeps results by id."""
+    if cache is not None and automaton_id in cache:
+        return cache[automaton_id]
     try:
-        db = mysql.connector.connect(**db_config)
+        db = connect(db_config)
         cursor = db.cursor()
 
         # 1. Load main automaton info with start state
@@ -272,6 +523,8 @@ def load_fa(automaton_id, db_config):
         """, (automaton_id,))
         
         fa_data["transitions"] = [(row[0], row[1], row[2]) for row in cursor.fetchall()]
+        if cache is not None:
+            cache[automaton_id] = fa_data
         return fa_data
 
     except mysql.connector.Error as err:
@@ -283,49 +536,60 @@ def load_fa(automaton_id, db_config):
         if 'db' in locals():
             db.close()
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
+def main(argv, cache=None) -> int:
+    """Command-line entry point; also run in-process by the automaton worker."""
+    if len(argv) < 1:
         print("Usage: python db_operation.py <command> [args]")
-        sys.exit(1)
+        return 1
 
-    command = sys.argv[1]
+    command = argv[0]
 
     if command == "insert":
-        if len(sys.argv) != 3:
+        if len(argv) != 2:
             print("Usage: python db_operation.py insert <json_file>")
-            sys.exit(1)
+            return 1
         
-        json_file = sys.argv[2]
+        json_file = argv[1]
         try:
             
-            result = insert_fa(json_file, db_config)
-            if result is not None:
+            if is_jsonl(json_file):
+                result = insert_fa_stream(json_file, db_config)
+            else:
+                result = insert_fa(json_file, db_config)
+            if cache is not None:
+                cache.clear()
+            # insert_fa/insert_fa_stream return True or False, never None
+            if result:
                 print("SUCCESS")
-                sys.exit(0)
+                return 0
             else:
                 print("FAILED")
-                sys.exit(1)
+                return 1
         except Exception as e:
             print(f"ERROR: {e}")
+            return 1
     elif command == "load":
-        if len(sys.argv) != 4:
+        if len(argv) != 3:
             print("Usage: python db_operation.py load <automaton_id> <output_file>")
-            sys.exit(1)
+            return 1
         
-        automaton_id = int(sys.argv[2])
-        output_file = sys.argv[3]
+        automaton_id = int(argv[1])
+        output_file = argv[2]
         
         try:
-            fa_data = load_fa(automaton_id, db_config)
+            if is_jsonl(output_file):
+                return 0 if export_fa_stream(automaton_id, output_file, db_config) else 1
+            fa_data = load_fa(automaton_id, db_config, cache)
             if fa_data:
                 with open(output_file, 'w') as f:
                     json.dump(fa_data, f, indent=2)
-                sys.exit(0)
+                return 0
             else:
                 print("NOT_FOUND")
-                sys.exit(1)
+                return 1
         except Exception as e:
             print(f"ERROR: {e}")
+            return 1
     elif command == "list":
         try:
             automata = list_fa(db_config)
@@ -341,13 +605,42 @@ if __name__ == "__main__":
                     ]
                 }
                 print(json.dumps(result))
-                sys.exit(0)
+                return 0
             else:
                 print("EMPTY")
-                sys.exit(1)
+                return 1
         except Exception as e:
             print(f"ERROR: {e}")
-            sys.exit(1)
+            return 1
+    elif command == "find":
+        if len(argv) != 2:
+            print("Usage: python db_operation.py find <json_file>")
+            return 1
+        try:
+            automata = find_fa_by_language(argv[1], db_config)
+            if automata:
+                result = {
+                    "automata": [
+                        {
+                            "id": str(row["automaton_id"]),
+                            "name": row["name"],
+                            "type": row["type"]
+                        }
+                        for row in automata
+                    ]
+                }
+                print(json.dumps(result))
+                return 0
+            else:
+                print("NOT_FOUND")
+                return 1
+        except Exception as e:
+            print(f"ERROR: {e}")
+            return 1
+    elif command == "backfillHashes":
+        max_states = int(argv[1]) if len(argv) > 1 else None
+        print(f"Filled {backfill_language_hashes(db_config, max_states)} language hashes")
+        return 0
     elif command == "listNFA":
         try:
             automata = list_NFA(db_config)
@@ -363,13 +656,13 @@ if __name__ == "__main__":
                     ]
                 }
                 print(json.dumps(result))
-                sys.exit(0)
+                return 0
             else:
                 print("Empty")
-                sys.exit(1)
+                return 1
         except Exception as e:
             print(f"ERROR: {e}")
-            sys.exit(1)
+            return 1
     elif command == "listDFA":
         try:
             automata = list_DFA(db_config)
@@ -385,13 +678,17 @@ if __name__ == "__main__":
                     ]
                 }
                 print(json.dumps(result))
-                sys.exit(0)
+                return 0
             else:
                 print(f"Empty")
-                sys.exit(1)
+                return 1
         except Exception as e:
             print(f"ERROR: {e}")
-            sys.exit(1)                        
+            return 1                        
     else:
         print("Unknown command. Use 'insert' or 'load'")
-        sys.exit(1)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run_cli("db_operation", sys.argv[1:], main))
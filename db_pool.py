@@ -0,0 +1,146 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+import mysql.connector
+from mysql.connector import pooling
+from mysql.connector.errors import PoolError
+
+# mysql.connector caps a pool at 32 connections
+MAX_POOL_SIZE = pooling.CNX_POOL_MAXSIZE
+
+
+class PooledConnection:
+    """Checked-out connection; close() hands it back to the pool.
+
+    Everything else is forwarded to the underlying MySQL connection, so it
+    can be used wherever a plain connection was used before.
+    """
+
+    def __init__(self, pool: "ConnectionPool", conn: Any, owned: bool = True):
+        self._pool = pool
+        self._conn = conn
+        self._owned = owned
+        self._closed = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._owned:
+            self._pool._release(self._conn)
+
+
+class ConnectionPool:
+    """Thread-safe MySQL connection pool with health checks and metrics.
+
+    Checkouts block (instead of failing like mysql.connector's own pool)
+    until a connection is free. Inside ``with pool.connection():`` every
+    get_connection() on the same thread returns the pinned connection, so
+    several operations share one checkout.
+    """
+
+    def __init__(self, config: Dict[str, Any], size: int = 5, health_check: bool = True):
+        if not 1 <= size <= MAX_POOL_SIZE:
+            raise ValueError(f"Pool size must be between 1 and {MAX_POOL_SIZE}")
+        self.config = dict(config)
+        self.size = size
+        self.health_check = health_check
+        self._pool = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._local = threading.local()
+        self._metrics = {"checkouts": 0, "waits": 0, "wait_seconds": 0.0, "reconnects": 0, "in_use": 0}
+
+    def _mysql_pool(self) -> pooling.MySQLConnectionPool:
+        # Created on first checkout so a pool can be declared before the database exists
+        with self._lock:
+            if self._pool is None:
+                self._pool = pooling.MySQLConnectionPool(pool_size=self.size, **self.config)
+            return self._pool
+
+    def get_connection(self, timeout: Optional[float] = None) -> PooledConnection:
+        pinned = getattr(self._local, "conn", None)
+        if pinned is not None:
+            return PooledConnection(self, pinned, owned=False)
+
+        started = time.perf_counter()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._metrics["waits"] += 1
+            if not self._slots.acquire(timeout=timeout):
+                raise PoolError("Timed out waiting for a pooled connection")
+        waited = time.perf_counter() - started
+
+        try:
+            conn = self._mysql_pool().get_connection()
+            if self.health_check:
+                self._check(conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._metrics["checkouts"] += 1
+            self._metrics["wait_seconds"] += waited
+            self._metrics["in_use"] += 1
+        return PooledConnection(self, conn)
+
+    def _check(self, conn: Any) -> None:
+        """Ping the connection and transparently reconnect a stale one."""
+        try:
+            conn.ping(reconnect=False)
+        except mysql.connector.Error:
+            conn.reconnect(attempts=2, delay=0)
+            with self._lock:
+                self._metrics["reconnects"] += 1
+
+    def _release(self, conn: Any) -> None:
+        try:
+            conn.close()
+        finally:
+            with self._lock:
+                self._metrics["in_use"] -= 1
+            self._slots.release()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[PooledConnection]:
+        """Check out one connection for the duration of the block."""
+        pinned = getattr(self._local, "conn", None)
+        if pinned is not None:
+            yield PooledConnection(self, pinned, owned=False)
+            return
+        conn = self.get_connection(timeout)
+        self._local.conn = conn._conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            conn.close()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._metrics, size=self.size)
+
+
+_pools: Dict[tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(config: Dict[str, Any], size: int = 5) -> ConnectionPool:
+    """Shared pool for a connection config (one per distinct config)."""
+    key = tuple(sorted((k, str(v)) for k, v in config.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(config, size)
+        return pool
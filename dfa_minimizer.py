@@ -1,99 +1,467 @@
-from typing import Set, Dict, Tuple, FrozenSet
-from collections import defaultdict
+from typing import Set, Dict, Tuple, FrozenSet, Optional, Union, List
+from array import array
 import json
+import sys
+import time
+from worker_client import run_cli
+from automaton import Automaton, NO_TRANSITION
+from alphabet import compress_automaton, dfa_symbol_classes, expand_automaton
 from display import display_automaton, print_automaton
+from phase_stats import PhaseStats, phase, run_profiled, split_flags
 
 def frozenset_to_list(obj):
     if isinstance(obj, frozenset) or isinstance(obj, set):
         return [frozenset_to_list(e) for e in obj]
     return obj
-def minimize_dfa(
-    states: Set[FrozenSet[str]],
-    start: FrozenSet[str],
-    finals: Set[FrozenSet[str]],
-    transitions: Dict[Tuple[FrozenSet[str], str], FrozenSet[str]]
-) -> Tuple[Set[FrozenSet[str]], FrozenSet[str], Set[FrozenSet[str]], Dict[Tuple[FrozenSet[str], str], FrozenSet[str]]]:
-    
-    # Initial partition
-    partitions = {frozenset(finals), frozenset(states - finals)}
+def build_inverse_index(automaton: Automaton, sink: int = NO_TRANSITION) -> Tuple[List[array], List[array]]:
+    """Per-symbol predecessor lists in CSR form.
+
+    The predecessors of state t on symbol a are
+    ``sources[a][offsets[a][t]:offsets[a][t + 1]]``. Missing transitions are
+    routed to ``sink`` when one is given, otherwise they are left out.
+    """
+    n = automaton.num_states + (1 if sink != NO_TRANSITION else 0)
+    k = automaton.num_symbols
+    table = automaton.table
+    offsets_per_symbol = []
+    sources_per_symbol = []
+    for a in range(k):
+        counts = array('i', [0]) * (n + 1)
+        for p in range(n):
+            t = table[p * k + a] if p < automaton.num_states else sink
+            if t == NO_TRANSITION:
+                t = sink
+            if t != NO_TRANSITION:
+                counts[t + 1] += 1
+        for t in range(n):
+            counts[t + 1] += counts[t]
+        fill = array('i', counts)
+        sources = array('i', [0]) * counts[n]
+        for p in range(n):
+            t = table[p * k + a] if p < automaton.num_states else sink
+            if t == NO_TRANSITION:
+                t = sink
+            if t != NO_TRANSITION:
+                sources[fill[t]] = p
+                fill[t] += 1
+        offsets_per_symbol.append(counts)
+        sources_per_symbol.append(sources)
+    return offsets_per_symbol, sources_per_symbol
+
+
+def hopcroft_partition(automaton: Automaton, stats: Optional[PhaseStats] = None) -> Tuple[array, int, int]:
+    """Coarsest stable partition of an Automaton with Hopcroft's algorithm.
+
+    Uses a refinable partition (elements/location/block bounds arrays), the
+    precomputed inverse index and the "smaller half" worklist rule, giving
+    O(n * k * log n). Missing transitions go to a virtual sink state with id
+    ``num_states`` if the DFA is partial.
+
+    Returns (block id per state, number of blocks, sink id or NO_TRANSITION).
+    """
+    n = automaton.num_states
+    k = automaton.num_symbols
+    sink = n if NO_TRANSITION in automaton.table else NO_TRANSITION
+    size = n + (1 if sink != NO_TRANSITION else 0)
+    with phase(stats, "inverse_index"):
+        offsets, sources = build_inverse_index(automaton, sink)
+    started = time.perf_counter() if stats is not None else 0.0
+
+    # Refinable partition: block b owns elements[first[b]:last[b]]
+    accepting = automaton.accepting
+    finals = [q for q in range(n) if accepting[q]]
+    others = [q for q in range(size) if q >= n or not accepting[q]]
+    elements = array('i', finals + others)
+    location = array('i', [0]) * size
+    for pos, q in enumerate(elements):
+        location[q] = pos
+    block_of = array('i', [0]) * size
+    first = array('i')
+    last = array('i')
+    marked = array('i')
+    for group in (finals, others):
+        if group:
+            b = len(first)
+            start = len(finals) if group is others else 0
+            first.append(start)
+            last.append(start + len(group))
+            marked.append(0)
+            for q in group:
+                block_of[q] = b
+
+    # Worklist of (block, symbol) splitters
+    waiting = []
+    in_waiting = set()
+    if len(first) == 2:
+        smaller = 0 if last[0] - first[0] <= last[1] - first[1] else 1
+        for a in range(k):
+            waiting.append((smaller, a))
+            in_waiting.add(smaller * k + a)
+
+    touched = []
+    rounds = 0
+    splits = 0
+    waiting_peak = len(waiting)
+    while waiting:
+        rounds += 1
+        splitter, a = waiting.pop()
+        in_waiting.discard(splitter * k + a)
+        sym_offsets = offsets[a]
+        sym_sources = sources[a]
+
+        # Mark every predecessor by moving it to the front of its block
+        for t in elements[first[splitter]:last[splitter]]:
+            for i in range(sym_offsets[t], sym_offsets[t + 1]):
+                p = sym_sources[i]
+                b = block_of[p]
+                if marked[b] == 0:
+                    touched.append(b)
+                target = first[b] + marked[b]
+                other = elements[target]
+                p_pos = location[p]
+                elements[target], elements[p_pos] = p, other
+                location[p], location[other] = target, p_pos
+                marked[b] += 1
+
+        # Split each touched block into its marked and unmarked parts
+        for b in touched:
+            m = marked[b]
+            marked[b] = 0
+            block_size = last[b] - first[b]
+            if m == block_size:
+                continue
+            splits += 1
+            new = len(first)
+            if m <= block_size - m:
+                # The marked prefix becomes the new block
+                first.append(first[b])
+                last.append(first[b] + m)
+                first[b] += m
+            else:
+                first.append(first[b] + m)
+                last.append(last[b])
+                last[b] = first[b] + m
+            marked.append(0)
+            for pos in range(first[new], last[new]):
+                block_of[elements[pos]] = new
+            for c in range(k):
+                if b * k + c in in_waiting:
+                    waiting.append((new, c))
+                    in_waiting.add(new * k + c)
+                else:
+                    smaller = new if last[new] - first[new] <= last[b] - first[b] else b
+                    waiting.append((smaller, c))
+                    in_waiting.add(smaller * k + c)
+            if len(waiting) > waiting_peak:
+                waiting_peak = len(waiting)
+        touched.clear()
+
+    if stats is not None:
+        stats.add_time("refinement", time.perf_counter() - started)
+        stats.count("refinement_rounds", rounds)
+        stats.count("splits", splits)
+        stats.count("blocks", len(first))
+        stats.high_water("queue_high_water", waiting_peak)
+    return block_of, len(first), sink
+
+
+def trim(automaton: Automaton, stats: Optional[PhaseStats] = None) -> Automaton:
+    """Drop states that are unreachable from the start or cannot reach a final state.
+
+    Transitions into dropped states become missing transitions, so the
+    result is a partial DFA whose implicit sink is never materialized. The
+    start state is always kept; an empty language leaves it as the only
+    state. Two linear passes: forward from the start over the table, then
+    backward from the reachable final states over a CSR predecessor index.
+    The automaton itself is returned when nothing is dropped.
+    """
+    n = automaton.num_states
+    k = automaton.num_symbols
+    table = automaton.table
+    accepting = automaton.accepting
+    started = time.perf_counter() if stats is not None else 0.0
+
+    reachable = bytearray(n)
+    reachable[automaton.start] = 1
+    stack = [automaton.start]
+    while stack:
+        q = stack.pop()
+        for t in table[q * k:(q + 1) * k]:
+            if t != NO_TRANSITION and not reachable[t]:
+                reachable[t] = 1
+                stack.append(t)
+
+    # Predecessors of every state, counting only edges from reachable states
+    offsets = array('i', [0]) * (n + 1)
+    for q in range(n):
+        if reachable[q]:
+            for t in table[q * k:(q + 1) * k]:
+                if t != NO_TRANSITION:
+                    offsets[t + 1] += 1
+    for q in range(n):
+        offsets[q + 1] += offsets[q]
+    fill = array('i', offsets)
+    sources = array('i', [0]) * offsets[n]
+    for q in range(n):
+        if reachable[q]:
+            for t in table[q * k:(q + 1) * k]:
+                if t != NO_TRANSITION:
+                    sources[fill[t]] = q
+                    fill[t] += 1
+
+    live = bytearray(n)
+    stack = [q for q in range(n) if reachable[q] and accepting[q]]
+    for q in stack:
+        live[q] = 1
+    while stack:
+        q = stack.pop()
+        for p in sources[offsets[q]:offsets[q + 1]]:
+            if not live[p]:
+                live[p] = 1
+                stack.append(p)
+    live[automaton.start] = 1
+
+    num_reachable = sum(reachable)
+    num_live = sum(live)
+    if stats is not None:
+        stats.add_time("trim", time.perf_counter() - started)
+        stats.count("states_before", n)
+        stats.count("unreachable_states", n - num_reachable)
+        stats.count("dead_states", num_reachable - num_live)
+    if num_live == n:
+        return automaton
+
+    new_id = array('i', [NO_TRANSITION]) * n
+    kept = [q for q in range(n) if live[q]]
+    for i, q in enumerate(kept):
+        new_id[q] = i
+    new_table = array('i', [NO_TRANSITION]) * (len(kept) * k)
+    for i, q in enumerate(kept):
+        row = q * k
+        for a in range(k):
+            t = table[row + a]
+            if t != NO_TRANSITION:
+                new_table[i * k + a] = new_id[t]
+    return Automaton([automaton.labels[q] for q in kept], list(automaton.symbols), new_id[automaton.start],
+                     bytearray(accepting[q] for q in kept), new_table)
+
+
+def classic_partition(automaton: Automaton, stats: Optional[PhaseStats] = None) -> Tuple[array, int]:
+    """The original set-based partition refinement, over state ids.
+
+    Kept as a simple reference for the hopcroft engine: every round scans
+    each symbol's column for the predecessors of the current part and
+    splits every part against them. Returns (block_of, num_blocks).
+    """
+    n = automaton.num_states
+    k = automaton.num_symbols
+    table = automaton.table
+    started = time.perf_counter() if stats is not None else 0.0
+    rounds = 0
+    splits = 0
+    finals = frozenset(q for q in range(n) if automaton.accepting[q])
+    partitions = {part for part in (finals, frozenset(range(n)) - finals) if part}
     waiting = set(partitions)
-    
+    # Missing transitions lead to an implicit sink outside every part, which
+    # breaks the "smaller half" rule below; partial DFAs requeue both halves
+    partial = NO_TRANSITION in table
+
     while waiting:
+        rounds += 1
         current = waiting.pop()
-        
-        # Get all transition symbols
-        symbols = {sym for (_, sym) in transitions.keys()}
-        
-        for symbol in symbols:
-            # Find states that transition into current set
-            inverse = defaultdict(set)
-            for (from_state, sym), to_state in transitions.items():
-                if sym == symbol:
-                    for part in partitions:
-                        if to_state in part:
-                            inverse[part].add(from_state)
-                            break
-            
-            # Refine partitions
+        for a in range(k):
+            # States that transition into current on symbol a
+            inverse = {q for q, t in enumerate(table[a::k]) if t in current}
             new_partitions = set()
             for part in partitions:
-                split1 = part & inverse.get(part, set())
-                split2 = part - inverse.get(part, set())
-                
+                split1 = part & inverse
+                split2 = part - inverse
                 if split1 and split2:
-                    new_partitions.add(frozenset(split1))
-                    new_partitions.add(frozenset(split2))
-                    
+                    splits += 1
+                    new_partitions.add(split1)
+                    new_partitions.add(split2)
                     if part in waiting:
                         waiting.remove(part)
-                        waiting.add(frozenset(split1))
-                        waiting.add(frozenset(split2))
+                        waiting.add(split1)
+                        waiting.add(split2)
+                    elif partial:
+                        waiting.add(split1)
+                        waiting.add(split2)
                     else:
-                        waiting.add(frozenset(split1) if len(split1) <= len(split2) else waiting.add(frozenset(split2)))
+                        waiting.add(split1 if len(split1) <= len(split2) else split2)
                 else:
                     new_partitions.add(part)
-            
             partitions = new_partitions
-    
-    # Create state mapping
-    state_map = {state: part for part in partitions for state in part}
-    
-    # Build new transitions
-    new_transitions = {
-        (state_map[from_state], sym): state_map[to_state]
-        for (from_state, sym), to_state in transitions.items()
-    }
-    
-    new_start = state_map[start]
-    new_finals = {state_map[state] for state in finals}
-    
-    return set(partitions), new_start, new_finals, new_transitions
 
-if __name__ == "__main__":
-    with open("dfa_input.json") as f:
-        data = json.load(f)
-    states = set(data["states"])    
-    start = data["startState"]
-    finals = set(data["acceptingStates"])
+    if stats is not None:
+        stats.add_time("refinement", time.perf_counter() - started)
+        stats.count("refinement_rounds", rounds)
+        stats.count("splits", splits)
+        stats.count("blocks", len(partitions))
+    block_of = array('i', [0]) * n
+    for b, part in enumerate(partitions):
+        for q in part:
+            block_of[q] = b
+    return block_of, len(partitions)
+
+
+def _minimize_automaton(automaton: Automaton, stats: Optional[PhaseStats] = None, prune: bool = False,
+                        compress_alphabet: bool = False, engine: str = "hopcroft") -> Automaton:
+    """Minimization of an Automaton with either engine, merged states labelled by frozensets."""
+    if prune:
+        automaton = trim(automaton, stats)
+    if compress_alphabet:
+        with phase(stats, "alphabet_classes"):
+            classes = dfa_symbol_classes(automaton)
+            automaton = compress_automaton(automaton, classes)
+        if stats is not None:
+            stats.count("symbol_classes", len(classes))
+    if engine == "classic":
+        block_of, num_blocks = classic_partition(automaton, stats)
+    else:
+        block_of, num_blocks, _ = hopcroft_partition(automaton, stats)
+    with phase(stats, "quotient"):
+        minimized = _quotient(automaton, block_of, num_blocks)
+    if compress_alphabet:
+        with phase(stats, "alphabet_expand"):
+            minimized = expand_automaton(minimized, classes)
+    if stats is not None:
+        stats.count("states_after", minimized.num_states)
+    return minimized
+
+
+def _quotient(automaton: Automaton, block_of: array, num_blocks: int) -> Automaton:
+    """The DFA whose states are the blocks of a stable partition."""
+    n = automaton.num_states
+    k = automaton.num_symbols
+
+    # Number blocks in order of their first state; the sink never becomes a state
+    new_id = array('i', [NO_TRANSITION]) * num_blocks
+    members = []
+    for q in range(n):
+        b = block_of[q]
+        if new_id[b] == NO_TRANSITION:
+            new_id[b] = len(members)
+            members.append([])
+        members[new_id[b]].append(automaton.labels[q])
+
+    table = array('i', [NO_TRANSITION]) * (len(members) * k)
+    accepting = bytearray(len(members))
+    old_table = automaton.table
+    for q in range(n):
+        row = new_id[block_of[q]]
+        accepting[row] = automaton.accepting[q]
+        for a in range(k):
+            t = old_table[q * k + a]
+            if t != NO_TRANSITION:
+                table[row * k + a] = new_id[block_of[t]]
+
+    labels = [frozenset(group) for group in members]
+    return Automaton(labels, list(automaton.symbols), new_id[block_of[automaton.start]], accepting, table)
+
+
+def minimize_dfa(
+    states: Union[Set[FrozenSet[str]], Automaton],
+    start: Optional[FrozenSet[str]] = None,
+    finals: Optional[Set[FrozenSet[str]]] = None,
+    transitions: Optional[Dict[Tuple[FrozenSet[str], str], FrozenSet[str]]] = None,
+    engine: str = "hopcroft",
+    stats: Optional[PhaseStats] = None,
+    prune: bool = False,
+    compress_alphabet: bool = False
+) -> Union[Tuple[Set[FrozenSet[str]], FrozenSet[str], Set[FrozenSet[str]], Dict[Tuple[FrozenSet[str], str], FrozenSet[str]]], Automaton]:
+    """Minimize a DFA given as the dict tuple or as an Automaton (returned in the same form).
+
+    engine selects "hopcroft" (O(n * k * log n)) or the original "classic"
+    partition refinement; both work on the Automaton table, so dict input is
+    converted once on the way in and once on the way out. By default the
+    result keeps the dead states, as it always has; with prune=True
+    unreachable and dead states are pruned first (see trim), so the result
+    is the minimal partial DFA with no dead state.
+    compress_alphabet minimizes over classes of symbols with identical
+    columns (see alphabet.py) and expands the result back to symbols. A PhaseStats passed as ``stats`` receives phase
+    timings, refinement counters and the before/after state counts.
+    """
+    if engine not in ("hopcroft", "classic"):
+        raise ValueError(f"Unknown minimization engine: {engine}")
+    if isinstance(states, Automaton):
+        return _minimize_automaton(states, stats, prune, compress_alphabet, engine)
+    with phase(stats, "to_automaton"):
+        automaton = Automaton.from_dict(states, start, finals, transitions)
+    minimized = _minimize_automaton(automaton, stats, prune, compress_alphabet, engine)
+    with phase(stats, "to_dict"):
+        return minimized.to_dict()
+
+def main(argv=None) -> int:
+    """Script entry point; also run in-process by the automaton worker.
+
+    Usage: python dfa_minimizer.py [input] [output] [--stats] [--profile];
+    .jsonl paths are read and written as streamed automaton JSON Lines instead
+    of whole JSON documents. --stats prints phase timings and counters and
+    --profile a cProfile summary; both bypass the result cache.
+    """
+    from stream_io import is_jsonl, iter_records, read_header, write_dfa, STATE_RECORD
+    argv, show_stats, profile = split_flags(argv or [])
+    input_path = argv[0] if len(argv) > 0 else "dfa_input.json"
+    output_path = argv[1] if len(argv) > 1 else "minimized.json"
     transitions = {}
-    for from_state, symbol, to_state in data["transitions"]:
-        transitions[(frozenset({from_state}), symbol)] = frozenset({to_state})
+    if is_jsonl(input_path):
+        start = read_header(input_path)["startState"]
+        states, finals = set(), set()
+        for record in iter_records(input_path):
+            if record[0] == STATE_RECORD:
+                states.add(record[1])
+                if record[2]:
+                    finals.add(record[1])
+            else:
+                _, from_state, symbol, to_state = record
+                transitions[(frozenset({from_state}), symbol)] = frozenset({to_state})
+    else:
+        with open(input_path) as f:
+            data = json.load(f)
+        # The "nt" pseudo-state of the V3 format means no transition (the implicit sink)
+        states = {s for s in data["states"] if s != "nt"}
+        start = data["startState"]
+        finals = {s for s in data["acceptingStates"] if s != "nt"}
+        for from_state, symbol, to_state in data["transitions"]:
+            if from_state != "nt" and to_state != "nt":
+                transitions[(frozenset({from_state}), symbol)] = frozenset({to_state})
 
     frozen_states = {frozenset({s}) for s in states}
     frozen_start = frozenset({start})
     frozen_finals = {frozenset({f}) for f in finals}
-    partitions, new_start, new_finals, new_transitions = minimize_dfa(frozen_states, frozen_start, frozen_finals, transitions)
-    result = {
-        "states": [frozenset_to_list(s) for s in partitions],
-        "startState": frozenset_to_list(new_start),
-        "acceptingStates": [frozenset_to_list(s) for s in new_finals],
-        "transitions": [
-            {"from": frozenset_to_list(k[0]), "symbol": k[1], "to": frozenset_to_list(v)}
-            for k, v in new_transitions.items()
-        ]
-    }
-    with open("minimized.json", "w") as f:
-        json.dump(result, f, indent=4)
+    from result_cache import default_cache
+    cache = default_cache()
+    stats = PhaseStats() if show_stats else None
+    if show_stats or profile:
+        minimize = lambda: minimize_dfa(frozen_states, frozen_start, frozen_finals, transitions, stats=stats)
+        partitions, new_start, new_finals, new_transitions = run_profiled(minimize) if profile else minimize()
+    else:
+        options = {"engine": "hopcroft", "prune": False}
+        partitions, new_start, new_finals, new_transitions = cache.get_or_compute(
+            "min", (frozen_states, frozen_start, frozen_finals, transitions),
+            lambda: minimize_dfa(frozen_states, frozen_start, frozen_finals, transitions, **options), options)
+    if is_jsonl(output_path):
+        write_dfa(output_path, partitions, new_start, new_finals, new_transitions)
+    else:
+        result = {
+            "states": [frozenset_to_list(s) for s in partitions],
+            "startState": frozenset_to_list(new_start),
+            "acceptingStates": [frozenset_to_list(s) for s in new_finals],
+            "transitions": [
+                {"from": frozenset_to_list(k[0]), "symbol": k[1], "to": frozenset_to_list(v)}
+                for k, v in new_transitions.items()
+            ]
+        }
+        with open(output_path, "w") as f:
+            json.dump(result, f, indent=4)
     print_automaton(partitions, new_start, new_finals, new_transitions, "Minimized DFA")
+    print(f"States: {len(frozen_states)} -> {len(partitions)}")
     print("DFA minimized successfully!")
-    
+    if stats is not None:
+        print(stats.report())
+    print(f"Result cache: {cache.stats}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run_cli("dfa_minimizer", sys.argv[1:], main))
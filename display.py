@@ -1,110 +1,428 @@
-from typing import Dict, Tuple, FrozenSet, Set, Optional, Any
+from typing import Dict, Tuple, FrozenSet, Set, Optional, Any, Union, Iterator, List, IO
+from collections import deque
 import json;
+import html
+import shutil
+import subprocess
+import sys
+from worker_client import run_cli
+from automaton import Automaton, NO_TRANSITION, as_automaton
 # Conditional import and type handling
 GRAPHVIZ_AVAILABLE = False
 GraphType = Any  # Default type
 
 try:
-    from graphviz import Digraph
+    from graphviz import Digraph, Source
     GraphType = Digraph
     GRAPHVIZ_AVAILABLE = True
 except ImportError:
     print("Note: Graphviz not installed - using text display only")
 
+# Above this many states only the start state's neighbourhood is drawn
+SUMMARY_THRESHOLD = 200
+# Nodes show full state labels up to this many states, short ids plus a legend above
+FULL_LABEL_LIMIT = 30
+# Entries per column of the legend table drawn beside short-id graphs
+LEGEND_ROWS = 40
+
 def display_automaton(
-    states: Set[FrozenSet[str]], 
-    start: FrozenSet[str], 
-    finals: Set[FrozenSet[str]], 
-    transitions: Dict[Tuple[FrozenSet[str], str], FrozenSet[str]], 
-    name: str = "Automaton"
+    states: Union[Set[FrozenSet[str]], Automaton], 
+    start: Optional[FrozenSet[str]] = None, 
+    finals: Optional[Set[FrozenSet[str]]] = None, 
+    transitions: Optional[Dict[Tuple[FrozenSet[str], str], FrozenSet[str]]] = None, 
+    name: str = "Automaton",
+    output: Optional[str] = None,
+    fmt: str = "png",
+    view: bool = True,
+    max_states: int = SUMMARY_THRESHOLD,
+    depth: Optional[int] = None
 ) -> Optional[Any]:
-    """Visualize automaton using Graphviz (if available) or text output"""
+    """Visualize automaton using Graphviz (if available) or text output
+
+    Parallel edges are merged into one edge labelled with a symbol set, large
+    automata use short state ids with a legend, and above max_states only the
+    start state's neighbourhood (up to ``depth``, chosen automatically when
+    None) is drawn. With view=False no viewer is opened: the graph is
+    streamed to ``output`` as DOT, or through the dot binary for other formats.
+    """
+    automaton = as_automaton(states, start, finals, transitions)
+
+    if not view:
+        path = output or f"automaton_{name}.{fmt}"
+        return render_automaton(automaton, path, fmt, name, max_states, depth)
+
     if not GRAPHVIZ_AVAILABLE:
         print("\nGraph visualization not available - displaying text representation instead:")
-        print_automaton(states, start, finals, transitions, name)
+        print_automaton(automaton, title=name)
         return None
         
     try:
-        dot = Digraph(format='png')
-        dot.attr(rankdir='LR', label=f"{name}\\n(States: {len(states)}, Transitions: {len(transitions)})")
-        
-        # Add states
-        for state in states:
-            label = format_state(state)
-            if state in finals:
-                dot.node(label, shape='doublecircle', color='green')
-            else:
-                dot.node(label)
-            
-            if state == start:
-                dot.node('start', shape='none', label='')
-                dot.edge('start', label)
-        
-        # Add transitions
-        for (from_state, symbol), to_state in transitions.items():
-            from_label = format_state(from_state)
-            to_label = format_state(to_state)
-            dot.edge(from_label, to_label, label=symbol)
-        
-        output_path = dot.render(f'automaton_{name}', view=True, cleanup=True)
+        dot = Source("".join(iter_dot(automaton, name, max_states, depth)), format=fmt)
+        output_path = dot.render(output or f'automaton_{name}', view=True, cleanup=True)
         print(f"Visualization saved to: {output_path}")
         return dot
     except Exception as e:
         print(f"Visualization error: {e}")
         return None
 
+def symbol_ranges(symbols: List[str]) -> str:
+    """Compact edge label: runs of 3+ consecutive single characters become ranges (a-e)."""
+    parts = []
+    run: List[str] = []
+
+    def flush():
+        if len(run) >= 3:
+            parts.append(f"{run[0]}-{run[-1]}")
+        else:
+            parts.extend(run)
+        run.clear()
+
+    for sym in sorted(symbols):
+        if len(sym) == 1 and run and ord(sym) == ord(run[-1]) + 1:
+            run.append(sym)
+            continue
+        flush()
+        if len(sym) == 1:
+            run.append(sym)
+        else:
+            parts.append(sym)
+    flush()
+    return ",".join(parts)
+
+def neighbourhood(automaton: Automaton, depth: int) -> List[int]:
+    """State ids within ``depth`` transitions of the start state, in BFS order."""
+    k = automaton.num_symbols
+    table = automaton.table
+    distance = {automaton.start: 0}
+    order = [automaton.start]
+    queue = deque(order)
+    while queue:
+        q = queue.popleft()
+        if distance[q] == depth:
+            continue
+        for a in range(k):
+            t = table[q * k + a]
+            if t != NO_TRANSITION and t not in distance:
+                distance[t] = distance[q] + 1
+                order.append(t)
+                queue.append(t)
+    return order
+
+def summary_depth(automaton: Automaton, max_states: int) -> int:
+    """Largest depth whose neighbourhood still has at most max_states states (at least 1)."""
+    depth = 1
+    previous = len(neighbourhood(automaton, 1))
+    while True:
+        size = len(neighbourhood(automaton, depth + 1))
+        if size > max_states or size == previous:
+            return depth
+        depth += 1
+        previous = size
+
+def _dot_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _legend_table(entries: List[str]) -> str:
+    """HTML-like DOT label laying the legend out in columns of LEGEND_ROWS entries."""
+    columns = []
+    for i in range(0, len(entries), LEGEND_ROWS):
+        lines = '<BR/>'.join(html.escape(entry.replace("\n", " ")) for entry in entries[i:i + LEGEND_ROWS])
+        columns.append(f'<TD ALIGN="LEFT" BALIGN="LEFT">{lines}</TD>')
+    return f'<<TABLE BORDER="0" CELLBORDER="1" CELLSPACING="0"><TR>{"".join(columns)}</TR></TABLE>>'
+
+def iter_dot(
+    automaton: Automaton,
+    name: str = "Automaton",
+    max_states: int = SUMMARY_THRESHOLD,
+    depth: Optional[int] = None
+) -> Iterator[str]:
+    """Yield the DOT source of an automaton line by line (see display_automaton)."""
+    n = automaton.num_states
+    k = automaton.num_symbols
+    table = automaton.table
+    if n > max_states or depth is not None:
+        shown = neighbourhood(automaton, depth if depth is not None else summary_depth(automaton, max_states))
+    else:
+        shown = list(range(n))
+    node_id = {q: f"s{i}" for i, q in enumerate(shown)}
+    short = len(shown) > FULL_LABEL_LIMIT
+    hidden = n - len(shown)
+
+    title = f"{name}\n(States: {n}, Transitions: {automaton.num_transitions()})"
+    if hidden:
+        title += f"\nshowing {len(shown)} states near the start"
+    yield "digraph {\n"
+    yield f'  rankdir=LR; label="{_dot_escape(title)}";\n'
+    yield '  start [shape=none, label=""];\n'
+
+    legend = []
+    for q in shown:
+        full = format_state(automaton.labels[q])
+        if short:
+            legend.append(f"{node_id[q]} = {full}")
+            yield f"  // {node_id[q]}: {full.replace(chr(10), ' ')}\n"
+        label = _dot_escape(node_id[q] if short else full)
+        if automaton.accepting[q]:
+            yield f'  {node_id[q]} [label="{label}", shape=doublecircle, color=green];\n'
+        else:
+            yield f'  {node_id[q]} [label="{label}"];\n'
+    if hidden:
+        yield f'  more [shape=box, style=dashed, label="{hidden} more states"];\n'
+    if legend:
+        yield f"  legend [shape=plaintext, label={_legend_table(legend)}];\n"
+
+    yield f"  start -> {node_id[automaton.start]};\n"
+    for q in shown:
+        # One edge per (source, target) pair, labelled with all its symbols
+        targets: Dict[str, List[str]] = {}
+        for a in range(k):
+            t = table[q * k + a]
+            if t != NO_TRANSITION:
+                targets.setdefault(node_id.get(t, "more"), []).append(automaton.symbols[a])
+        for target, symbols in targets.items():
+            yield f'  {node_id[q]} -> {target} [label="{_dot_escape(symbol_ranges(symbols))}"];\n'
+    yield "}\n"
+
+def write_dot(
+    target: Union[str, IO[str]],
+    automaton: Automaton,
+    name: str = "Automaton",
+    max_states: int = SUMMARY_THRESHOLD,
+    depth: Optional[int] = None
+) -> None:
+    """Stream the DOT source to a path or open text file."""
+    if isinstance(target, str):
+        with open(target, "w", encoding="utf-8") as f:
+            f.writelines(iter_dot(automaton, name, max_states, depth))
+    else:
+        target.writelines(iter_dot(automaton, name, max_states, depth))
+
+def render_automaton(
+    automaton: Automaton,
+    path: str,
+    fmt: str = "svg",
+    name: str = "Automaton",
+    max_states: int = SUMMARY_THRESHOLD,
+    depth: Optional[int] = None
+) -> Optional[str]:
+    """Write the graph to ``path`` without opening a viewer.
+
+    "dot" writes the DOT source; other formats pipe it through the Graphviz
+    dot binary. Returns the written path, or None if dot is not installed.
+    """
+    if fmt == "dot":
+        write_dot(path, automaton, name, max_states, depth)
+        print(f"Visualization saved to: {path}")
+        return path
+    dot_binary = shutil.which("dot")
+    if dot_binary is None:
+        print("Graphviz 'dot' not found - write DOT output (fmt='dot') instead")
+        return None
+    with subprocess.Popen([dot_binary, f"-T{fmt}", "-o", path], stdin=subprocess.PIPE, text=True) as proc:
+        proc.stdin.writelines(iter_dot(automaton, name, max_states, depth))
+        proc.stdin.close()
+    if proc.returncode != 0:
+        print(f"Visualization error: dot exited with status {proc.returncode}")
+        return None
+    print(f"Visualization saved to: {path}")
+    return path
+
 def format_state(state: FrozenSet[str]) -> str:
     """Helper function to format a state (which might be a frozenset of strings)"""
     
+    # Plain string labels (e.g. states fetched from the database) and integer state ids
+    if isinstance(state, str):
+        return state
+    if not isinstance(state, (frozenset, set)):
+        return str(state)
+
     # This check is crucial for handling nested frozensets
     if isinstance(next(iter(state)), frozenset):
         # If the state is a frozenset of frozensets, format each inner frozenset recursively
         return ','.join(sorted([format_state(s) for s in state]))
     else:
         # Otherwise, assume it's a simple frozenset of strings
-        if len(state) == 1 and isinstance(next(iter(state)), str):
-            return next(iter(state))
-        return ','.join(sorted(state))
+        if len(state) == 1:
+            return str(next(iter(state)))
+        return ','.join(sorted(map(str, state)))
+
+def format_labels(automaton: Automaton) -> List[str]:
+    """format_state of every state, computed once and indexed by state id."""
+    return [format_state(label) for label in automaton.labels]
+
+def iter_lines(
+    automaton: Automaton,
+    title: str = "Automaton",
+    fmt: str = "text",
+    limit: Optional[int] = None
+) -> Iterator[str]:
+    """Yield the print_automaton output line by line (without newlines).
+
+    fmt "text" is the human-readable summary; "tsv" and "csv" emit one
+    kind/state/accepting/symbol/target row per start marker, state and
+    transition. With ``limit`` only the first transitions are listed.
+    """
+    labels = format_labels(automaton)
+    order = sorted(range(automaton.num_states), key=labels.__getitem__)
+    k = automaton.num_symbols
+    symbols = automaton.symbols
+    table = automaton.table
+    accepting = automaton.accepting
+
+    def transitions() -> Iterator[Tuple[int, str, int]]:
+        for q in order:
+            row = q * k
+            for a in range(k):
+                t = table[row + a]
+                if t != NO_TRANSITION:
+                    yield q, symbols[a], t
+
+    if fmt in ("tsv", "csv"):
+        import csv
+        import io
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter="\t" if fmt == "tsv" else ",", lineterminator="")
+
+        def row(*fields) -> str:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(fields)
+            return buffer.getvalue()
+
+        yield row("kind", "state", "accepting", "symbol", "target")
+        yield row("start", labels[automaton.start], "", "", "")
+        for q in order:
+            yield row("state", labels[q], accepting[q], "", "")
+        for count, (q, symbol, t) in enumerate(transitions()):
+            if limit is not None and count >= limit:
+                return
+            yield row("transition", labels[q], "", symbol, labels[t])
+        return
+    if fmt != "text":
+        raise ValueError(f"Unknown output format: {fmt}")
+
+    finals = [q for q in order if accepting[q]]
+    yield f"\n{title} Summary:"
+    yield f"States ({len(order)}): " + ", ".join(f"{{{labels[q]}}}" for q in order)
+    yield f"Start State: {{{labels[automaton.start]}}}"
+    yield f"Final States ({len(finals)}): " + ", ".join(f"{{{labels[q]}}}" for q in finals)
+    yield "\nTransitions:"
+    for count, (q, symbol, t) in enumerate(transitions()):
+        if limit is not None and count >= limit:
+            yield f"... {automaton.num_transitions() - limit} more transitions"
+            return
+        yield f"{{ {labels[q]} }} --[{symbol}]--> {{ {labels[t]} }}"
 
 def print_automaton(
-    states: Set[FrozenSet[str]],
-    start: FrozenSet[str],
-    finals: Set[FrozenSet[str]],
-    transitions: Dict[Tuple[FrozenSet[str], str], FrozenSet[str]],
-    title: str = "Automaton"
+    states: Union[Set[FrozenSet[str]], Automaton],
+    start: Optional[FrozenSet[str]] = None,
+    finals: Optional[Set[FrozenSet[str]]] = None,
+    transitions: Optional[Dict[Tuple[FrozenSet[str], str], FrozenSet[str]]] = None,
+    title: str = "Automaton",
+    out: Optional[IO[str]] = None,
+    fmt: str = "text",
+    limit: Optional[int] = None,
+    page_size: Optional[int] = None,
+    chunk_lines: int = 1000
 ) -> None:
-    """Print automaton details to console"""
-    print(f"\n{title} Summary:")
-    
-    # Format states
-    formatted_states = [f"{{{format_state(s)}}}" for s in sorted(states, key=lambda x: sorted(format_state(x)))]
-    print(f"States ({len(states)}):", ', '.join(formatted_states))
-    
-    # Format start state
-    print("Start State:", f"{{{format_state(start)}}}")
-    
-    # Format final states
-    formatted_finals = [f"{{{format_state(f)}}}" for f in sorted(finals, key=lambda x: sorted(format_state(x)))]
-    print(f"Final States ({len(finals)}):", ', '.join(formatted_finals))
-    
-    print("\nTransitions:")
-    for (from_state, symbol), to_state in sorted(transitions.items(), key=lambda x: (sorted(format_state(x[0][0])), x[0][1])):
-        print(f"{{ {format_state(from_state)} }} --[{symbol}]--> {{ {format_state(to_state)} }}")
+    """Print automaton details to console, or to any text file object.
 
-if __name__ == "__main__":
-    with open("dfa.json") as f:
-        data = json.load(f)
-    states = set(data["states"])    
-    start = data["startState"]
-    finals = set(data["acceptingStates"])
-    name = data["name"]
+    Output is written in chunks of ``chunk_lines`` lines as it is produced.
+    ``page_size`` pauses after that many lines when writing to a terminal;
+    ``limit`` truncates the transition list (see iter_lines for fmt).
+    """
+    automaton = as_automaton(states, start, finals, transitions)
+    out = out or sys.stdout
+    paging = page_size is not None and out is sys.stdout and sys.stdin.isatty() and out.isatty()
+    chunk: List[str] = []
+    written = 0
+    for line in iter_lines(automaton, title, fmt, limit):
+        chunk.append(line)
+        written += 1
+        if len(chunk) >= chunk_lines or (paging and written % page_size == 0):
+            out.write("\n".join(chunk) + "\n")
+            chunk.clear()
+            if paging and written % page_size == 0:
+                out.flush()
+                if input("-- more (q to quit) --").strip().lower() == "q":
+                    return
+    if chunk:
+        out.write("\n".join(chunk) + "\n")
+    out.flush()
+
+def main(argv=None) -> int:
+    """Script entry point; also run in-process by the automaton worker.
+
+    Usage: python display.py [input] [--output FILE] [--format dot|svg|png]
+    [--depth K] [--max-states N] [--dump text|tsv|csv] [--limit N]; a .jsonl
+    input is read as streamed automaton JSON Lines. --output writes the file
+    without opening a viewer; --dump prints the listing (to --output if given).
+    """
+    from stream_io import is_jsonl, iter_records, read_header, STATE_RECORD
+    argv = list(argv or [])
+    options = {"--output": None, "--format": None, "--depth": None, "--max-states": None,
+               "--dump": None, "--limit": None}
+    positional = []
+    while argv:
+        arg = argv.pop(0)
+        if arg in options:
+            if not argv:
+                print(f"Missing value for {arg}")
+                return 1
+            options[arg] = argv.pop(0)
+        else:
+            positional.append(arg)
+    output = options["--output"]
+    fmt = options["--format"] or (output.rsplit(".", 1)[-1] if output and "." in output else "png")
+    depth = int(options["--depth"]) if options["--depth"] else None
+    max_states = int(options["--max-states"]) if options["--max-states"] else SUMMARY_THRESHOLD
+    input_path = positional[0] if positional else "dfa.json"
     transitions = {}
-    for from_state, symbol, to_state in data["transitions"]:
-        transitions[(frozenset({from_state}), symbol)] = frozenset({to_state})
+    if is_jsonl(input_path):
+        header = read_header(input_path)
+        start = header["startState"]
+        name = header.get("name", "Automaton")
+        states, finals = set(), set()
+        for record in iter_records(input_path):
+            if record[0] == STATE_RECORD:
+                states.add(record[1])
+                if record[2]:
+                    finals.add(record[1])
+            else:
+                _, from_state, symbol, to_state = record
+                transitions[(frozenset({from_state}), symbol)] = frozenset({to_state})
+    else:
+        with open(input_path) as f:
+            data = json.load(f)
+        states = set(data["states"])    
+        start = data["startState"]
+        finals = set(data["acceptingStates"])
+        name = data["name"]
+        for from_state, symbol, to_state in data["transitions"]:
+            transitions[(frozenset({from_state}), symbol)] = frozenset({to_state})
 
     frozen_states = {frozenset({s}) for s in states}
     frozen_start = frozenset({start})
     frozen_finals = {frozenset({f}) for f in finals}     
             
-    display_automaton(frozen_states, frozen_start, frozen_finals, transitions, name)
-    print("DFA displayed successfully!")
\ No newline at end of file
+    if options["--dump"] is not None:
+        limit = int(options["--limit"]) if options["--limit"] else None
+        if output is None:
+            print_automaton(frozen_states, frozen_start, frozen_finals, transitions, name,
+                            fmt=options["--dump"], limit=limit)
+        else:
+            with open(output, "w", encoding="utf-8", newline="") as f:
+                print_automaton(frozen_states, frozen_start, frozen_finals, transitions, name,
+                                out=f, fmt=options["--dump"], limit=limit)
+        return 0
+    if output is not None:
+        written = display_automaton(frozen_states, frozen_start, frozen_finals, transitions, name,
+                                    output=output, fmt=fmt, view=False, max_states=max_states, depth=depth)
+        return 0 if written else 1
+    display_automaton(frozen_states, frozen_start, frozen_finals, transitions, name,
+                      fmt=fmt, max_states=max_states, depth=depth)
+    print("DFA displayed successfully!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run_cli("display", sys.argv[1:], main))
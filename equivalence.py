@@ -0,0 +1,222 @@
+import sys
+from typing import Dict, List, Optional, Set, Tuple, Union
+from automaton import Automaton, NO_TRANSITION
+from nfa_to_dfa import _prepare_bitset, iter_bits
+from phase_stats import PhaseStats
+
+NFA = Tuple[Set[str], str, Set[str], Dict[str, Dict[str, Set[str]]]]
+DFA = Union[Automaton, Tuple]
+
+
+def _word(links: List[Tuple[int, Optional[str]]], node: int) -> List[str]:
+    """Symbols on the BFS tree path from the root to ``node``."""
+    word = []
+    while links[node][0] != -1:
+        node, symbol = links[node]
+        word.append(symbol)
+    word.reverse()
+    return word
+
+
+def dfa_counterexample(first: DFA, second: DFA, stats: Optional[PhaseStats] = None) -> Optional[List[str]]:
+    """Shortest word accepted by exactly one of two DFAs, or None if they are equivalent.
+
+    Hopcroft-Karp: state pairs are explored breadth-first from the start
+    pair and merged in a union-find over the states of both automata, so a
+    pair whose states are already known to be merged is never explored
+    again. This is near-linear in the number of states times symbols, and
+    the breadth-first order makes the first mismatching pair a shortest
+    counterexample. Missing transitions go to an implicit sink per automaton.
+    DFAs may be Automaton objects or the (states, start, finals, transitions)
+    dict tuple, over different alphabets.
+    """
+    a = first if isinstance(first, Automaton) else Automaton.from_dict(*first)
+    b = second if isinstance(second, Automaton) else Automaton.from_dict(*second)
+    symbols = sorted(set(a.symbols) | set(b.symbols))
+    columns_a = [a.symbol_id(sym) for sym in symbols]
+    columns_b = [b.symbol_id(sym) for sym in symbols]
+    na, nb = a.num_states, b.num_states
+    ka, kb = a.num_symbols, b.num_symbols
+    table_a, table_b = a.table, b.table
+    # Union-find elements: states of a, a's sink (na), then b's states and sink shifted by na + 1
+    offset = na + 1
+    parent = list(range(na + nb + 2))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def accepts_a(p: int) -> bool:
+        return p < na and bool(a.accepting[p])
+
+    def accepts_b(q: int) -> bool:
+        return q < nb and bool(b.accepting[q])
+
+    pairs = [(a.start, b.start)]
+    links: List[Tuple[int, Optional[str]]] = [(-1, None)]
+    if accepts_a(a.start) != accepts_b(b.start):
+        return []
+    parent[a.start] = offset + b.start
+
+    i = 0
+    try:
+        while i < len(pairs):
+            p, q = pairs[i]
+            for j, sym in enumerate(symbols):
+                p2 = table_a[p * ka + columns_a[j]] if p < na and columns_a[j] != NO_TRANSITION else NO_TRANSITION
+                q2 = table_b[q * kb + columns_b[j]] if q < nb and columns_b[j] != NO_TRANSITION else NO_TRANSITION
+                p2 = na if p2 == NO_TRANSITION else p2
+                q2 = nb if q2 == NO_TRANSITION else q2
+                root_p, root_q = find(p2), find(offset + q2)
+                if root_p == root_q:
+                    continue
+                parent[root_p] = root_q
+                pairs.append((p2, q2))
+                links.append((i, sym))
+                if accepts_a(p2) != accepts_b(q2):
+                    return _word(links, len(pairs) - 1)
+            i += 1
+        return None
+    finally:
+        if stats is not None:
+            stats.count("pairs_explored", len(pairs))
+
+
+def dfa_equivalent(first: DFA, second: DFA) -> bool:
+    return dfa_counterexample(first, second) is None
+
+
+def nfa_inclusion_counterexample(first: NFA, second: NFA,
+                                 stats: Optional[PhaseStats] = None) -> Optional[List[str]]:
+    """Shortest word in L(first) but not in L(second), or None if L(first) is included.
+
+    Antichain-based exploration: nodes pair one state of ``first`` with a
+    subset of ``second``'s states (bitmasks with epsilon closures, as in the
+    bitset subset construction), explored breadth-first. A node (p, S) is
+    dropped when (p, S') with S' a subset of S was already seen, since any
+    counterexample from (p, S) is also found from (p, S') at the same
+    depth. ``second`` is never fully determinized.
+    """
+    _, symbols_a, step_a, finals_a, initial_a = _prepare_bitset(*first)
+    _, symbols_b, step_b, finals_b, initial_b = _prepare_bitset(*second)
+    index_b = {sym: i for i, sym in enumerate(symbols_b)}
+    columns = [index_b.get(sym, NO_TRANSITION) for sym in symbols_a]
+    post_cache: List[Dict[int, int]] = [{} for _ in symbols_a]
+
+    def post_b(subset: int, j: int) -> int:
+        cache = post_cache[j]
+        target = cache.get(subset)
+        if target is None:
+            target = 0
+            if columns[j] != NO_TRANSITION:
+                sym_step = step_b[columns[j]]
+                for q in iter_bits(subset):
+                    target |= sym_step[q]
+            cache[subset] = target
+        return target
+
+    # antichain[p]: the minimal subsets seen together with state p
+    antichain: Dict[int, List[int]] = {}
+
+    def add(p: int, subset: int) -> bool:
+        seen = antichain.setdefault(p, [])
+        for other in seen:
+            if other & ~subset == 0:
+                return False
+        seen[:] = [other for other in seen if subset & ~other != 0]
+        seen.append(subset)
+        return True
+
+    nodes: List[Tuple[int, int]] = []
+    links: List[Tuple[int, Optional[str]]] = []
+    i = 0
+    try:
+        for p in iter_bits(initial_a):
+            if add(p, initial_b):
+                nodes.append((p, initial_b))
+                links.append((-1, None))
+                if finals_a >> p & 1 and not initial_b & finals_b:
+                    return []
+        while i < len(nodes):
+            p, subset = nodes[i]
+            for j, sym in enumerate(symbols_a):
+                targets_a = step_a[j][p]
+                if not targets_a:
+                    continue
+                target_b = post_b(subset, j)
+                for p2 in iter_bits(targets_a):
+                    if not add(p2, target_b):
+                        continue
+                    nodes.append((p2, target_b))
+                    links.append((i, sym))
+                    if finals_a >> p2 & 1 and not target_b & finals_b:
+                        return _word(links, len(nodes) - 1)
+            i += 1
+        return None
+    finally:
+        if stats is not None:
+            stats.count("pairs_explored", len(nodes))
+            stats.count("antichain_size", sum(len(seen) for seen in antichain.values()))
+
+
+def nfa_included(first: NFA, second: NFA) -> bool:
+    return nfa_inclusion_counterexample(first, second) is None
+
+
+def nfa_counterexample(first: NFA, second: NFA, stats: Optional[PhaseStats] = None) -> Optional[List[str]]:
+    """Shortest word accepted by exactly one of two NFAs, or None if they are equivalent."""
+    forward = nfa_inclusion_counterexample(first, second, stats)
+    if forward == []:
+        return forward
+    backward = nfa_inclusion_counterexample(second, first, stats)
+    if forward is None or (backward is not None and len(backward) < len(forward)):
+        return backward
+    return forward
+
+
+def nfa_equivalent(first: NFA, second: NFA) -> bool:
+    return nfa_counterexample(first, second) is None
+
+
+def format_word(word: List[str]) -> str:
+    """Counterexample as text: symbols concatenated, or space-separated if any is longer than one character."""
+    if not word:
+        return "ε (the empty word)"
+    return "".join(word) if all(len(sym) == 1 for sym in word) else " ".join(word)
+
+
+def _load(path: str, nfa: bool) -> Union[NFA, DFA]:
+    import json
+    from stream_io import is_jsonl, load_dfa, load_nfa
+    if is_jsonl(path):
+        return load_nfa(path) if nfa else load_dfa(path)
+    if not nfa:
+        from binary_format import load_dfa_json
+        return load_dfa_json(path)
+    with open(path) as f:
+        data = json.load(f)
+    transitions: Dict[str, Dict[str, Set[str]]] = {}
+    for from_state, symbol, to_state in data["transitions"]:
+        transitions.setdefault(from_state, {}).setdefault(symbol, set()).add(to_state)
+    return set(data["states"]), data["startState"], set(data["acceptingStates"]), transitions
+
+
+if __name__ == "__main__":
+    usage = ("Usage: python equivalence.py <first> <second> [--nfa] [--inclusion]\n"
+             "  Compares two DFAs (or NFAs with --nfa) given as JSON or .jsonl files;\n"
+             "  --inclusion checks L(first) ⊆ L(second) instead of equality (NFAs).")
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    use_nfa = "--nfa" in sys.argv or "--inclusion" in sys.argv
+    if len(args) != 2:
+        print(usage)
+        sys.exit(2)
+    first, second = _load(args[0], use_nfa), _load(args[1], use_nfa)
+    if "--inclusion" in sys.argv:
+        word = nfa_inclusion_counterexample(first, second)
+        print("Included" if word is None else f"Not included; shortest counterexample: {format_word(word)}")
+    else:
+        word = nfa_counterexample(first, second) if use_nfa else dfa_counterexample(first, second)
+        print("Equivalent" if word is None else f"Not equivalent; shortest counterexample: {format_word(word)}")
+    sys.exit(0 if word is None else 1)
@@ -0,0 +1,505 @@
+from array import array
+from collections import deque
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+from automaton import Automaton, NO_TRANSITION
+from dfa_minimizer import build_inverse_index, hopcroft_partition
+
+# Depth of the per-state behaviour hash used to find merge candidates;
+# language-equivalent states always share it
+HASH_DEPTH = 6
+
+
+class MinimizationDiff:
+    """What changed in the minimal DFA; states are identified by their labels."""
+
+    __slots__ = ("split", "merged", "accepting_changed", "transitions_added", "transitions_removed")
+
+    def __init__(self):
+        self.split: List[Tuple[Hashable, List[Hashable]]] = []
+        self.merged: List[Tuple[List[Hashable], Hashable]] = []
+        self.accepting_changed: List[Hashable] = []
+        self.transitions_added: List[Tuple[Hashable, str, Hashable]] = []
+        self.transitions_removed: List[Tuple[Hashable, str, Hashable]] = []
+
+    def is_empty(self) -> bool:
+        return not (self.split or self.merged or self.accepting_changed
+                    or self.transitions_added or self.transitions_removed)
+
+    def __repr__(self) -> str:
+        return (f"MinimizationDiff(split={len(self.split)}, merged={len(self.merged)}, "
+                f"accepting_changed={len(self.accepting_changed)}, "
+                f"transitions_added={len(self.transitions_added)}, "
+                f"transitions_removed={len(self.transitions_removed)})")
+
+
+class IncrementalMinimizer:
+    """Keep a DFA minimized across small edits.
+
+    The stable partition and the inverse transition index of the last run
+    are kept. After set_transition / set_final edits, commit() re-runs
+    Hopcroft's refinement seeded only with the splitters the edits touched,
+    then looks for blocks that became equivalent by checking the edited
+    blocks (and, on success, their predecessors) against blocks with the
+    same behaviour hash using Hopcroft-Karp union-find. The result is the
+    same DFA minimize_dfa(..., prune=False) would build from the edited
+    automaton.
+
+    Edits may not add states or symbols; build a new instance for that.
+    """
+
+    def __init__(self, automaton: Automaton, hash_depth: int = HASH_DEPTH):
+        if hash_depth < 0:
+            raise ValueError(f"hash_depth must be >= 0, got {hash_depth}")
+        n = automaton.num_states
+        k = automaton.num_symbols
+        self.labels = list(automaton.labels)
+        self.symbols = list(automaton.symbols)
+        self.start = automaton.start
+        self.n = n
+        self.k = k
+        self._ids = {label: i for i, label in enumerate(self.labels)}
+
+        # An explicit sink (id n) stands for every missing transition
+        sink = n
+        self.sink = sink
+        table = array('i', automaton.table)
+        for i, target in enumerate(table):
+            if target == NO_TRANSITION:
+                table[i] = sink
+        table.extend([sink] * k)
+        self.table = table
+        self.accepting = bytearray(automaton.accepting) + b"\0"
+
+        complete = Automaton(list(range(n + 1)), self.symbols, self.start, self.accepting, table)
+        block_of, num_blocks, _ = hopcroft_partition(complete)
+        self._load_partition(block_of, num_blocks)
+        self._offsets, self._sources = build_inverse_index(complete)
+        self._extra_preds: Dict[int, Set[int]] = {}
+
+        self.hash_depth = hash_depth
+        self._hashes = self._compute_hashes()
+        self._reindex_all()
+
+        self._edited_sources: Dict[Tuple[int, int], int] = {}
+        self._toggled: Set[int] = set()
+        self.minimal, self._min_of_state = self._build()
+
+    # Partition bookkeeping
+
+    def _load_partition(self, block_of: array, num_blocks: int) -> None:
+        """Refinable partition arrays (as in hopcroft_partition) from block ids."""
+        size = len(block_of)
+        counts = [0] * (num_blocks + 1)
+        for b in block_of:
+            counts[b + 1] += 1
+        for b in range(num_blocks):
+            counts[b + 1] += counts[b]
+        self.first = array('i', counts[:num_blocks])
+        self.last = array('i', counts[1:])
+        fill = array('i', counts[:num_blocks])
+        self.elements = array('i', [0]) * size
+        self.location = array('i', [0]) * size
+        for q in range(size):
+            b = block_of[q]
+            self.elements[fill[b]] = q
+            self.location[q] = fill[b]
+            fill[b] += 1
+        self.block_of = array('i', block_of)
+        self.marked = array('i', [0]) * num_blocks
+
+    def _preds(self, t: int, a: int) -> List[int]:
+        """Current a-predecessors of t: the initial index filtered by the table, plus edits."""
+        k = self.k
+        table = self.table
+        offsets = self._offsets[a]
+        sources = self._sources[a]
+        result = [p for p in sources[offsets[t]:offsets[t + 1]] if table[p * k + a] == t]
+        extra = self._extra_preds.get(t * k + a)
+        if extra:
+            result.extend(p for p in extra if table[p * k + a] == t)
+        return result
+
+    def _members(self, b: int) -> array:
+        return self.elements[self.first[b]:self.last[b]]
+
+    # Behaviour hashes
+
+    def _compute_hashes(self) -> List[array]:
+        k = self.k
+        table = self.table
+        size = self.n + 1
+        levels = [array('q', list(self.accepting))]
+        for _ in range(self.hash_depth):
+            prev = levels[-1]
+            levels.append(array('q', (
+                hash((self.accepting[q],) + tuple(prev[table[q * k + a]] for a in range(k)))
+                for q in range(size)
+            )))
+        return levels
+
+    def _update_hashes(self, sources: Set[int], toggled: Set[int]) -> Set[int]:
+        """Recompute hashes around the edits; returns states whose top hash changed."""
+        k = self.k
+        table = self.table
+        levels = self._hashes
+        changed = set()
+        for q in toggled:
+            if levels[0][q] != self.accepting[q]:
+                levels[0][q] = self.accepting[q]
+                changed.add(q)
+        # With hash_depth 0 the accepting flag is the top hash
+        top_changed = set(changed)
+        for level in range(1, self.hash_depth + 1):
+            prev = levels[level - 1]
+            current = levels[level]
+            todo = set(sources) | toggled
+            for q in changed:
+                for a in range(k):
+                    todo.update(self._preds(q, a))
+            changed = set()
+            for q in todo:
+                value = hash((self.accepting[q],) + tuple(prev[table[q * k + a]] for a in range(k)))
+                if value != current[q]:
+                    current[q] = value
+                    changed.add(q)
+            if level == self.hash_depth:
+                top_changed = changed
+        return top_changed
+
+    def _reindex_all(self) -> None:
+        top = self._hashes[-1]
+        self._block_hash = array('q', (top[self.elements[self.first[b]]] for b in range(len(self.first))))
+        self._index: Dict[int, Set[int]] = {}
+        for b, value in enumerate(self._block_hash):
+            self._index.setdefault(value, set()).add(b)
+
+    def _reindex(self, blocks: Set[int]) -> None:
+        top = self._hashes[-1]
+        while len(self._block_hash) < len(self.first):
+            self._block_hash.append(0)
+        for b in blocks:
+            old = self._block_hash[b]
+            bucket = self._index.get(old)
+            if bucket is not None:
+                bucket.discard(b)
+            value = top[self.elements[self.first[b]]]
+            self._block_hash[b] = value
+            self._index.setdefault(value, set()).add(b)
+
+    # Edits
+
+    def _state(self, label: Hashable) -> int:
+        try:
+            return self._ids[label]
+        except KeyError:
+            raise ValueError(f"Unknown state: {label!r}") from None
+
+    def set_transition(self, state: Hashable, symbol: str, target: Optional[Hashable]) -> None:
+        """Point (state, symbol) at target, or remove the transition when target is None."""
+        p = self._state(state)
+        if symbol not in self.symbols:
+            raise ValueError(f"Unknown symbol: {symbol!r}")
+        a = self.symbols.index(symbol)
+        t = self.sink if target is None else self._state(target)
+        old = self.table[p * self.k + a]
+        if old == t:
+            return
+        self._edited_sources.setdefault((p, a), old)
+        self.table[p * self.k + a] = t
+        offsets = self._offsets[a]
+        if p not in self._sources[a][offsets[t]:offsets[t + 1]]:
+            self._extra_preds.setdefault(t * self.k + a, set()).add(p)
+
+    def set_final(self, state: Hashable, accepting: bool = True) -> None:
+        q = self._state(state)
+        if bool(self.accepting[q]) != accepting:
+            self.accepting[q] = 1 if accepting else 0
+            self._toggled ^= {q}
+
+    @property
+    def automaton(self) -> Automaton:
+        """The edited (unminimized) DFA."""
+        table = array('i', self.table[:self.n * self.k])
+        for i, target in enumerate(table):
+            if target == self.sink:
+                table[i] = NO_TRANSITION
+        return Automaton(list(self.labels), list(self.symbols), self.start, bytearray(self.accepting[:self.n]), table)
+
+    # Re-minimization
+
+    def commit(self) -> Tuple[Automaton, MinimizationDiff]:
+        """Apply the pending edits; returns the new minimal DFA and what changed."""
+        edits = self._edited_sources
+        toggled = set(self._toggled)
+        self._edited_sources = {}
+        self._toggled = set()
+        k = self.k
+        block_of = self.block_of
+
+        waiting = []
+        in_waiting = set()
+
+        def push(b: int, c: int) -> None:
+            if b * k + c not in in_waiting:
+                waiting.append((b, c))
+                in_waiting.add(b * k + c)
+
+        # Only the preimages of the old and new targets changed
+        for (p, a), old in edits.items():
+            push(block_of[old], a)
+            push(block_of[self.table[p * k + a]], a)
+
+        splits: List[Tuple[int, int]] = []
+        for q in toggled:
+            b = block_of[q]
+            for member in self._members(b):
+                if self.accepting[member]:
+                    self._mark(member)
+            self._split_marked([b], waiting, in_waiting, splits)
+        self._refine(waiting, in_waiting, splits)
+
+        sources = {p for p, _ in edits}
+        hash_changed = self._update_hashes(sources, toggled)
+        touched_blocks = {self.block_of[q] for q in hash_changed}
+        for parent, new in splits:
+            touched_blocks.add(parent)
+            touched_blocks.add(new)
+        self._reindex(touched_blocks)
+
+        # States whose minimal-DFA row or label may have changed
+        edited = sources | toggled
+        affected = set(edited)
+        for parent, new in splits:
+            affected.update(self._members(parent))
+            affected.update(self._members(new))
+
+        merged_groups = self._merge({self.block_of[q] for q in edited})
+        for group in merged_groups:
+            affected.update(group)
+        for q in list(affected):
+            for a in range(k):
+                affected.update(self._preds(q, a))
+        affected.discard(self.sink)
+
+        old_minimal, old_min_of = self.minimal, self._min_of_state
+        if splits or merged_groups:
+            self.minimal, self._min_of_state = self._build()
+        else:
+            # Same blocks, so the numbering is unchanged; only edited rows move
+            self.minimal = self._patch(edited)
+        return self.minimal, self._diff(old_minimal, old_min_of, affected)
+
+    def _mark(self, p: int) -> None:
+        b = self.block_of[p]
+        target = self.first[b] + self.marked[b]
+        other = self.elements[target]
+        p_pos = self.location[p]
+        if p_pos < target:
+            return
+        self.elements[target], self.elements[p_pos] = p, other
+        self.location[p], self.location[other] = target, p_pos
+        self.marked[b] += 1
+
+    def _split_marked(self, touched: List[int], waiting: List[Tuple[int, int]], in_waiting: Set[int],
+                      splits: List[Tuple[int, int]]) -> None:
+        """Split each touched block into its marked prefix and the rest (Hopcroft's rule)."""
+        k = self.k
+        first, last, marked, elements, block_of = self.first, self.last, self.marked, self.elements, self.block_of
+        for b in touched:
+            m = marked[b]
+            marked[b] = 0
+            block_size = last[b] - first[b]
+            if m == 0 or m == block_size:
+                continue
+            new = len(first)
+            if m <= block_size - m:
+                first.append(first[b])
+                last.append(first[b] + m)
+                first[b] += m
+            else:
+                first.append(first[b] + m)
+                last.append(last[b])
+                last[b] = first[b] + m
+            marked.append(0)
+            for pos in range(first[new], last[new]):
+                block_of[elements[pos]] = new
+            splits.append((b, new))
+            for c in range(k):
+                if b * k + c in in_waiting:
+                    waiting.append((new, c))
+                    in_waiting.add(new * k + c)
+                else:
+                    smaller = new if last[new] - first[new] <= last[b] - first[b] else b
+                    if smaller * k + c not in in_waiting:
+                        waiting.append((smaller, c))
+                        in_waiting.add(smaller * k + c)
+
+    def _refine(self, waiting: List[Tuple[int, int]], in_waiting: Set[int], splits: List[Tuple[int, int]]) -> None:
+        """Hopcroft's loop from the current (mostly stable) partition."""
+        k = self.k
+        while waiting:
+            splitter, a = waiting.pop()
+            in_waiting.discard(splitter * k + a)
+            touched = []
+            for t in self._members(splitter):
+                for p in self._preds(t, a):
+                    b = self.block_of[p]
+                    if self.marked[b] == 0:
+                        touched.append(b)
+                    self._mark(p)
+            self._split_marked(touched, waiting, in_waiting, splits)
+
+    def _merge(self, start_blocks: Set[int]) -> List[List[int]]:
+        """Merge blocks that became equivalent; returns the member states of each merged group."""
+        k = self.k
+        table = self.table
+        parent = list(range(len(self.first)))
+        groups: Dict[int, List[int]] = {}
+
+        def find(b: int) -> int:
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            return b
+
+        def rep(b: int) -> int:
+            return self.elements[self.first[b]]
+
+        def equivalent(x: int, y: int) -> Optional[List[Tuple[int, int]]]:
+            local: Dict[int, int] = {}
+
+            def lfind(b: int) -> int:
+                b = find(b)
+                while b in local:
+                    b = local[b]
+                return b
+
+            unions = []
+            pairs = [(x, y)]
+            while pairs:
+                u, v = pairs.pop()
+                u, v = lfind(u), lfind(v)
+                if u == v:
+                    continue
+                ru, rv = rep(u), rep(v)
+                if self.accepting[ru] != self.accepting[rv]:
+                    return None
+                local[u] = v
+                unions.append((u, v))
+                for c in range(k):
+                    pairs.append((self.block_of[table[ru * k + c]], self.block_of[table[rv * k + c]]))
+            return unions
+
+        work = deque(start_blocks)
+        while work:
+            x = find(work.popleft())
+            for y in list(self._index.get(self._block_hash[x], ())):
+                y = find(y)
+                if y == x:
+                    continue
+                unions = equivalent(x, y)
+                if unions is None:
+                    continue
+                for u, v in unions:
+                    u, v = find(u), find(v)
+                    if u != v:
+                        parent[u] = v
+                        groups.setdefault(v, [v]).extend(groups.pop(u, [u]))
+                x = find(x)
+                # Predecessors of the merged blocks may now be equivalent too
+                for b in {b for pair in unions for b in pair}:
+                    for t in self._members(b):
+                        for c in range(k):
+                            for p in self._preds(t, c):
+                                work.append(self.block_of[p])
+
+        if not groups:
+            return []
+        merged = [[q for b in group for q in self._members(b)] for group in groups.values()]
+        renumber: Dict[int, int] = {}
+        block_of = array('i', (renumber.setdefault(find(b), len(renumber)) for b in self.block_of))
+        self._load_partition(block_of, len(renumber))
+        self._reindex_all()
+        return merged
+
+    def _build(self) -> Tuple[Automaton, array]:
+        """Minimal DFA in the same numbering and labelling as minimize_dfa (prune=False)."""
+        n, k, sink = self.n, self.k, self.sink
+        block_of = self.block_of
+        new_id = array('i', [NO_TRANSITION]) * len(self.first)
+        min_of_state = array('i', [0]) * n
+        members: List[List[Hashable]] = []
+        for q in range(n):
+            b = block_of[q]
+            if new_id[b] == NO_TRANSITION:
+                new_id[b] = len(members)
+                members.append([])
+            members[new_id[b]].append(self.labels[q])
+            min_of_state[q] = new_id[b]
+
+        table = array('i', [NO_TRANSITION]) * (len(members) * k)
+        accepting = bytearray(len(members))
+        for q in range(n):
+            row = min_of_state[q]
+            accepting[row] = self.accepting[q]
+            for a in range(k):
+                t = self.table[q * k + a]
+                if t != sink:
+                    table[row * k + a] = new_id[block_of[t]]
+        labels = [frozenset(group) for group in members]
+        return Automaton(labels, list(self.symbols), min_of_state[self.start], accepting, table), min_of_state
+
+    def _patch(self, states: Set[int]) -> Automaton:
+        """Copy of the current minimal DFA with the rows of ``states`` rewritten."""
+        old = self.minimal
+        k, sink = self.k, self.sink
+        min_of_state = self._min_of_state
+        table = array('i', old.table)
+        accepting = bytearray(old.accepting)
+        for q in states:
+            row = min_of_state[q]
+            accepting[row] = self.accepting[q]
+            for a in range(k):
+                t = self.table[q * k + a]
+                if t == sink:
+                    # Missing only if no other member has a real transition (into the dead block)
+                    t = next((self.table[m * k + a] for m in self._members(self.block_of[q])
+                              if self.table[m * k + a] != sink), sink)
+                table[row * k + a] = NO_TRANSITION if t == sink else min_of_state[t]
+        return Automaton(list(old.labels), list(self.symbols), old.start, accepting, table)
+
+    def _diff(self, old: Automaton, old_min_of: array, affected: Set[int]) -> MinimizationDiff:
+        new, new_min_of = self.minimal, self._min_of_state
+        k = self.k
+        diff = MinimizationDiff()
+        old_to_new: Dict[int, Set[int]] = {}
+        new_from_old: Dict[int, Set[int]] = {}
+        for q in affected:
+            old_to_new.setdefault(old_min_of[q], set()).add(new_min_of[q])
+            new_from_old.setdefault(new_min_of[q], set()).add(old_min_of[q])
+        for i, targets in old_to_new.items():
+            if len(targets) > 1:
+                diff.split.append((old.labels[i], [new.labels[j] for j in sorted(targets)]))
+        for j, sources in new_from_old.items():
+            if len(sources) > 1:
+                diff.merged.append(([old.labels[i] for i in sorted(sources)], new.labels[j]))
+
+        def rows(dfa: Automaton, ids) -> Set[Tuple[Hashable, str, Hashable]]:
+            result = set()
+            for i in ids:
+                for a in range(k):
+                    t = dfa.table[i * k + a]
+                    if t != NO_TRANSITION:
+                        result.add((dfa.labels[i], self.symbols[a], dfa.labels[t]))
+            return result
+
+        before = rows(old, old_to_new)
+        after = rows(new, new_from_old)
+        diff.transitions_added = sorted(after - before, key=repr)
+        diff.transitions_removed = sorted(before - after, key=repr)
+        old_accepting = {old.labels[i]: old.accepting[i] for i in old_to_new}
+        for j in new_from_old:
+            label = new.labels[j]
+            if label in old_accepting and old_accepting[label] != new.accepting[j]:
+                diff.accepting_changed.append(label)
+        return diff
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Sequence, Set, Tuple, Union
+from nfa_to_dfa import epsilon_closure
+
+NFA = Tuple[Set[str], str, Set[str], Dict[str, Dict[str, Set[str]]]]
+
+
+class CacheStats:
+    """Counters for the lazy DFA transition cache."""
+
+    __slots__ = ("hits", "misses", "evictions")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def __repr__(self) -> str:
+        return f"CacheStats(hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+
+
+class LazyDFA:
+    """Simulate an NFA through a DFA that is built on demand.
+
+    Subset states and their transitions are only computed when an input
+    symbol needs them and are kept in a bounded LRU table, so NFAs whose full
+    DFA would blow up can still be run on concrete strings.
+    """
+
+    def __init__(
+        self,
+        states: Set[str],
+        start: str,
+        finals: Set[str],
+        transitions: Dict[str, Dict[str, Set[str]]],
+        cache_size: int = 10000
+    ):
+        if cache_size < 1:
+            raise ValueError("cache_size must be at least 1")
+        self.transitions = transitions
+        self.finals = frozenset(finals)
+        self.cache_size = cache_size
+        self.initial = epsilon_closure({start}, transitions)
+        self.cache: "OrderedDict[Tuple[FrozenSet[str], str], FrozenSet[str]]" = OrderedDict()
+        self.stats = CacheStats()
+
+    def step(self, current: FrozenSet[str], symbol: str) -> FrozenSet[str]:
+        """Successor subset of ``current`` on ``symbol`` (empty if there is none)."""
+        key = (current, symbol)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats.hits += 1
+            self.cache.move_to_end(key)
+            return cached
+
+        self.stats.misses += 1
+        next_states = set()
+        for state in current:
+            next_states.update(self.transitions.get(state, {}).get(symbol, set()))
+        target = epsilon_closure(next_states, self.transitions) if next_states else frozenset()
+
+        self.cache[key] = target
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+            self.stats.evictions += 1
+        return target
+
+    def is_accepting(self, current: FrozenSet[str]) -> bool:
+        return not self.finals.isdisjoint(current)
+
+    def accepts(self, string: Sequence[str]) -> bool:
+        """Run one input; a str is read one character per symbol."""
+        current = self.initial
+        for symbol in string:
+            current = self.step(current, symbol)
+            if not current:
+                return False
+        return self.is_accepting(current)
+
+
+def _lazy(nfa: Union[NFA, LazyDFA], cache_size: int) -> LazyDFA:
+    if isinstance(nfa, LazyDFA):
+        return nfa
+    return LazyDFA(*nfa, cache_size=cache_size)
+
+
+def accepts(nfa: Union[NFA, LazyDFA], string: Sequence[str], cache_size: int = 10000) -> bool:
+    """Check one string against an NFA without determinizing it first."""
+    return _lazy(nfa, cache_size).accepts(string)
+
+
+def accepts_many(nfa: Union[NFA, LazyDFA], strings: Iterable[Sequence[str]], cache_size: int = 10000) -> List[bool]:
+    """Check many strings, sharing one transition cache across them."""
+    lazy = _lazy(nfa, cache_size)
+    return [lazy.accepts(string) for string in strings]
@@ -114,7 +114,7 @@ class FiniteAutoMaton {
             return numOfAcceptingStates;
         }
         map<int,string> listAvailableFA(){
-            string command = "python db_operation.py list";
+            string command = "python worker_client.py db_operation list";
             cout << " Loading available finite automata..." << endl;
             sleepFor(2000);
             clearScreen();
@@ -276,7 +276,7 @@ class DFA : public FiniteAutoMaton {
         }
 
         void listAvailableDFA(){
-            string command = "python db_operation.py listDFA";
+            string command = "python worker_client.py db_operation listDFA";
             cout << "Loading available DFA..." << endl;
             sleepFor(2000);
             clearScreen();
@@ -536,7 +536,7 @@ class DFA : public FiniteAutoMaton {
             jsonFile.close();
             
             // Execute Python script
-            string command = "python db_operation.py insert " + tempFile;
+            string command = "python worker_client.py db_operation insert " + tempFile;
             cout << " Saving DFA to database..." << endl;
             
             // Use simple system() call instead of popen
@@ -556,7 +556,7 @@ class DFA : public FiniteAutoMaton {
         
         void loadFromDatabase(int id) override {
             string tempFile = "temp_dfa_load.json";
-            string command = "python db_operation.py load " + to_string(id) + " " + tempFile;
+            string command = "python worker_client.py db_operation load " + to_string(id) + " " + tempFile;
             
             cout << "Loading DFA from database (ID: " << id << ")..." << endl;
             
@@ -1103,7 +1103,7 @@ class NFA : public FiniteAutoMaton {
             jsonFile.close();
             
             // Call Python script (same as DFA)
-            string command = "python db_operation.py insert " + tempFile;
+            string command = "python worker_client.py db_operation insert " + tempFile;
             cout << " Saving NFA to database..." << endl;
             
             int result = system(command.c_str());
@@ -1121,7 +1121,7 @@ class NFA : public FiniteAutoMaton {
         
         void loadFromDatabase(int id) override {
             string tempFile = "temp_nfa_load.json";
-            string command = "python db_operation.py load " + to_string(id) + " " + tempFile;
+            string command = "python worker_client.py db_operation load " + to_string(id) + " " + tempFile;
             
             cout << " Loading NFA from database (ID: " << id << ")..." << endl;
             sleepFor(1000);
@@ -1211,7 +1211,7 @@ class NFA : public FiniteAutoMaton {
     return accepted;
 }
 void listAvailableNFA(){
-    string command = "python db_operation.py listNFA";
+    string command = "python worker_client.py db_operation listNFA";
     cout << " loading available NFA..."<< endl;
     sleepFor(2000);
     clearScreen();
@@ -1802,7 +1802,7 @@ void minimizeMenu(){
     }
     jsonFile << jsonData;
     jsonFile.close();
-    string command = "python dfa_minimizer.py";
+    string command = "python worker_client.py dfa_minimizer";
     cout << " Minimizing DFA..." << endl;
     int result = system(command.c_str());
     if(result == 0){
@@ -1820,7 +1820,7 @@ void minimizeMenu(){
         cin >> displayChoice;
         if(displayChoice == 'y'){
             string content = minimizedDFA.toJSON("minimized_dfa");
-            string commandCall = "python display.py";
+            string commandCall = "python worker_client.py display";
             string minimized = "dfa.json";
             ofstream jsonFile(minimized);
             if(!jsonFile.is_open()){
@@ -1909,7 +1909,7 @@ void handleUserInputForMenu() {
                 }
                 jsonFile << jsonData;
                 jsonFile.close();
-                string command = "python nfa_to_dfa.py";
+                string command = "python worker_client.py nfa_to_dfa";
                 cout << " Converting NFA to DFA..." << endl;
                 int result = system(command.c_str());
                 if(result == 0) {
@@ -1926,7 +1926,7 @@ void handleUserInputForMenu() {
                     cin >> displayChoice;
                     if(displayChoice == 'y') {
                         string content = dfa.toJSON("convereted dfa");
-                        string commandCall = "python display.py";
+                        string commandCall = "python worker_client.py display";
                         string dfaFile = "dfa.json";
                         ofstream dfaJsonFile(dfaFile);
                         if(!dfaJsonFile.is_open()){
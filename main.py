@@ -2,7 +2,11 @@ from database import AutomataDB, insert_sample_nfas
 from nfa_to_dfa import convert_nfa_to_dfa
 from dfa_minimizer import minimize_dfa
 from display import display_automaton, print_automaton
-from typing import Set, Dict, Tuple
+from equivalence import dfa_counterexample, format_word
+from result_cache import ResultCache, default_cache
+from phase_stats import PhaseStats, run_profiled, split_flags
+from typing import Any, Callable, Set, Dict, Tuple, Optional
+import sys
 
 # Helper function to print NFA details
 def print_nfa(
@@ -26,10 +30,24 @@ def print_nfa(
         for symbol, to_states in sorted(sym_trans.items()):
             print(f"{{ {from_state} }} --[{symbol}]--> {{ {', '.join(sorted(to_states))} }}")
 
-def main():
+def run_instrumented(compute: Callable[[], Any], stats: Optional[PhaseStats], profile: bool) -> Any:
+    """Run a conversion or minimization, optionally under cProfile, then print stats."""
+    result = run_profiled(compute) if profile else compute()
+    if stats is not None:
+        print(stats.report())
+    return result
+
+def main(argv=None):
+    """Interactive menu. --stats / --profile instrument each conversion and minimization.
+
+    Results are cached on disk; --db-cache also shares them through the database.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    _, show_stats, profile = split_flags(argv)
     db = AutomataDB()
     # Check for and insert sample NFAs if the database is empty.
     insert_sample_nfas(db)
+    cache = ResultCache(db=db) if "--db-cache" in argv else default_cache()
     
     while True:
         print("\nAutomata Toolkit")
@@ -40,9 +58,9 @@ def main():
         choice = input("Select option: ").strip()
         
         if choice == '1':
-            convert_nfa(db)
+            convert_nfa(db, cache, show_stats, profile)
         elif choice == '2':
-            minimize_dfa_interactive(db)
+            minimize_dfa_interactive(db, cache, show_stats, profile)
         elif choice == '3':
             break
         else:
@@ -58,7 +76,8 @@ def list_nfas(db: AutomataDB):
     for id, name in nfas:
         print(f"{id}. {name}")
 
-def convert_nfa(db: AutomataDB):
+def convert_nfa(db: AutomataDB, cache: Optional[ResultCache] = None,
+                show_stats: bool = False, profile: bool = False):
     nfas = db.fetch_nfas()
     if not nfas:
         print("No NFAs available for conversion")
@@ -80,8 +99,20 @@ def convert_nfa(db: AutomataDB):
         print_nfa(states, start, finals, transitions, f"Selected NFA ID {nfa_id}")
         
         print("\nConverting NFA to DFA...")
-        dfa_states, dfa_start, dfa_finals, dfa_trans = convert_nfa_to_dfa(
-            states, start, finals, transitions)
+        if show_stats or profile:
+            # Instrumented runs always recompute so the numbers are real
+            stats = PhaseStats() if show_stats else None
+            dfa_states, dfa_start, dfa_finals, dfa_trans = run_instrumented(
+                lambda: convert_nfa_to_dfa(states, start, finals, transitions, stats=stats), stats, profile)
+        elif cache is not None:
+            options = {"engine": "bitset", "compact": False}
+            dfa_states, dfa_start, dfa_finals, dfa_trans = cache.get_or_compute(
+                "dfa", (states, start, finals, transitions),
+                lambda: convert_nfa_to_dfa(states, start, finals, transitions, **options), options)
+            print(f"Result cache: {cache.stats}")
+        else:
+            dfa_states, dfa_start, dfa_finals, dfa_trans = convert_nfa_to_dfa(
+                states, start, finals, transitions)
         
         print_automaton(dfa_states, dfa_start, dfa_finals, dfa_trans, "Converted DFA")
         
@@ -98,13 +129,14 @@ def convert_nfa(db: AutomataDB):
     except ValueError:
         print("Please enter a valid number")
 
-def minimize_dfa_interactive(db: AutomataDB):
+def minimize_dfa_interactive(db: AutomataDB, cache: Optional[ResultCache] = None,
+                             show_stats: bool = False, profile: bool = False):
     dfas = db.fetch_dfas()
     if not dfas:
         print("No DFAs found in database. Would you like to convert an NFA to DFA first?")
         choice = input("Enter 'y' to convert NFA to DFA or any key to cancel: ").lower()
         if choice == 'y':
-            convert_nfa(db)
+            convert_nfa(db, cache, show_stats, profile)
         return
     
     print("\nAvailable DFAs:")
@@ -127,10 +159,29 @@ def minimize_dfa_interactive(db: AutomataDB):
                             for (f, s), t in transitions.items()}
         
         print("\nMinimizing DFA...")
-        min_states, min_start, min_finals, min_trans = minimize_dfa(
-            frozen_states, frozen_start, frozen_finals, frozen_transitions)
+        if show_stats or profile:
+            stats = PhaseStats() if show_stats else None
+            min_states, min_start, min_finals, min_trans = run_instrumented(
+                lambda: minimize_dfa(frozen_states, frozen_start, frozen_finals, frozen_transitions, stats=stats),
+                stats, profile)
+        elif cache is not None:
+            options = {"engine": "hopcroft", "prune": False}
+            min_states, min_start, min_finals, min_trans = cache.get_or_compute(
+                "min", (frozen_states, frozen_start, frozen_finals, frozen_transitions),
+                lambda: minimize_dfa(frozen_states, frozen_start, frozen_finals, frozen_transitions, **options),
+                options)
+            print(f"Result cache: {cache.stats}")
+        else:
+            min_states, min_start, min_finals, min_trans = minimize_dfa(
+                frozen_states, frozen_start, frozen_finals, frozen_transitions)
         
         print_automaton(min_states, min_start, min_finals, min_trans, "Minimized DFA")
+        counterexample = dfa_counterexample((frozen_states, frozen_start, frozen_finals, frozen_transitions),
+                                            (min_states, min_start, min_finals, min_trans))
+        if counterexample is None:
+            print("Language check: equivalent to the original DFA")
+        else:
+            print(f"Language check FAILED: the DFAs differ on {format_word(counterexample)}")
         
         show_png = input("Would you like to show the visualization? (y/n): ").lower()
         if show_png == 'y':
@@ -139,7 +190,7 @@ def minimize_dfa_interactive(db: AutomataDB):
         save = input("Would you like to save this minimized DFA? (y/n): ").lower()
         if save == 'y':
             name = input("Enter a name for this minimized DFA: ")
-            db.save_dfa(name, min_states, min_start, min_finals, min_trans)
+            db.save_dfa(name, min_states, min_start, min_finals, min_trans, minimal=True)
             print("Minimized DFA saved successfully!")
         
     except ValueError:
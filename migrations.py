@@ -0,0 +1,190 @@
+from typing import Any, List, Tuple
+import mysql.connector
+from mysql.connector import errorcode
+
+# A migration is (version, description, statements); versions only ever grow
+Migration = Tuple[int, str, List[str]]
+
+# Errors of a statement whose effect is already in place. MySQL commits DDL
+# implicitly, so a migration that failed partway has its earlier statements
+# applied but no schema_version row; rerunning it must skip them.
+ALREADY_APPLIED = {errorcode.ER_DUP_FIELDNAME, errorcode.ER_DUP_KEYNAME, errorcode.ER_TABLE_EXISTS_ERROR}
+
+# Schema of the FiniteAutomatonDBV2 database behind AutomataDB
+AUTOMATA_DB_MIGRATIONS: List[Migration] = [
+    (1, "Create NFA and DFA tables", [
+        """
+        CREATE TABLE IF NOT EXISTS NFAs (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS NFA_States (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            nfa_id INT NOT NULL,
+            state VARCHAR(255) NOT NULL,
+            is_start BOOLEAN DEFAULT FALSE,
+            is_final BOOLEAN DEFAULT FALSE,
+            FOREIGN KEY (nfa_id) REFERENCES NFAs(id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS NFA_Transitions (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            nfa_id INT NOT NULL,
+            from_state VARCHAR(255) NOT NULL,
+            symbol VARCHAR(255) NOT NULL,
+            to_state VARCHAR(255) NOT NULL,
+            FOREIGN KEY (nfa_id) REFERENCES NFAs(id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS DFAs (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            source_nfa_id INT,
+            FOREIGN KEY (source_nfa_id) REFERENCES NFAs(id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS DFA_States (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            dfa_id INT NOT NULL,
+            state VARCHAR(255) NOT NULL,
+            is_start BOOLEAN DEFAULT FALSE,
+            is_final BOOLEAN DEFAULT FALSE,
+            FOREIGN KEY (dfa_id) REFERENCES DFAs(id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS DFA_Transitions (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            dfa_id INT NOT NULL,
+            from_state VARCHAR(255) NOT NULL,
+            symbol VARCHAR(255) NOT NULL,
+            to_state VARCHAR(255) NOT NULL,
+            FOREIGN KEY (dfa_id) REFERENCES DFAs(id)
+        )
+        """,
+    ]),
+    # fetch_nfa/fetch_dfa filter on the automaton id and ORDER BY state or
+    # (from_state, symbol); these indexes cover both the filter and the sort
+    (2, "Covering indexes for per-automaton state and transition lookups", [
+        "CREATE INDEX idx_nfa_states_lookup ON NFA_States (nfa_id, state, is_start, is_final)",
+        "CREATE INDEX idx_nfa_transitions_lookup ON NFA_Transitions (nfa_id, from_state, symbol, to_state)",
+        "CREATE INDEX idx_dfa_states_lookup ON DFA_States (dfa_id, state, is_start, is_final)",
+        "CREATE INDEX idx_dfa_transitions_lookup ON DFA_Transitions (dfa_id, from_state, symbol, to_state)",
+        "CREATE INDEX idx_nfas_name ON NFAs (name)",
+        "CREATE INDEX idx_dfas_name ON DFAs (name)",
+    ]),
+    (3, "Database tier of the conversion/minimization result cache", [
+        """
+        CREATE TABLE IF NOT EXISTS ResultCache (
+            cache_key CHAR(64) NOT NULL,
+            kind VARCHAR(16) NOT NULL,
+            payload LONGBLOB NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (cache_key, kind)
+        )
+        """,
+    ]),
+    (4, "Language hash of each DFA for equivalent-DFA lookups", [
+        "ALTER TABLE DFAs ADD COLUMN language_hash CHAR(64) NULL",
+        "CREATE INDEX idx_dfas_language_hash ON DFAs (language_hash)",
+    ]),
+    # DFAs saved with state_ids=True keep only integer state ids in their
+    # state and transition rows; the subset labels, if kept at all, live in
+    # one zlib-compressed JSON blob per DFA
+    (5, "Integer state id storage with a compressed membership table", [
+        "ALTER TABLE DFAs ADD COLUMN state_ids BOOLEAN NOT NULL DEFAULT FALSE",
+        "ALTER TABLE DFAs ADD COLUMN start_state INT NULL",
+        """
+        CREATE TABLE IF NOT EXISTS DFA_Id_States (
+            dfa_id INT NOT NULL,
+            state_id INT NOT NULL,
+            is_final BOOLEAN DEFAULT FALSE,
+            PRIMARY KEY (dfa_id, state_id),
+            FOREIGN KEY (dfa_id) REFERENCES DFAs(id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS DFA_Id_Transitions (
+            dfa_id INT NOT NULL,
+            from_state INT NOT NULL,
+            symbol VARCHAR(255) NOT NULL,
+            to_state INT NOT NULL,
+            PRIMARY KEY (dfa_id, from_state, symbol),
+            FOREIGN KEY (dfa_id) REFERENCES DFAs(id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS DFA_State_Members (
+            dfa_id INT PRIMARY KEY,
+            labels LONGBLOB NOT NULL,
+            FOREIGN KEY (dfa_id) REFERENCES DFAs(id)
+        )
+        """,
+    ]),
+]
+
+# Indexes for the FiniteAutomatonDBV3 tables read by db_operation.load_fa
+V3_MIGRATIONS: List[Migration] = [
+    (1, "Covering indexes for load_fa and the list commands", [
+        "CREATE INDEX idx_automata_type ON Automata (type, automaton_id)",
+        "CREATE INDEX idx_states_lookup ON States (automaton_id, state_id, state_name)",
+        "CREATE INDEX idx_symbols_lookup ON AlphabetSymbols (automaton_id, symbol_id)",
+        "CREATE INDEX idx_accepting_lookup ON AcceptingStates (automaton_id, state_id)",
+        "CREATE INDEX idx_transitions_lookup ON Transitions (automaton_id, current_state_id, symbol_id, next_state_id)",
+    ]),
+    (2, "Language hash of each automaton for equivalent-automaton lookups", [
+        "ALTER TABLE Automata ADD COLUMN language_hash CHAR(64) NULL",
+        "CREATE INDEX idx_automata_language_hash ON Automata (language_hash)",
+    ]),
+]
+
+
+def current_version(cursor: Any) -> int:
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return cursor.fetchone()[0]
+
+
+def apply_migrations(conn: Any, migrations: List[Migration]) -> List[int]:
+    """Apply every migration newer than the recorded schema version.
+
+    Each migration is recorded in schema_version once its statements have
+    run, so an up-to-date database costs a single SELECT. Statements whose
+    column, index or table already exists are skipped, so a migration
+    interrupted partway is completed on the next run. Returns the versions
+    that were applied.
+    """
+    cursor = conn.cursor()
+    try:
+        version = current_version(cursor)
+        applied = []
+        for number, description, statements in sorted(migrations):
+            if number <= version:
+                continue
+            for statement in statements:
+                try:
+                    cursor.execute(statement)
+                except mysql.connector.Error as err:
+                    if err.errno not in ALREADY_APPLIED:
+                        raise
+            cursor.execute(
+                "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                (number, description)
+            )
+            conn.commit()
+            applied.append(number)
+            print(f"Applied schema migration {number}: {description}")
+        return applied
+    finally:
+        cursor.close()
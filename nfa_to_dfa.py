@@ -1,9 +1,24 @@
 from collections import deque
-from typing import Set, Dict, FrozenSet, Tuple
+from typing import Set, Dict, FrozenSet, Tuple, Union, List, Optional
+from array import array
 import json
+import os
+import sys
+import time
+from worker_client import run_cli
+from automaton import Automaton, NO_TRANSITION
+from alphabet import compress_nfa, expand_automaton, expand_transitions, nfa_symbol_classes
 from display import display_automaton, print_automaton
+from phase_stats import PhaseStats, phase, run_profiled, split_flags
 
-def epsilon_closure(states: Set[str], transitions: Dict[str, Dict[str, Set[str]]]) -> FrozenSet[str]:
+class StateLimitExceeded(ValueError):
+    """Raised when subset construction discovers more than max_states DFA states."""
+
+def epsilon_closure(
+    states: Set[str],
+    transitions: Dict[str, Dict[str, Set[str]]],
+    stats: Optional[PhaseStats] = None
+) -> FrozenSet[str]:
     closure = set(states)
     queue = deque(states)
     
@@ -14,28 +29,343 @@ def epsilon_closure(states: Set[str], transitions: Dict[str, Dict[str, Set[str]]
                 closure.add(to_state)
                 queue.append(to_state)
     
+    if stats is not None:
+        stats.count("epsilon_closure_calls")
+        stats.count("epsilon_closure_visited", len(closure))
     return frozenset(closure)
 
+def iter_bits(mask: int):
+    """Yield the positions of the set bits of an int, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def epsilon_closure_masks(labels: List[str], transitions: Dict[str, Dict[str, Set[str]]]) -> List[int]:
+    """Epsilon closure of every NFA state as a bitmask over ``labels``.
+
+    The 'e' graph is condensed into strongly connected components (iterative
+    Tarjan); components come out in reverse topological order, so each
+    closure is its own members OR'ed with the already-finished closures of
+    its successors.
+    """
+    index = {label: i for i, label in enumerate(labels)}
+    successors = [[index[t] for t in transitions.get(label, {}).get('e', ()) if t in index] for label in labels]
+    n = len(labels)
+    order = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack = []
+    component = [-1] * n
+    closures = []
+    counter = 0
+
+    for root in range(n):
+        if order[root] != -1:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, edge = work.pop()
+            if edge == 0:
+                order[v] = low[v] = counter
+                counter += 1
+                stack.append(v)
+                on_stack[v] = True
+            if edge < len(successors[v]):
+                work.append((v, edge + 1))
+                w = successors[v][edge]
+                if order[w] == -1:
+                    work.append((w, 0))
+                elif on_stack[w]:
+                    low[v] = min(low[v], order[w])
+                continue
+            if work and low[v] < low[work[-1][0]]:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[v])
+            if low[v] == order[v]:
+                members = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component[w] = len(closures)
+                    members.append(w)
+                    if w == v:
+                        break
+                mask = 0
+                for w in members:
+                    mask |= 1 << w
+                for w in members:
+                    for x in successors[w]:
+                        if component[x] != len(closures):
+                            mask |= closures[component[x]]
+                closures.append(mask)
+
+    return [closures[component[v]] for v in range(n)]
+
+def _prepare_bitset(
+    states: Set[str],
+    start: str,
+    finals: Set[str],
+    transitions: Dict[str, Dict[str, Set[str]]],
+    stats: Optional[PhaseStats] = None
+) -> Tuple[List[str], List[str], List[List[int]], int, int]:
+    """Bit positions, symbols, per-symbol successor masks, finals mask and initial subset."""
+    # NFA states become bit positions; DFA subsets are Python ints
+    with phase(stats, "closures"):
+        labels = set(states) | {start} | set(transitions)
+        for sym_trans in transitions.values():
+            for to_states in sym_trans.values():
+                labels.update(to_states)
+        labels = sorted(labels)
+        index = {label: i for i, label in enumerate(labels)}
+        closures = epsilon_closure_masks(labels, transitions)
+    if stats is not None:
+        stats.count("epsilon_closure_calls", len(labels))
+        stats.count("epsilon_closure_visited", sum(bin(mask).count("1") for mask in closures))
+
+    with phase(stats, "successor_masks"):
+        symbols = sorted({sym for sym_trans in transitions.values() for sym in sym_trans if sym != 'e'})
+        # step[a][i]: closure of the a-successors of state i
+        step = []
+        for sym in symbols:
+            row = [0] * len(labels)
+            for i, label in enumerate(labels):
+                mask = 0
+                for to_state in transitions.get(label, {}).get(sym, ()):
+                    mask |= closures[index[to_state]]
+                row[i] = mask
+            step.append(row)
+
+    finals_mask = 0
+    for label in finals:
+        if label in index:
+            finals_mask |= 1 << index[label]
+    return labels, symbols, step, finals_mask, closures[index[start]]
+
+def _successors(step: List[List[int]], current: int) -> List[int]:
+    """Target subset of ``current`` on every symbol (0 when there is none)."""
+    members = list(iter_bits(current))
+    targets = []
+    for sym_step in step:
+        target = 0
+        for i in members:
+            target |= sym_step[i]
+        targets.append(target)
+    return targets
+
+def _build_output(
+    labels: List[str],
+    symbols: List[str],
+    masks: List[int],
+    edges: List[List[Tuple[int, int]]],
+    finals_mask: int,
+    compact: bool,
+    stats: Optional[PhaseStats] = None
+):
+    with phase(stats, "output"):
+        subsets = [frozenset(labels[i] for i in iter_bits(mask)) for mask in masks]
+        if compact:
+            k = len(symbols)
+            table = array('i', [NO_TRANSITION]) * (len(masks) * k)
+            for from_id, row in enumerate(edges):
+                for a, to_id in row:
+                    table[from_id * k + a] = to_id
+            accepting = bytearray(1 if mask & finals_mask else 0 for mask in masks)
+            return Automaton(subsets, symbols, 0, accepting, table)
+
+        dfa_transitions = {
+            (subsets[from_id], symbols[a]): subsets[to_id]
+            for from_id, row in enumerate(edges)
+            for a, to_id in row
+        }
+        dfa_finals = {subsets[i] for i, mask in enumerate(masks) if mask & finals_mask}
+        return set(subsets), subsets[0], dfa_finals, dfa_transitions
+
+def _convert_bitset(
+    states: Set[str],
+    start: str,
+    finals: Set[str],
+    transitions: Dict[str, Dict[str, Set[str]]],
+    compact: bool,
+    stats: Optional[PhaseStats] = None,
+    max_states: Optional[int] = None
+):
+    labels, symbols, step, finals_mask, initial = _prepare_bitset(states, start, finals, transitions, stats)
+    limit = max_states or float("inf")
+    ids = {initial: 0}
+    masks = [initial]
+    edges = []
+    queue = deque([initial])
+    queue_peak = 0
+    with phase(stats, "subset_construction"):
+        while queue:
+            if len(queue) > queue_peak:
+                queue_peak = len(queue)
+            current = queue.popleft()
+            members = list(iter_bits(current))
+            row = []
+            for a, sym_step in enumerate(step):
+                target = 0
+                for i in members:
+                    target |= sym_step[i]
+                if target:
+                    if target not in ids:
+                        if len(masks) >= limit:
+                            raise StateLimitExceeded(f"DFA exceeds {max_states} states")
+                        ids[target] = len(masks)
+                        masks.append(target)
+                        queue.append(target)
+                    row.append((a, ids[target]))
+            edges.append(row)
+    if stats is not None:
+        stats.count("subsets_discovered", len(masks))
+        stats.count("dfa_transitions", sum(len(row) for row in edges))
+        stats.high_water("queue_high_water", queue_peak)
+    return _build_output(labels, symbols, masks, edges, finals_mask, compact, stats)
+
+# Frontiers smaller than this are expanded in the parent process. Measured
+# with `benchmark.py parallel-calibrate`: expanding a subset costs ~3.4 us
+# in the parent, while one pool.map over a level's 4W chunks costs a fixed
+# ~1.2 ms (2 workers) to ~2.3 ms (4 workers), so levels break even at
+# roughly 800-1100 subsets
+PARALLEL_MIN_FRONTIER = 1024
+
+_worker_step: List[List[int]] = []
+
+def _init_worker(step: List[List[int]]) -> None:
+    global _worker_step
+    _worker_step = step
+
+def _expand_chunk(chunk: List[int]) -> List[List[int]]:
+    return [_successors(_worker_step, current) for current in chunk]
+
+def _convert_parallel(
+    states: Set[str],
+    start: str,
+    finals: Set[str],
+    transitions: Dict[str, Dict[str, Set[str]]],
+    compact: bool,
+    workers: Optional[int] = None,
+    stats: Optional[PhaseStats] = None,
+    max_states: Optional[int] = None
+):
+    """Level-synchronous subset construction with successor masks computed in worker processes.
+
+    Each BFS level is cut into chunks of int bitmasks and expanded by a
+    ProcessPoolExecutor; the parent then numbers new subsets by walking the
+    level in order, so ids (and the result) match the "bitset" engine for any
+    worker count.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    labels, symbols, step, finals_mask, initial = _prepare_bitset(states, start, finals, transitions, stats)
+    workers = workers or os.cpu_count() or 1
+    limit = max_states or float("inf")
+    ids = {initial: 0}
+    masks = [initial]
+    edges = []
+    frontier = [initial]
+    levels = 0
+    frontier_peak = 0
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(step,))
+    try:
+        with phase(stats, "subset_construction"):
+            while frontier:
+                levels += 1
+                frontier_peak = max(frontier_peak, len(frontier))
+                if pool is None or len(frontier) < PARALLEL_MIN_FRONTIER:
+                    expanded = [_successors(step, current) for current in frontier]
+                else:
+                    size = -(-len(frontier) // (workers * 4))
+                    chunks = [frontier[i:i + size] for i in range(0, len(frontier), size)]
+                    expanded = [targets for part in pool.map(_expand_chunk, chunks) for targets in part]
+                next_frontier = []
+                for targets in expanded:
+                    row = []
+                    for a, target in enumerate(targets):
+                        if target:
+                            if target not in ids:
+                                if len(masks) >= limit:
+                                    raise StateLimitExceeded(f"DFA exceeds {max_states} states")
+                                ids[target] = len(masks)
+                                masks.append(target)
+                                next_frontier.append(target)
+                            row.append((a, ids[target]))
+                    edges.append(row)
+                frontier = next_frontier
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if stats is not None:
+        stats.count("subsets_discovered", len(masks))
+        stats.count("dfa_transitions", sum(len(row) for row in edges))
+        stats.count("bfs_levels", levels)
+        stats.high_water("queue_high_water", frontier_peak)
+    return _build_output(labels, symbols, masks, edges, finals_mask, compact, stats)
+
 def convert_nfa_to_dfa(
     states: Set[str],
     start: str,
     finals: Set[str],
-    transitions: Dict[str, Dict[str, Set[str]]]
-) -> Tuple[Set[FrozenSet[str]], FrozenSet[str], Set[FrozenSet[str]], Dict[Tuple[FrozenSet[str], str], FrozenSet[str]]]:
+    transitions: Dict[str, Dict[str, Set[str]]],
+    compact: bool = False,
+    engine: str = "bitset",
+    stats: Optional[PhaseStats] = None,
+    workers: Optional[int] = None,
+    max_states: Optional[int] = None,
+    compress_alphabet: bool = False
+) -> Union[Tuple[Set[FrozenSet[str]], FrozenSet[str], Set[FrozenSet[str]], Dict[Tuple[FrozenSet[str], str], FrozenSet[str]]], Automaton]:
+    """Subset construction. With compact=True the DFA is returned as an Automaton.
+
+    engine selects "bitset" (subsets as int bitmasks with precomputed closures
+    and successor masks), "parallel" (the bitset construction with each BFS
+    level expanded across ``workers`` processes, default one per CPU) or the
+    original "set" construction. A PhaseStats passed as ``stats`` receives
+    phase timings and construction counters. With ``max_states`` the
+    construction stops with StateLimitExceeded once the DFA grows past it.
+    compress_alphabet determinizes over classes of symbols with identical
+    transitions (see alphabet.py) and expands the result back to symbols,
+    so wide alphabets cost per class rather than per symbol.
+    """
+    if compress_alphabet:
+        with phase(stats, "alphabet_classes"):
+            classes = nfa_symbol_classes(transitions)
+            compressed = compress_nfa(transitions, classes)
+        if stats is not None:
+            stats.count("symbol_classes", len(classes))
+        dfa = convert_nfa_to_dfa(states, start, finals, compressed, compact, engine, stats, workers, max_states)
+        with phase(stats, "alphabet_expand"):
+            if compact:
+                return expand_automaton(dfa, classes)
+            dfa_states, initial_state, dfa_finals, dfa_transitions = dfa
+            return dfa_states, initial_state, dfa_finals, expand_transitions(dfa_transitions, classes)
+    if engine == "bitset":
+        return _convert_bitset(states, start, finals, transitions, compact, stats, max_states)
+    if engine == "parallel":
+        return _convert_parallel(states, start, finals, transitions, compact, workers, stats, max_states)
+    if engine != "set":
+        raise ValueError(f"Unknown determinization engine: {engine}")
     
     dfa_transitions = {}
     dfa_states = set()
     dfa_finals = set()
     
-    initial_state = epsilon_closure({start}, transitions)
+    initial_state = epsilon_closure({start}, transitions, stats)
     queue = deque([initial_state])
+    queue_peak = 0
+    started = time.perf_counter() if stats is not None else 0.0
     
     while queue:
+        if len(queue) > queue_peak:
+            queue_peak = len(queue)
         current = queue.popleft()
         
         if current in dfa_states:
             continue
             
+        if max_states and len(dfa_states) >= max_states:
+            raise StateLimitExceeded(f"DFA exceeds {max_states} states")
         dfa_states.add(current)
         
         if any(s in finals for s in current):
@@ -52,38 +382,79 @@ def convert_nfa_to_dfa(
                 next_states.update(transitions.get(state, {}).get(sym, set()))
             
             if next_states:
-                next_closure = epsilon_closure(next_states, transitions)
+                next_closure = epsilon_closure(next_states, transitions, stats)
                 dfa_transitions[(current, sym)] = next_closure
                 
                 if next_closure not in dfa_states:
                     queue.append(next_closure)
     
+    if stats is not None:
+        stats.add_time("subset_construction", time.perf_counter() - started)
+        stats.count("subsets_discovered", len(dfa_states))
+        stats.count("dfa_transitions", len(dfa_transitions))
+        stats.high_water("queue_high_water", queue_peak)
+    if compact:
+        return Automaton.from_dict(dfa_states, initial_state, dfa_finals, dfa_transitions)
     return dfa_states, initial_state, dfa_finals, dfa_transitions
 
-if __name__ == "__main__":
-    with open("nfa_input.json") as f:
-        data = json.load(f)
-    states = set(data["states"])
-    start = data["startState"]
-    finals = set(data["acceptingStates"])
-    transitions = {}
-    for from_state, symbol, to_state in data["transitions"]:
-        if from_state not in transitions:
-            transitions[from_state] = {}
-        if symbol not in transitions[from_state]:
-            transitions[from_state][symbol] = set()
-        transitions[from_state][symbol].add(to_state)
-    dfa_states, initial_state, dfa_finals, dfa_transitions = convert_nfa_to_dfa(states, start, finals, transitions) 
-    result = {
-        "states": [list(s) for s in dfa_states],
-        "startState": list(initial_state),
-        "acceptingStates": [list(s) for s in dfa_finals],
-        "transitions": [
-            {"from": list(k[0]), "symbol": k[1], "to": list(v)}
-            for k, v in dfa_transitions.items()
-        ]
-    }  
-    with open("dfa_output.json", "w") as f:
-        json.dump(result, f, indent=2)
+def main(argv=None) -> int:
+    """Script entry point; also run in-process by the automaton worker.
+
+    Usage: python nfa_to_dfa.py [input] [output] [--stats] [--profile]; .jsonl
+    paths are read and written as streamed automaton JSON Lines instead of
+    whole JSON documents. --stats prints phase timings and counters and
+    --profile a cProfile summary; both bypass the result cache.
+    """
+    from stream_io import is_jsonl, load_nfa, write_dfa
+    argv, show_stats, profile = split_flags(argv or [])
+    input_path = argv[0] if len(argv) > 0 else "nfa_input.json"
+    output_path = argv[1] if len(argv) > 1 else "dfa_output.json"
+    if is_jsonl(input_path):
+        states, start, finals, transitions = load_nfa(input_path)
+    else:
+        with open(input_path) as f:
+            data = json.load(f)
+        states = set(data["states"])
+        start = data["startState"]
+        finals = set(data["acceptingStates"])
+        transitions = {}
+        for from_state, symbol, to_state in data["transitions"]:
+            if from_state not in transitions:
+                transitions[from_state] = {}
+            if symbol not in transitions[from_state]:
+                transitions[from_state][symbol] = set()
+            transitions[from_state][symbol].add(to_state)
+    from result_cache import default_cache
+    cache = default_cache()
+    stats = PhaseStats() if show_stats else None
+    if show_stats or profile:
+        convert = lambda: convert_nfa_to_dfa(states, start, finals, transitions, stats=stats)
+        dfa_states, initial_state, dfa_finals, dfa_transitions = run_profiled(convert) if profile else convert()
+    else:
+        options = {"engine": "bitset", "compact": False}
+        dfa_states, initial_state, dfa_finals, dfa_transitions = cache.get_or_compute(
+            "dfa", (states, start, finals, transitions),
+            lambda: convert_nfa_to_dfa(states, start, finals, transitions, **options), options)
+    if is_jsonl(output_path):
+        write_dfa(output_path, dfa_states, initial_state, dfa_finals, dfa_transitions)
+    else:
+        result = {
+            "states": [list(s) for s in dfa_states],
+            "startState": list(initial_state),
+            "acceptingStates": [list(s) for s in dfa_finals],
+            "transitions": [
+                {"from": list(k[0]), "symbol": k[1], "to": list(v)}
+                for k, v in dfa_transitions.items()
+            ]
+        }  
+        with open(output_path, "w") as f:
+            json.dump(result, f, indent=2)
     print("Converted NFA to DFA successfully!")
-    print_automaton(dfa_states, initial_state, dfa_finals, dfa_transitions, "Converted DFA")    
+    print_automaton(dfa_states, initial_state, dfa_finals, dfa_transitions, "Converted DFA")
+    if stats is not None:
+        print(stats.report())
+    print(f"Result cache: {cache.stats}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run_cli("nfa_to_dfa", sys.argv[1:], main))
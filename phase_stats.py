@@ -0,0 +1,95 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class PhaseStats:
+    """Phase timers and hot-path counters filled in by an instrumented run.
+
+    Pass an instance as ``stats=`` to convert_nfa_to_dfa or minimize_dfa.
+    Counters are kept in locals by the algorithms and written here once per
+    call, so a run without stats pays nothing beyond a few None checks.
+    """
+
+    __slots__ = ("timers", "counters")
+
+    def __init__(self):
+        self.timers: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        self.timers[phase] = self.timers.get(phase, 0.0) + seconds
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def high_water(self, name: str, value: int) -> None:
+        if value > self.counters.get(name, 0):
+            self.counters[name] = value
+
+    def phase(self, name: str) -> "_Phase":
+        """Context manager adding the elapsed wall time to timer ``name``."""
+        return _Phase(self, name)
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {"timers": dict(self.timers), "counters": dict(self.counters)}
+
+    def report(self) -> str:
+        lines = ["Phase timings:"]
+        for phase, seconds in self.timers.items():
+            lines.append(f"  {phase:<24} {seconds * 1000:>10.2f} ms")
+        lines.append("Counters:")
+        for name, value in self.counters.items():
+            lines.append(f"  {name:<24} {value:>10}")
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"PhaseStats(timers={self.timers}, counters={self.counters})"
+
+
+class _Phase:
+    __slots__ = ("stats", "name", "started")
+
+    def __init__(self, stats: PhaseStats, name: str):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stats.add_time(self.name, time.perf_counter() - self.started)
+
+
+def phase(stats: Optional[PhaseStats], name: str) -> Any:
+    """stats.phase(name), or a no-op context manager when stats is None."""
+    return _NO_PHASE if stats is None else _Phase(stats, name)
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+def run_profiled(func: Callable[[], Any], limit: int = 25) -> Any:
+    """Run func under cProfile and print the top functions by cumulative time."""
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func)
+    finally:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(limit)
+
+
+def split_flags(argv: List[str]) -> Tuple[List[str], bool, bool]:
+    """Separate --stats / --profile from positional script arguments."""
+    positional = [arg for arg in argv if arg not in ("--stats", "--profile")]
+    return positional, "--stats" in argv, "--profile" in argv
@@ -0,0 +1,221 @@
+import sys
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+from automaton import Automaton, NO_TRANSITION
+from equivalence import DFA, _word, format_word
+from nfa_to_dfa import StateLimitExceeded
+from phase_stats import PhaseStats
+
+# Acceptance of a pair from the acceptance of its two components
+OPERATIONS: Dict[str, Callable[[bool, bool], bool]] = {
+    "intersection": lambda x, y: x and y,
+    "union": lambda x, y: x or y,
+    "difference": lambda x, y: x and not y,
+    "symmetric_difference": lambda x, y: x != y,
+}
+
+# Label of an implicit sink in product pair labels
+SINK_LABEL = "∅"
+
+
+class _Pairs:
+    """The reachable part of the product of two DFAs, walked on demand.
+
+    Missing transitions go to an implicit sink per automaton (state id
+    na or nb). A pair is dead, and never entered, when the operation
+    rejects every continuation because of its sinks: for an intersection
+    that is any pair with a sink, for a difference a sink on the left,
+    for union and symmetric difference only the pair of sinks.
+    """
+
+    def __init__(self, first: DFA, second: DFA, operation: str):
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation {operation!r}; expected one of {', '.join(OPERATIONS)}")
+        self.a = a = first if isinstance(first, Automaton) else Automaton.from_dict(*first)
+        self.b = b = second if isinstance(second, Automaton) else Automaton.from_dict(*second)
+        accepts = OPERATIONS[operation]
+        # dead[sink_a][sink_b]: no word is accepted from a pair with these sinks
+        self.dead = [[not any(accepts(x, y) for x in ((False,) if sink_a else (False, True))
+                              for y in ((False,) if sink_b else (False, True)))
+                      for sink_b in (0, 1)] for sink_a in (0, 1)]
+        self.accepts = accepts
+        dead = self.dead
+        # Symbols whose missing column can only lead into dead pairs are left out
+        self.symbols = [
+            sym for sym in sorted(set(a.symbols) | set(b.symbols))
+            if not (a.symbol_id(sym) == NO_TRANSITION and dead[1][0] and dead[1][1])
+            and not (b.symbol_id(sym) == NO_TRANSITION and dead[0][1] and dead[1][1])
+        ]
+        self.columns_a = [a.symbol_id(sym) for sym in self.symbols]
+        self.columns_b = [b.symbol_id(sym) for sym in self.symbols]
+
+    def start(self) -> Optional[Tuple[int, int]]:
+        """The start pair, or None when the product accepts nothing from it."""
+        return None if self.dead[0][0] else (self.a.start, self.b.start)
+
+    def accepting(self, p: int, q: int) -> bool:
+        a, b = self.a, self.b
+        return self.accepts(p < a.num_states and bool(a.accepting[p]),
+                            q < b.num_states and bool(b.accepting[q]))
+
+    def successors(self, p: int, q: int) -> List[Optional[Tuple[int, int]]]:
+        """Target pair per symbol of self.symbols; None for dead pairs."""
+        a, b, dead = self.a, self.b, self.dead
+        na, nb, ka, kb = a.num_states, b.num_states, a.num_symbols, b.num_symbols
+        table_a, table_b = a.table, b.table
+        targets: List[Optional[Tuple[int, int]]] = []
+        for column_a, column_b in zip(self.columns_a, self.columns_b):
+            p2 = table_a[p * ka + column_a] if p < na and column_a != NO_TRANSITION else NO_TRANSITION
+            q2 = table_b[q * kb + column_b] if q < nb and column_b != NO_TRANSITION else NO_TRANSITION
+            sink_a, sink_b = p2 == NO_TRANSITION, q2 == NO_TRANSITION
+            targets.append(None if dead[sink_a][sink_b] else (na if sink_a else p2, nb if sink_b else q2))
+        return targets
+
+    def label(self, p: int, q: int) -> str:
+        from display import format_state
+        label_a = SINK_LABEL if p == self.a.num_states else format_state(self.a.labels[p])
+        label_b = SINK_LABEL if q == self.b.num_states else format_state(self.b.labels[q])
+        return f"({label_a}, {label_b})"
+
+
+def product(first: DFA, second: DFA, operation: str = "intersection", labels: bool = True,
+            max_states: Optional[int] = None, stats: Optional[PhaseStats] = None) -> Automaton:
+    """Product DFA of two DFAs under ``operation`` (see OPERATIONS).
+
+    Only pairs reachable from the start pair are built, breadth-first and
+    straight into the Automaton table, so the result can go to
+    minimize_dfa or AutomataDB.save_dfa without an intermediate dict.
+    Pairs that can no longer accept are left out, but pairs that are live
+    in both components may still be dead in the product; minimize_dfa with
+    prune=True trims them. States are labelled "(label_a, label_b)", or numbered in
+    discovery order with labels=False. Raises StateLimitExceeded past
+    ``max_states`` pairs.
+    """
+    pairs = _Pairs(first, second, operation)
+    k = len(pairs.symbols)
+    start = pairs.start()
+    if start is None:
+        # Empty language: a single rejecting state
+        return Automaton([pairs.label(pairs.a.start, pairs.b.start) if labels else 0], pairs.symbols, 0,
+                         bytearray(1), array('i', [NO_TRANSITION]) * k)
+
+    index: Dict[Tuple[int, int], int] = {start: 0}
+    order = [start]
+    accepting = bytearray([pairs.accepting(*start)])
+    table = array('i')
+    i = 0
+    try:
+        while i < len(order):
+            for target in pairs.successors(*order[i]):
+                if target is None:
+                    table.append(NO_TRANSITION)
+                    continue
+                j = index.get(target)
+                if j is None:
+                    j = index[target] = len(order)
+                    if max_states is not None and j >= max_states:
+                        raise StateLimitExceeded(f"Product exceeds {max_states} states")
+                    order.append(target)
+                    accepting.append(pairs.accepting(*target))
+                table.append(j)
+            i += 1
+    finally:
+        if stats is not None:
+            stats.count("pairs_explored", len(order))
+
+    state_labels = [pairs.label(p, q) for p, q in order] if labels else list(range(len(order)))
+    return Automaton(state_labels, pairs.symbols, 0, accepting, table)
+
+
+def product_witness(first: DFA, second: DFA, operation: str = "intersection",
+                    stats: Optional[PhaseStats] = None) -> Optional[List[str]]:
+    """Shortest word accepted by the product, or None if its language is empty.
+
+    Explores reachable pairs breadth-first like product() but keeps only
+    the visited pairs and the links back to their parents, and stops at
+    the first accepting pair; no product table is built.
+    """
+    pairs = _Pairs(first, second, operation)
+    start = pairs.start()
+    if start is None:
+        return None
+    if pairs.accepting(*start):
+        return []
+    seen = {start}
+    order = [start]
+    links: List[Tuple[int, Optional[str]]] = [(-1, None)]
+    i = 0
+    try:
+        while i < len(order):
+            for sym, target in zip(pairs.symbols, pairs.successors(*order[i])):
+                if target is None or target in seen:
+                    continue
+                seen.add(target)
+                order.append(target)
+                links.append((i, sym))
+                if pairs.accepting(*target):
+                    return _word(links, len(order) - 1)
+            i += 1
+        return None
+    finally:
+        if stats is not None:
+            stats.count("pairs_explored", len(order))
+
+
+def is_empty(first: DFA, second: DFA, operation: str = "intersection") -> bool:
+    return product_witness(first, second, operation) is None
+
+
+def _load_stored(source: str, db=None) -> Automaton:
+    """A DFA from an AutomataDB id, or from a JSON/.jsonl file path."""
+    if source.isdigit():
+        automaton = db.fetch_dfa(int(source), compact=True, labels=True)
+        if not isinstance(automaton, Automaton) or not automaton.num_states:
+            raise ValueError(f"DFA {source} not found")
+        return automaton
+    from equivalence import _load
+    dfa = _load(source, nfa=False)
+    return dfa if isinstance(dfa, Automaton) else Automaton.from_dict(*dfa)
+
+
+if __name__ == "__main__":
+    usage = ("Usage: python product.py <operation> <first> <second> [--witness] [--minimize] [--save NAME]\n"
+             f"  operation: {', '.join(OPERATIONS)}\n"
+             "  first/second: stored DFA ids or JSON/.jsonl files;\n"
+             "  --witness only prints a shortest accepted word (or that the product is empty).")
+    args = sys.argv[1:]
+    save_name = None
+    if "--save" in args:
+        at = args.index("--save")
+        save_name = args[at + 1] if at + 1 < len(args) else None
+        del args[at:at + 2]
+    positional = [arg for arg in args if not arg.startswith("--")]
+    if len(positional) != 3 or positional[0] not in OPERATIONS or ("--save" in sys.argv and not save_name):
+        print(usage)
+        sys.exit(2)
+    operation, first_source, second_source = positional
+    db = None
+    if first_source.isdigit() or second_source.isdigit() or save_name:
+        from database import AutomataDB
+        db = AutomataDB()
+    first, second = _load_stored(first_source, db), _load_stored(second_source, db)
+
+    stats = PhaseStats()
+    if "--witness" in args:
+        word = product_witness(first, second, operation, stats)
+        print("Empty" if word is None else f"Shortest accepted word: {format_word(word)}")
+        print(f"Pairs explored: {stats.counters['pairs_explored']}")
+        sys.exit(0 if word is None else 1)
+
+    result = product(first, second, operation, labels=not (save_name or "--minimize" in args), stats=stats)
+    print(f"Product: {result.num_states} states "
+          f"({first.num_states} x {second.num_states} = {first.num_states * second.num_states} possible pairs)")
+    if "--minimize" in args:
+        from dfa_minimizer import minimize_dfa
+        result = minimize_dfa(result, prune=True)
+        print(f"Minimized: {result.num_states} states")
+    if save_name:
+        dfa_id = db.save_dfa(save_name, result, state_ids=True, minimal="--minimize" in args)
+        sys.exit(0 if dfa_id and dfa_id > 0 else 1)
+    from display import print_automaton
+    print_automaton(result, title=f"{operation.replace('_', ' ').capitalize()} DFA")
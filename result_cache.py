@@ -0,0 +1,229 @@
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from stream_io import decode_label, encode_label
+
+# On-disk store location and size bound, overridable from the environment
+DEFAULT_CACHE_DIR = os.environ.get("AUTOMATA_CACHE_DIR", ".automata_cache")
+DEFAULT_MAX_BYTES = int(os.environ.get("AUTOMATA_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Part of every key: bump it when a cached algorithm or the payload format
+# changes, so entries computed the old way are never served again
+CACHE_VERSION = 3
+
+
+def _tagged(label: Hashable) -> Any:
+    if isinstance(label, (frozenset, set)):
+        return {"set": sorted((_tagged(item) for item in label), key=_dumps)}
+    if isinstance(label, tuple):
+        return {"tuple": [_tagged(item) for item in label]}
+    return label
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=repr)
+
+
+def canonical_label(label: Hashable) -> str:
+    """Unambiguous, order-independent text form of a state label.
+
+    The JSON of the label with sets sorted and tagged, so 1 and "1", or
+    {"a,b"} and {"a", "b"}, never share a form (and so a cache key).
+    """
+    return _dumps(_tagged(label))
+
+
+def automaton_key(states: Any, start: Any, finals: Any, transitions: Dict) -> str:
+    """SHA-256 of an automaton normalized independent of set and dict ordering.
+
+    Accepts NFAs (transitions as {state: {symbol: {targets}}}) and DFAs
+    (transitions as {(state, symbol): target}).
+    """
+    rows = []
+    for key, value in transitions.items():
+        if isinstance(value, dict):
+            for symbol, targets in value.items():
+                for target in targets:
+                    rows.append((canonical_label(key), symbol, canonical_label(target)))
+        else:
+            from_state, symbol = key
+            rows.append((canonical_label(from_state), symbol, canonical_label(value)))
+    normalized = {
+        "states": sorted(canonical_label(s) for s in states),
+        "start": canonical_label(start),
+        "finals": sorted(canonical_label(f) for f in finals),
+        "transitions": sorted(rows),
+    }
+    encoded = json.dumps(normalized, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def result_key(automaton: Tuple[Any, Any, Any, Dict], options: Optional[Dict[str, Any]] = None) -> str:
+    """Key of a result: the input automaton, the options it was computed with and CACHE_VERSION."""
+    tagged = {name: _tagged(value) for name, value in (options or {}).items()}
+    salt = _dumps({"version": CACHE_VERSION, "options": tagged})
+    return hashlib.sha256(f"{automaton_key(*automaton)}:{salt}".encode("utf-8")).hexdigest()
+
+
+def encode_result(dfa: Tuple[Any, Any, Any, Dict]) -> bytes:
+    """Data-only payload of a DFA dict tuple: JSON with stream_io's label encoding."""
+    states, start, finals, transitions = dfa
+    data = {
+        "states": [encode_label(s) for s in states],
+        "start": encode_label(start),
+        "finals": [encode_label(f) for f in finals],
+        "transitions": [[encode_label(from_state), symbol, encode_label(to_state)]
+                        for (from_state, symbol), to_state in transitions.items()],
+    }
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def decode_result(payload: bytes) -> Tuple[set, Any, set, Dict]:
+    """Inverse of encode_result; raises ValueError on anything else."""
+    try:
+        data = json.loads(payload)
+        transitions = {(decode_label(from_state), symbol): decode_label(to_state)
+                       for from_state, symbol, to_state in data["transitions"]}
+        return ({decode_label(s) for s in data["states"]}, decode_label(data["start"]),
+                {decode_label(f) for f in data["finals"]}, transitions)
+    except (KeyError, TypeError, ValueError) as err:
+        raise ValueError(f"Malformed cache payload: {err}") from None
+
+
+class CacheStats:
+    __slots__ = ("hits", "misses", "db_hits", "evictions")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.db_hits = 0
+        self.evictions = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "db_hits": self.db_hits, "evictions": self.evictions}
+
+    def __repr__(self) -> str:
+        return (f"CacheStats(hits={self.hits}, misses={self.misses}, "
+                f"db_hits={self.db_hits}, evictions={self.evictions})")
+
+
+class ResultCache:
+    """Content-addressed store for conversion and minimization results.
+
+    Values are DFA dict tuples, stored as data-only JSON (encode_result),
+    never pickles, since the database tier is shared between clients.
+    Entries live in ``directory`` as files named ``<key>.<kind>``; the
+    directory is kept under ``max_bytes`` by evicting the least recently
+    used entries (access refreshes a file's mtime). With ``db`` (an
+    AutomataDB) a database tier is consulted on disk misses and written on
+    every store.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES, db: Any = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.db = db
+        self.stats = CacheStats()
+        self._size = None
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.{kind}")
+
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [entry for entry in os.scandir(self.directory) if entry.is_file()]
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        path = self._path(kind, key)
+        try:
+            with open(path, "rb") as f:
+                value = decode_result(f.read())
+            os.utime(path)
+            self.stats.hits += 1
+            return value
+        except (OSError, ValueError):
+            pass
+
+        if self.db is not None:
+            payload = self.db.fetch_cached_result(key, kind)
+            if payload is not None:
+                try:
+                    value = decode_result(payload)
+                except ValueError:
+                    pass
+                else:
+                    self.stats.db_hits += 1
+                    self._write(path, payload)
+                    return value
+
+        self.stats.misses += 1
+        return None
+
+    def put(self, kind: str, key: str, value: Any) -> None:
+        payload = encode_result(value)
+        self._write(self._path(kind, key), payload)
+        if self.db is not None:
+            self.db.save_cached_result(key, kind, payload)
+
+    def _write(self, path: str, payload: bytes) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        if self._size is None:
+            self._size = sum(entry.stat().st_size for entry in self._entries())
+        # Write then rename so a concurrent reader never sees a partial entry
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(payload)
+        if os.path.exists(path):
+            self._size -= os.path.getsize(path)
+        os.replace(temp_path, path)
+        self._size += len(payload)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self._size <= self.max_bytes:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self._size -= size
+            self.stats.evictions += 1
+
+    def get_or_compute(self, kind: str, automaton: Tuple[Any, Any, Any, Dict], compute: Callable[[], Any],
+                       options: Optional[Dict[str, Any]] = None) -> Any:
+        """Cached result of ``compute()`` for this input automaton.
+
+        ``options`` are the engine and option arguments ``compute`` runs
+        with (pass them explicitly, not as defaults); they are part of the
+        key, so results computed differently never collide.
+        """
+        key = result_key(automaton, options)
+        value = self.get(kind, key)
+        if value is None:
+            value = compute()
+            self.put(kind, key, value)
+        return value
+
+    def clear(self) -> None:
+        for entry in self._entries():
+            os.remove(entry.path)
+        self._size = 0
+
+
+_default_cache: Optional[ResultCache] = None
+
+
+def default_cache() -> ResultCache:
+    """Process-wide disk-only cache used by the scripts."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
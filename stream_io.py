@@ -0,0 +1,183 @@
+import json
+from typing import Any, Dict, FrozenSet, Hashable, IO, Iterator, Optional, Set, Tuple, Union
+
+# First line of every automaton JSON Lines file
+FORMAT_NAME = "automaton-jsonl"
+FORMAT_VERSION = 1
+
+# Record tags: ["s", state, accepting] and ["t", from_state, symbol, to_state]
+STATE_RECORD = "s"
+TRANSITION_RECORD = "t"
+
+
+def encode_label(label: Hashable) -> Any:
+    """JSON form of a state label; frozensets become sorted (nested) lists."""
+    if isinstance(label, (frozenset, set)):
+        return sorted((encode_label(item) for item in label), key=lambda item: json.dumps(item))
+    return label
+
+
+def decode_label(value: Any) -> Hashable:
+    """Inverse of encode_label: lists become frozensets."""
+    if isinstance(value, list):
+        return frozenset(decode_label(item) for item in value)
+    return value
+
+
+class AutomatonWriter:
+    """Write an automaton as JSON Lines, one state or transition per line.
+
+    Nothing is buffered beyond the file object's own buffer, so arbitrarily
+    large automata can be written while they are being produced:
+
+        with AutomatonWriter("dfa.jsonl", "DFA", start) as out:
+            out.transition(from_state, symbol, to_state)
+    """
+
+    def __init__(self, target: Union[str, IO[str]], fa_type: str, start: Hashable, name: Optional[str] = None):
+        self._owns_file = isinstance(target, str)
+        self.file = open(target, "w", encoding="utf-8") if self._owns_file else target
+        self.states_written = 0
+        self.transitions_written = 0
+        header = {"format": FORMAT_NAME, "version": FORMAT_VERSION, "type": fa_type,
+                  "startState": encode_label(start)}
+        if name is not None:
+            header["name"] = name
+        self._write(header)
+
+    def _write(self, record: Any) -> None:
+        self.file.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False))
+        self.file.write("\n")
+
+    def state(self, label: Hashable, accepting: bool = False) -> None:
+        self._write([STATE_RECORD, encode_label(label), 1 if accepting else 0])
+        self.states_written += 1
+
+    def transition(self, from_state: Hashable, symbol: str, to_state: Hashable) -> None:
+        self._write([TRANSITION_RECORD, encode_label(from_state), symbol, encode_label(to_state)])
+        self.transitions_written += 1
+
+    def close(self) -> None:
+        if self._owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+    def __enter__(self) -> "AutomatonWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def is_jsonl(path: str) -> bool:
+    return path.endswith(".jsonl")
+
+
+def read_header(source: Union[str, IO[str]]) -> Dict[str, Any]:
+    with _open(source) as f:
+        return _parse_header(f.readline())
+
+
+def _parse_header(line: str) -> Dict[str, Any]:
+    header = json.loads(line) if line.strip() else {}
+    if header.get("format") != FORMAT_NAME:
+        raise ValueError("Not an automaton JSON Lines file")
+    if header.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"Unsupported automaton JSON Lines version {header['version']}")
+    header["startState"] = decode_label(header.get("startState"))
+    return header
+
+
+class _open:
+    """Open a path, or pass an already open file through without closing it."""
+
+    def __init__(self, source: Union[str, IO[str]]):
+        self.source = source
+        self.file = None
+
+    def __enter__(self) -> IO[str]:
+        if isinstance(self.source, str):
+            self.file = open(self.source, "r", encoding="utf-8")
+            return self.file
+        return self.source
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.file is not None:
+            self.file.close()
+
+
+def _stream(source: Union[str, IO[str]]) -> Iterator[Any]:
+    """Yield the parsed header, then every record as a tuple."""
+    with _open(source) as f:
+        yield _parse_header(f.readline())
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record[0] == STATE_RECORD:
+                yield STATE_RECORD, decode_label(record[1]), bool(record[2])
+            elif record[0] == TRANSITION_RECORD:
+                yield TRANSITION_RECORD, decode_label(record[1]), record[2], decode_label(record[3])
+
+
+def iter_records(source: Union[str, IO[str]]) -> Iterator[Tuple]:
+    """Yield ("s", state, accepting) and ("t", from, symbol, to) records lazily."""
+    stream = _stream(source)
+    next(stream)
+    yield from stream
+
+
+def iter_transitions(source: Union[str, IO[str]]) -> Iterator[Tuple[Hashable, str, Hashable]]:
+    for record in iter_records(source):
+        if record[0] == TRANSITION_RECORD:
+            yield record[1], record[2], record[3]
+
+
+def load_nfa(source: Union[str, IO[str]]) -> Tuple[Set[str], str, Set[str], Dict[str, Dict[str, Set[str]]]]:
+    """Build the NFA tuple for convert_nfa_to_dfa straight from the record stream."""
+    stream = _stream(source)
+    header = next(stream)
+    states, finals = set(), set()
+    transitions: Dict[str, Dict[str, Set[str]]] = {}
+    for record in stream:
+        if record[0] == STATE_RECORD:
+            states.add(record[1])
+            if record[2]:
+                finals.add(record[1])
+        else:
+            _, from_state, symbol, to_state = record
+            transitions.setdefault(from_state, {}).setdefault(symbol, set()).add(to_state)
+    return states, header["startState"], finals, transitions
+
+
+def load_dfa(source: Union[str, IO[str]]) -> Tuple[Set[Hashable], Hashable, Set[Hashable], Dict[Tuple[Hashable, str], Hashable]]:
+    """Build the DFA tuple used by minimize_dfa / print_automaton from the record stream."""
+    stream = _stream(source)
+    header = next(stream)
+    states, finals = set(), set()
+    transitions: Dict[Tuple[Hashable, str], Hashable] = {}
+    for record in stream:
+        if record[0] == STATE_RECORD:
+            states.add(record[1])
+            if record[2]:
+                finals.add(record[1])
+        else:
+            _, from_state, symbol, to_state = record
+            transitions[(from_state, symbol)] = to_state
+    return states, header["startState"], finals, transitions
+
+
+def write_dfa(
+    target: Union[str, IO[str]],
+    states: Set[FrozenSet[str]],
+    start: FrozenSet[str],
+    finals: Set[FrozenSet[str]],
+    transitions: Dict[Tuple[FrozenSet[str], str], FrozenSet[str]],
+    name: Optional[str] = None
+) -> None:
+    with AutomatonWriter(target, "DFA", start, name) as out:
+        for state in states:
+            out.state(state, state in finals)
+        for (from_state, symbol), to_state in transitions.items():
+            out.transition(from_state, symbol, to_state)
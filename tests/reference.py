@@ -0,0 +1,115 @@
+"""Naive reference implementations and random automata for the tests."""
+import itertools
+import random
+from typing import Dict, FrozenSet, Hashable, Iterator, List, Sequence, Set, Tuple
+
+NFA = Tuple[Set[str], str, Set[str], Dict[str, Dict[str, Set[str]]]]
+DFA = Tuple[Set[str], str, Set[str], Dict[Tuple[str, str], str]]
+
+
+def random_dfa(rng: random.Random, max_states: int = 6, symbols: str = "ab", density: float = 0.8) -> DFA:
+    """Partial DFA over ``symbols``; each transition exists with probability ``density``."""
+    n = rng.randint(1, max_states)
+    states = {f"q{i}" for i in range(n)}
+    transitions = {(f"q{i}", sym): f"q{rng.randrange(n)}"
+                   for i in range(n) for sym in symbols if rng.random() < density}
+    finals = {q for q in states if rng.random() < 0.4}
+    return states, "q0", finals, transitions
+
+
+def random_nfa(rng: random.Random, max_states: int = 5, symbols: str = "ab", epsilon: bool = True) -> NFA:
+    """NFA over ``symbols`` with up to two targets per (state, symbol) and optional 'e' moves."""
+    n = rng.randint(1, max_states)
+    states = {f"p{i}" for i in range(n)}
+    transitions: Dict[str, Dict[str, Set[str]]] = {}
+    for i in range(n):
+        for sym in symbols + ("e" if epsilon else ""):
+            if rng.random() < (0.25 if sym == "e" else 0.6):
+                targets = {f"p{rng.randrange(n)}" for _ in range(rng.randint(1, 2))}
+                transitions.setdefault(f"p{i}", {})[sym] = targets
+    finals = {p for p in states if rng.random() < 0.3}
+    return states, "p0", finals, transitions
+
+
+def words(symbols: str, max_length: int) -> Iterator[Tuple[str, ...]]:
+    """Every word over ``symbols`` up to ``max_length``, shortest first."""
+    for length in range(max_length + 1):
+        yield from itertools.product(symbols, repeat=length)
+
+
+def dfa_accepts(dfa: DFA, word: Sequence[str]) -> bool:
+    _, state, finals, transitions = dfa
+    for sym in word:
+        state = transitions.get((state, sym))
+        if state is None:
+            return False
+    return state in finals
+
+
+def _closure(states: Set[str], transitions: Dict[str, Dict[str, Set[str]]]) -> FrozenSet[str]:
+    closure = set(states)
+    stack = list(states)
+    while stack:
+        for target in transitions.get(stack.pop(), {}).get("e", ()):
+            if target not in closure:
+                closure.add(target)
+                stack.append(target)
+    return frozenset(closure)
+
+
+def nfa_accepts(nfa: NFA, word: Sequence[str]) -> bool:
+    _, start, finals, transitions = nfa
+    current = _closure({start}, transitions)
+    for sym in word:
+        current = _closure({t for q in current for t in transitions.get(q, {}).get(sym, ())}, transitions)
+    return bool(current & finals)
+
+
+def automaton_accepts(automaton, word: Sequence[str]) -> bool:
+    """Acceptance by an automaton.Automaton, read straight off its table."""
+    state = automaton.start
+    for sym in word:
+        a = automaton.symbol_id(sym)
+        if a < 0:
+            return False
+        state = automaton.table[state * automaton.num_symbols + a]
+        if state < 0:
+            return False
+    return bool(automaton.accepting[state])
+
+
+def language(accepts, automaton, symbols: str, max_length: int) -> List[Tuple[str, ...]]:
+    """The accepted words up to ``max_length``, shortest first."""
+    return [word for word in words(symbols, max_length) if accepts(automaton, word)]
+
+
+def minimal_size(dfa: DFA, symbols: str) -> int:
+    """States of the minimal partial DFA (no dead state), by naive Moore refinement."""
+    states, start, finals, transitions = dfa
+    reachable = {start}
+    stack = [start]
+    while stack:
+        q = stack.pop()
+        for sym in symbols:
+            t = transitions.get((q, sym))
+            if t is not None and t not in reachable:
+                reachable.add(t)
+                stack.append(t)
+    sink = object()
+    universe = list(reachable) + [sink]
+
+    def step(q: Hashable, sym: str) -> Hashable:
+        return sink if q is sink else transitions.get((q, sym), sink)
+
+    block = {q: q is not sink and q in finals for q in universe}
+    while True:
+        signature = {q: (block[q],) + tuple(block[step(q, sym)] for sym in symbols) for q in universe}
+        ids: Dict[tuple, int] = {}
+        refined = {q: ids.setdefault(signature[q], len(ids)) for q in universe}
+        if len(ids) == len(set(block.values())):
+            break
+        block = refined
+    # The block of the sink holds every dead state; it is not part of the result
+    # unless the language is empty, where the start state is kept alone
+    blocks = set(refined.values())
+    return max(1, len(blocks) - 1)
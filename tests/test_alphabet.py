@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from alphabet import compress_automaton, dfa_symbol_classes, expand_automaton, nfa_symbol_classes
+from automaton import Automaton
+from dfa_minimizer import minimize_dfa
+from nfa_to_dfa import convert_nfa_to_dfa
+from reference import random_nfa
+
+
+def _widened(nfa, copies: int):
+    """The NFA with each symbol duplicated ``copies`` times (a -> a0, a1, ...), for symbol classes."""
+    states, start, finals, transitions = nfa
+    widened = {
+        state: {(sym if sym == "e" else f"{sym}{i}"): targets
+                for sym, targets in sym_trans.items() for i in range(1 if sym == "e" else copies)}
+        for state, sym_trans in transitions.items()
+    }
+    return states, start, finals, widened
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_compressed_matches_set_engine(seed):
+    nfa = random_nfa(random.Random(seed))
+    assert convert_nfa_to_dfa(*nfa, compress_alphabet=True) == convert_nfa_to_dfa(*nfa, engine="set")
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_compressed_alphabet_on_wide_alphabets(seed):
+    nfa = _widened(random_nfa(random.Random(seed)), copies=3)
+    expected = convert_nfa_to_dfa(*nfa, engine="set")
+    assert convert_nfa_to_dfa(*nfa, compress_alphabet=True) == expected
+    dfa = Automaton.from_dict(*expected)
+    assert minimize_dfa(dfa, compress_alphabet=True).to_dict() == minimize_dfa(dfa).to_dict()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_symbol_classes_group_identical_columns(seed):
+    nfa = _widened(random_nfa(random.Random(seed)), copies=3)
+    classes = nfa_symbol_classes(nfa[3])
+    assert sorted(sym for members in classes for sym in members) == sorted(
+        {sym for row in nfa[3].values() for sym in row if sym != "e"})
+    dfa = convert_nfa_to_dfa(*nfa, compact=True)
+    dfa_classes = dfa_symbol_classes(dfa)
+    for members in dfa_classes:
+        columns = {dfa.table[dfa.symbol_id(sym)::dfa.num_symbols].tobytes() for sym in members}
+        assert len(columns) == 1
+    compressed = compress_automaton(dfa, dfa_classes)
+    assert compressed.num_symbols == len(dfa_classes)
+    assert expand_automaton(compressed, dfa_classes).to_dict() == dfa.to_dict()
@@ -0,0 +1,75 @@
+import os
+import random
+
+import pytest
+
+import batch_runner
+from batch_runner import BatchRunner, parse_id_range, run_job
+from dfa_minimizer import minimize_dfa
+from nfa_to_dfa import convert_nfa_to_dfa
+from reference import random_nfa
+
+
+class FakeDB:
+    def __init__(self):
+        self.saved = []
+
+    def save_dfas(self, dfas, **options):
+        self.saved.append((dfas, options))
+        return list(range(100 + len(self.saved) * 10, 100 + len(self.saved) * 10 + len(dfas)))
+
+
+def test_parse_id_range():
+    assert parse_id_range(None) == (0, float("inf"))
+    assert parse_id_range("42") == (42, 42)
+    assert parse_id_range("10-200") == (10, 200)
+    assert parse_id_range("500-") == (500, float("inf"))
+    assert parse_id_range("-7") == (0, 7)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_run_job_keeps_complete_dfas(seed, monkeypatch):
+    nfa = random_nfa(random.Random(seed))
+    monkeypatch.setattr(batch_runner, "_load_nfa", lambda source, nfa_id: nfa)
+    result = run_job("v2", seed, None, None)
+    assert result["status"] == "ok"
+    expected = minimize_dfa(convert_nfa_to_dfa(*nfa, compact=True), prune=False)
+    assert result["min_states"] == expected.num_states
+    assert result["dfa"].table == expected.table
+
+
+def test_run_job_state_limit(monkeypatch):
+    nfa = random_nfa(random.Random(1), max_states=5)
+    monkeypatch.setattr(batch_runner, "_load_nfa", lambda source, nfa_id: nfa)
+    limit = convert_nfa_to_dfa(*nfa, compact=True).num_states - 1
+    assert run_job("v2", 1, None, limit)["status"] == "too_large"
+
+
+def _ok(nfa_id: int):
+    nfa = random_nfa(random.Random(nfa_id))
+    dfa = convert_nfa_to_dfa(*nfa, compact=True)
+    return {"id": nfa_id, "status": "ok", "timings": {}, "nfa_states": 1, "dfa_states": dfa.num_states,
+            "min_states": dfa.num_states, "dfa": dfa}
+
+
+def test_dry_run_never_writes_the_checkpoint(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    runner = BatchRunner(checkpoint_path=checkpoint, flush_every=1, save=False)
+    runner.record(_ok(1), "one")
+    runner.record({"id": 2, "status": "timeout", "timings": {}}, "two")
+    runner.flush()
+    assert not os.path.exists(checkpoint)
+    assert runner.pending == []
+
+
+def test_flush_saves_and_checkpoints(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    runner = BatchRunner(checkpoint_path=checkpoint, flush_every=2, save=False, hash_language=False)
+    runner.db = FakeDB()
+    runner.record(_ok(1), "one")
+    assert runner.db.saved == []
+    runner.record(_ok(2), "two")
+    (dfas, options), = runner.db.saved
+    assert [name for name, _, _ in dfas] == ["one (minimized)", "two (minimized)"]
+    assert options == {"minimal": True, "hash_language": False}
+    assert batch_runner.load_checkpoint(checkpoint)["done"] == {"1": 110, "2": 111}
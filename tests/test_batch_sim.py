@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+import batch_sim
+from automaton import Automaton
+from reference import dfa_accepts, random_dfa, words
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_simulate_batch_matches_naive_run(seed):
+    rng = random.Random(seed)
+    dfa = random_dfa(rng, symbols="abc")
+    # Includes a symbol outside the alphabet and strings of mixed length
+    strings = ["".join(word) for word in words("abcd", 4)]
+    expected = [dfa_accepts(dfa, word) for word in strings]
+    assert [bool(x) for x in batch_sim.simulate_batch(dfa, strings, batch_size=17)] == expected
+    assert [bool(x) for x in batch_sim.simulate_batch(Automaton.from_dict(*dfa), strings)] == expected
+
+
+def test_multi_character_symbols():
+    dfa = ({"s", "t"}, "s", {"t"}, {("s", "ab"): "t", ("t", "ab"): "s"})
+    strings = [["ab"], ["ab", "ab"], [], ["a", "b"]]
+    assert [bool(x) for x in batch_sim.simulate_batch(dfa, strings)] == [True, False, False, False]
+
+
+def test_python_fallback_matches(monkeypatch):
+    rng = random.Random(99)
+    dfa = random_dfa(rng, max_states=8, symbols="ab")
+    strings = ["".join(word) for word in words("ab", 6)]
+    vectorized = [bool(x) for x in batch_sim.simulate_batch(dfa, strings)]
+    monkeypatch.setattr(batch_sim, "NUMPY_AVAILABLE", False)
+    assert batch_sim.simulate_batch(dfa, strings) == vectorized
@@ -0,0 +1,50 @@
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from automaton import Automaton
+from binary_format import MappedDFA, load_dfa_json, read_binary, save_dfa_json, write_binary
+from dfa_minimizer import minimize_dfa
+from nfa_to_dfa import convert_nfa_to_dfa
+from reference import automaton_accepts, random_nfa, words
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _dfa(seed: int) -> Automaton:
+    dfa = convert_nfa_to_dfa(*random_nfa(random.Random(seed), max_states=6), compact=True)
+    # Odd seeds: frozenset-of-frozenset labels, as minimize_dfa writes them
+    return minimize_dfa(dfa) if seed % 2 else dfa
+
+
+@pytest.mark.parametrize("layout", ["dense", "csr"])
+@pytest.mark.parametrize("seed", range(20))
+def test_binary_round_trip(tmp_path, seed, layout):
+    dfa = _dfa(seed)
+    path = str(tmp_path / "dfa.bin")
+    write_binary(path, dfa, layout)
+    assert read_binary(path).to_dict() == dfa.to_dict()
+    with MappedDFA(path) as mapped:
+        assert mapped.csr == (layout == "csr")
+        for word in words("abc", 4):
+            assert mapped.accepts(word) == automaton_accepts(dfa, word)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_json_round_trip(tmp_path, seed):
+    dfa = _dfa(seed)
+    path = str(tmp_path / "dfa.json")
+    save_dfa_json(path, dfa)
+    assert load_dfa_json(path).to_dict() == dfa.to_dict()
+
+
+def test_cli_to_json(tmp_path):
+    dfa = _dfa(3)
+    binary, exported = str(tmp_path / "dfa.bin"), str(tmp_path / "out.json")
+    write_binary(binary, dfa)
+    subprocess.run([sys.executable, os.path.join(REPO, "binary_format.py"), "to-json", binary, exported],
+                   check=True, cwd=REPO, capture_output=True)
+    assert load_dfa_json(exported).to_dict() == dfa.to_dict()
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from automaton import Automaton
+from canonical import canonical_form, language_hash, language_hash_from_json
+from dfa_minimizer import minimize_dfa
+from equivalence import dfa_counterexample
+from nfa_to_dfa import convert_nfa_to_dfa
+from reference import random_dfa, random_nfa
+
+
+def _renamed(dfa, rng: random.Random):
+    states, start, finals, transitions = dfa
+    names = list(states)
+    shuffled = [f"r{i}" for i in range(len(names))]
+    rng.shuffle(shuffled)
+    rename = dict(zip(names, shuffled))
+    return (set(shuffled), rename[start], {rename[f] for f in finals},
+            {(rename[p], sym): rename[t] for (p, sym), t in transitions.items()})
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_hash_ignores_state_names_and_minimality(seed):
+    rng = random.Random(seed)
+    dfa = random_dfa(rng, max_states=6)
+    expected = language_hash(*dfa)
+    assert language_hash(*_renamed(dfa, rng)) == expected
+    assert language_hash(Automaton.from_dict(*dfa)) == expected
+    assert language_hash(*minimize_dfa(*dfa)) == expected
+    assert language_hash(minimize_dfa(Automaton.from_dict(*dfa), prune=True), minimal=True) == expected
+
+
+@pytest.mark.parametrize("seed", range(80))
+def test_hash_equal_exactly_for_equal_languages(seed):
+    rng = random.Random(1000 + seed)
+    first, second = random_dfa(rng, max_states=3), random_dfa(rng, max_states=3)
+    same = dfa_counterexample(first, second) is None
+    assert (language_hash(*first) == language_hash(*second)) == same
+    assert (canonical_form(*first).table == canonical_form(*second).table) or not same
+
+
+def test_json_hash_of_nfa_and_dfa():
+    nfa = random_nfa(random.Random(3), max_states=5)
+    states, start, finals, transitions = nfa
+    nfa_json = {"type": "NFA", "states": sorted(states), "startState": start, "acceptingStates": sorted(finals),
+                "transitions": [[p, sym, t] for p, row in transitions.items() for sym, targets in row.items()
+                                for t in targets]}
+    dfa = convert_nfa_to_dfa(*nfa, compact=True)
+    assert language_hash_from_json(nfa_json) == language_hash(dfa)
+    assert language_hash_from_json(nfa_json, max_states=dfa.num_states - 1) is None
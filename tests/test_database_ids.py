@@ -0,0 +1,163 @@
+"""AutomataDB state-id storage against an in-memory stand-in for the MySQL tables."""
+import random
+
+import pytest
+
+import database
+from automaton import Automaton
+from database import AutomataDB, pack_labels, unpack_labels
+from dfa_minimizer import minimize_dfa
+from nfa_to_dfa import convert_nfa_to_dfa
+from reference import dfa_accepts, random_nfa, words
+
+
+class FakeCursor:
+    """Just enough of a cursor for the DFA save and fetch queries."""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.rows = []
+        self.lastrowid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def execute(self, sql, params=()):
+        sql = " ".join(sql.split())
+        tables = self.tables
+        if sql.startswith("INSERT INTO DFAs"):
+            tables["DFAs"].append({"ids": "TRUE" in sql, "start": params[3] if "TRUE" in sql else None,
+                                   "hash": params[2]})
+            self.lastrowid = len(tables["DFAs"])
+        elif sql.startswith("SELECT state_ids"):
+            row = tables["DFAs"][params[0] - 1]
+            self.rows = [(row["ids"], row["start"])]
+        elif "FROM DFA_Id_States" in sql:
+            self.rows = [(final,) for dfa_id, _, final in sorted(tables["id_states"]) if dfa_id == params[0]]
+        elif "FROM DFA_Id_Transitions" in sql:
+            self.rows = sorted(row[1:] for row in tables["id_transitions"] if row[0] == params[0])
+        elif "FROM DFA_State_Members" in sql:
+            self.rows = [(blob,) for dfa_id, blob in tables["members"] if dfa_id == params[0]]
+        elif "FROM DFA_States" in sql:
+            self.rows = [row[1:] for row in tables["states"] if row[0] == params[0]]
+        elif "FROM DFA_Transitions" in sql:
+            self.rows = [row[1:] for row in tables["transitions"] if row[0] == params[0]]
+        else:
+            raise AssertionError(f"unexpected query: {sql}")
+
+    def executemany(self, sql, rows):
+        group = next(group for group, query in database.DFA_ROW_SQL.items() if query == sql)
+        self.tables[group].extend(rows)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class FakeConnection:
+    def __init__(self, tables):
+        self.tables = tables
+        self.log = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def cursor(self):
+        return FakeCursor(self.tables)
+
+    def start_transaction(self):
+        self.log.append("start")
+
+    def commit(self):
+        self.log.append("commit")
+
+    def rollback(self):
+        self.log.append("rollback")
+
+    def close(self):
+        self.log.append("close")
+
+
+@pytest.fixture
+def db(monkeypatch):
+    tables = {group: [] for group in ("DFAs", *database.DFA_ROW_SQL)}
+    connection = FakeConnection(tables)
+    monkeypatch.setattr(AutomataDB, "initialize_database", lambda self: None)
+    monkeypatch.setattr(database, "get_pool", lambda config, size: None)
+    monkeypatch.setattr(AutomataDB, "connect", lambda self: connection)
+    instance = AutomataDB()
+    instance.fake_connection = connection
+    return instance
+
+
+def test_pack_labels_round_trip():
+    labels = ["q0", 7, frozenset({"a", "b"}), frozenset({frozenset({"x"}), frozenset({"y", "z"})})]
+    assert unpack_labels(pack_labels(labels)) == labels
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_state_id_round_trip(db, seed):
+    dfa = convert_nfa_to_dfa(*random_nfa(random.Random(seed), max_states=6))
+    dfa_id = db.save_dfa("ids", *dfa, state_ids=True)
+    compact = db.fetch_dfa(dfa_id, compact=True)
+    assert all(isinstance(label, int) for label in compact.labels)
+    for word in words("ab", 6):
+        assert dfa_accepts(compact.to_dict(), word) == dfa_accepts(dfa, word)
+    assert db.fetch_dfa(dfa_id, labels=True) == dfa
+
+    bare_id = db.save_dfas([("bare", dfa, None)], state_ids=True, memberships=False)[0]
+    assert db.fetch_state_labels(bare_id) is None
+
+
+def test_minimized_id_dfa_saves_with_string_labels(db):
+    dfa = convert_nfa_to_dfa(*random_nfa(random.Random(3), max_states=6))
+    dfa_id = db.save_dfa("ids", *dfa, state_ids=True)
+    minimized = minimize_dfa(*db.fetch_dfa(dfa_id))
+    saved_id = db.save_dfa("minimized", *minimized)
+    assert saved_id > 0
+    stored = db.fetch_dfa(saved_id)
+    assert all(isinstance(state, str) for state in stored[0])
+    for word in words("ab", 6):
+        assert dfa_accepts(stored, word) == dfa_accepts(dfa, word)
+
+
+def test_unexpected_error_rolls_back(db, monkeypatch):
+    def explode(*args, **kwargs):
+        raise TypeError("boom")
+
+    monkeypatch.setattr(AutomataDB, "_add_dfa", explode)
+    with pytest.raises(TypeError):
+        db.save_dfa("broken", Automaton(["q"], [], 0, bytearray(1), database.array('i')))
+    assert db.fake_connection.log[-2:] == ["rollback", "close"]
+
+
+def test_language_hash_outside_the_transaction(db, monkeypatch):
+    dfa = convert_nfa_to_dfa(*random_nfa(random.Random(4), max_states=6))
+    calls = []
+
+    def recording_hash(*args, **kwargs):
+        calls.append(list(db.fake_connection.log))
+        return "h" * 64
+
+    monkeypatch.setattr(database, "language_hash", recording_hash)
+    db.save_dfa("hashed", *dfa)
+    db.save_dfas([("a", dfa, None), ("b", dfa, None)])
+    assert len(calls) == 3
+    # No hash was computed while a transaction was open
+    assert all(log.count("start") == log.count("commit") for log in calls)
+    assert [row["hash"] for row in db.fake_connection.tables["DFAs"]] == ["h" * 64] * 3
+
+    db.save_dfas([("bulk", dfa, None)], hash_language=False)
+    assert len(calls) == 3
+    assert db.fake_connection.tables["DFAs"][-1]["hash"] is None
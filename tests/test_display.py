@@ -0,0 +1,104 @@
+import csv
+import io
+import random
+import re
+from array import array
+
+import pytest
+
+from automaton import Automaton
+from display import LEGEND_ROWS, format_state, iter_dot, iter_lines, print_automaton, symbol_ranges
+from nfa_to_dfa import convert_nfa_to_dfa
+from reference import random_nfa
+
+NODE = re.compile(r"^  (\w+) \[")
+EDGE = re.compile(r'^  (\w+) -> (\w+)(?: \[label="(.*)"\])?;$')
+
+
+def _chain(n: int, symbols: str = "ab") -> Automaton:
+    """q0 -> q1 -> ... -> q(n-1) on every symbol, last state accepting."""
+    k = len(symbols)
+    table = array('i', [min(q + 1, n - 1) for q in range(n) for _ in range(k)])
+    return Automaton([f"q{i}" for i in range(n)], list(symbols), 0, bytearray(n - 1) + b"\1", table)
+
+
+def _parse(dot: str):
+    lines = dot.splitlines()
+    nodes = {m.group(1) for m in map(NODE.match, lines) if m}
+    edges = [m.groups() for m in map(EDGE.match, lines) if m]
+    return nodes, edges
+
+
+def test_symbol_ranges():
+    assert symbol_ranges(["c", "a", "b", "d"]) == "a-d"
+    assert symbol_ranges(["a", "b", "x"]) == "a,b,x"
+    assert symbol_ranges(["a", "b", "c", "eps", "z"]) == "a-c,eps,z"
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_small_automaton_merges_edges(seed):
+    dfa = convert_nfa_to_dfa(*random_nfa(random.Random(seed), symbols="abc"), compact=True)
+    nodes, edges = _parse("".join(iter_dot(dfa)))
+    assert nodes == {f"s{i}" for i in range(dfa.num_states)} | {"start"}
+    pairs = {(q, t) for q, _, t in dfa.iter_transitions()}
+    assert len(edges) == len(pairs) + 1
+    assert all(source in nodes and target in nodes for source, target, _ in edges)
+    assert "legend" not in nodes
+
+
+@pytest.mark.parametrize("n", [61, 150, 200])
+def test_legend_is_a_visible_table(n):
+    dot = "".join(iter_dot(_chain(n)))
+    nodes, edges = _parse(dot)
+    assert "legend" in nodes and "more" not in nodes
+    legend = next(line for line in dot.splitlines() if line.startswith("  legend"))
+    assert "shape=plaintext" in legend and "<TABLE" in legend
+    assert legend.count("<TD") == -(-n // LEGEND_ROWS)
+    assert all(f"s{i} = q{i}" in legend for i in range(n))
+    # Each chain step (and the final self-loop) is one merged edge labelled with both symbols
+    assert [label for _, _, label in edges if label] == ["a,b"] * n
+
+
+def test_large_automaton_is_summarized():
+    dot = "".join(iter_dot(_chain(500), max_states=200))
+    nodes, edges = _parse(dot)
+    assert "more" in nodes and "legend" in nodes
+    assert len(nodes - {"start", "more", "legend"}) <= 200
+    assert all(source in nodes and target in nodes for source, target, _ in edges)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_text_lines_list_every_transition(seed):
+    dfa = convert_nfa_to_dfa(*random_nfa(random.Random(seed)), compact=True)
+    lines = list(iter_lines(dfa, "DFA"))
+    assert lines[0] == "\nDFA Summary:"
+    assert lines[2] == f"Start State: {{{format_state(dfa.labels[dfa.start])}}}"
+    expected = {f"{{ {format_state(dfa.labels[q])} }} --[{dfa.symbols[a]}]--> {{ {format_state(dfa.labels[t])} }}"
+                for q, a, t in dfa.iter_transitions()}
+    assert set(lines[5:]) == expected and len(lines) == 5 + len(expected)
+
+
+@pytest.mark.parametrize("fmt", ["tsv", "csv"])
+def test_table_rows(fmt):
+    dfa = _chain(5)
+    lines = list(iter_lines(dfa, fmt=fmt))
+    rows = list(csv.reader(lines, delimiter="\t" if fmt == "tsv" else ","))
+    assert rows[0] == ["kind", "state", "accepting", "symbol", "target"]
+    assert rows[1] == ["start", "q0", "", "", ""]
+    assert [row[1:3] for row in rows if row[0] == "state"] == [[f"q{i}", str(int(i == 4))] for i in range(5)]
+    assert len([row for row in rows if row[0] == "transition"]) == 10
+
+
+def test_limit_truncates_transitions():
+    lines = list(iter_lines(_chain(5), limit=3))
+    assert lines[-1] == "... 7 more transitions"
+    assert len(lines) == 5 + 3 + 1
+
+
+def test_print_automaton_streams_the_same_lines():
+    dfa = _chain(30)
+    out = io.StringIO()
+    print_automaton(dfa, title="Chain", out=out, chunk_lines=7)
+    assert out.getvalue() == "\n".join(iter_lines(dfa, "Chain")) + "\n"
+    with pytest.raises(ValueError):
+        list(iter_lines(dfa, fmt="xml"))
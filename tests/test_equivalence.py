@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from automaton import Automaton
+from dfa_minimizer import minimize_dfa
+from equivalence import dfa_counterexample, nfa_counterexample, nfa_inclusion_counterexample
+from reference import dfa_accepts, nfa_accepts, random_dfa, random_nfa, words
+
+
+def _shortest(differ, symbols: str, max_length: int):
+    """Length of the shortest word up to ``max_length`` for which ``differ`` holds, or None."""
+    return next((len(word) for word in words(symbols, max_length) if differ(word)), None)
+
+
+def _check(result, shortest, differ):
+    # Anything found by enumeration must be found, at the same length, and any answer must be a real witness
+    if result is None:
+        assert shortest is None
+    else:
+        assert differ(result)
+        assert shortest is None or len(result) == shortest
+
+
+@pytest.mark.parametrize("seed", range(80))
+def test_dfa_counterexample_matches_enumeration(seed):
+    rng = random.Random(seed)
+    first = random_dfa(rng, max_states=4)
+    # Over the same alphabet, at most 5 + 5 - 2 letters tell two 4-state DFAs (plus sinks) apart
+    second = random_dfa(rng, max_states=4) if seed % 2 else random_dfa(rng, max_states=3, symbols="bc")
+    symbols = "ab" if seed % 2 else "abc"
+
+    def differ(word):
+        return dfa_accepts(first, word) != dfa_accepts(second, word)
+
+    result = dfa_counterexample(first, second)
+    shortest = _shortest(differ, symbols, 8)
+    assert (result is None) == (shortest is None)
+    _check(result, shortest, differ)
+    assert dfa_counterexample(Automaton.from_dict(*first), second) == result
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_dfa_equivalent_to_its_minimization(seed):
+    dfa = random_dfa(random.Random(seed), max_states=6)
+    assert dfa_counterexample(dfa, minimize_dfa(*dfa)) is None
+    assert dfa_counterexample(minimize_dfa(*dfa), dfa) is None
+
+
+@pytest.mark.parametrize("seed", range(80))
+def test_nfa_inclusion_matches_enumeration(seed):
+    rng = random.Random(seed)
+    first = random_nfa(rng, max_states=4)
+    second = random_nfa(rng, max_states=4)
+
+    def missing(word):
+        return nfa_accepts(first, word) and not nfa_accepts(second, word)
+
+    _check(nfa_inclusion_counterexample(first, second), _shortest(missing, "ab", 8), missing)
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_nfa_counterexample_matches_enumeration(seed):
+    rng = random.Random(seed)
+    first = random_nfa(rng, max_states=4)
+    second = random_nfa(rng, max_states=4) if seed % 3 else first
+
+    def differ(word):
+        return nfa_accepts(first, word) != nfa_accepts(second, word)
+
+    _check(nfa_counterexample(first, second), _shortest(differ, "ab", 8), differ)
@@ -0,0 +1,89 @@
+import random
+from array import array
+
+import pytest
+
+from automaton import Automaton
+from dfa_minimizer import minimize_dfa
+from incremental_min import IncrementalMinimizer
+from reference import minimal_size
+
+
+def _random_automaton(rng: random.Random) -> Automaton:
+    n = rng.randint(2, 12)
+    k = rng.randint(1, 3)
+    table = array('i', [rng.choice([-1] + list(range(n))) if rng.random() < 0.3 else rng.randrange(n)
+                        for _ in range(n * k)])
+    accepting = bytearray(rng.random() < 0.4 for _ in range(n))
+    return Automaton([f"s{i}" for i in range(n)], [chr(97 + a) for a in range(k)], 0, accepting, table)
+
+
+def _rows(dfa: Automaton):
+    return {(dfa.labels[q], sym, dfa.labels[t]) for q, sym, t in
+            ((q, dfa.symbols[a], t) for q, a, t in dfa.iter_transitions())}
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_commit_matches_minimize_from_scratch(seed):
+    rng = random.Random(seed)
+    automaton = _random_automaton(rng)
+    inc = IncrementalMinimizer(automaton, hash_depth=rng.choice([0, 1, 2, 6]))
+    labels, symbols = automaton.labels, automaton.symbols
+    for _ in range(8):
+        for _ in range(rng.randint(1, 3)):
+            if rng.random() < 0.3:
+                inc.set_final(rng.choice(labels), rng.random() < 0.5)
+            else:
+                inc.set_transition(rng.choice(labels), rng.choice(symbols), rng.choice([None] + labels))
+        minimal, _ = inc.commit()
+        expected = minimize_dfa(inc.automaton, prune=False)
+        assert minimal.labels == expected.labels
+        assert minimal.table == expected.table
+        assert minimal.accepting == expected.accepting
+        assert minimal.start == expected.start
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_toggling_finals_with_flat_hashes(seed):
+    # hash_depth=0: blocks are only indexed by their accepting flag
+    rng = random.Random(2000 + seed)
+    automaton = _random_automaton(rng)
+    inc = IncrementalMinimizer(automaton, hash_depth=0)
+    for _ in range(10):
+        for _ in range(rng.randint(1, 3)):
+            inc.set_final(rng.choice(automaton.labels), rng.random() < 0.5)
+        minimal, _ = inc.commit()
+        expected = minimize_dfa(inc.automaton, prune=False)
+        assert minimal.labels == expected.labels
+        assert minimal.table == expected.table
+
+
+def test_negative_hash_depth_rejected():
+    with pytest.raises(ValueError):
+        IncrementalMinimizer(_random_automaton(random.Random(0)), hash_depth=-1)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_diff_describes_the_change(seed):
+    rng = random.Random(1000 + seed)
+    automaton = _random_automaton(rng)
+    inc = IncrementalMinimizer(automaton)
+    labels, symbols = automaton.labels, automaton.symbols
+    for _ in range(6):
+        before = inc.minimal
+        if rng.random() < 0.3:
+            inc.set_final(rng.choice(labels), rng.random() < 0.5)
+        else:
+            inc.set_transition(rng.choice(labels), rng.choice(symbols), rng.choice(labels))
+        after, diff = inc.commit()
+        assert set(diff.transitions_added) == _rows(after) - _rows(before)
+        assert set(diff.transitions_removed) == _rows(before) - _rows(after)
+
+
+def test_pruned_size_matches_moore_reference():
+    rng = random.Random(5)
+    for _ in range(50):
+        automaton = _random_automaton(rng)
+        dfa = automaton.to_dict()
+        symbols = "".join(automaton.symbols)
+        assert minimize_dfa(automaton, prune=True).num_states == minimal_size(dfa, symbols)
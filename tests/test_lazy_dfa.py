@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from lazy_dfa import LazyDFA, accepts, accepts_many
+from reference import nfa_accepts, random_nfa, words
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_naive_simulation(seed):
+    nfa = random_nfa(random.Random(seed))
+    strings = list(words("ab", 6))
+    assert accepts_many(nfa, strings, cache_size=3) == [nfa_accepts(nfa, word) for word in strings]
+    assert all(accepts(nfa, word) == nfa_accepts(nfa, word) for word in strings[:20])
+
+
+def test_lru_eviction_order_and_counters():
+    # p0 -a-> p1 -a-> p2, b loops: every (subset, symbol) pair is distinct
+    nfa = ({"p0", "p1", "p2"}, "p0", {"p2"},
+           {"p0": {"a": {"p1"}, "b": {"p0"}}, "p1": {"a": {"p2"}, "b": {"p1"}}})
+    lazy = LazyDFA(*nfa, cache_size=2)
+    p0, p1 = frozenset({"p0"}), frozenset({"p1"})
+
+    lazy.step(p0, "a")
+    lazy.step(p0, "b")
+    lazy.step(p0, "a")  # hit: (p0, a) becomes the most recently used
+    assert list(lazy.cache) == [(p0, "b"), (p0, "a")]
+    lazy.step(p1, "a")  # evicts the least recently used (p0, b)
+    assert list(lazy.cache) == [(p0, "a"), (p1, "a")]
+    assert lazy.stats.as_dict() == {"hits": 1, "misses": 3, "evictions": 1}
+
+    lazy.step(p0, "b")
+    assert (p0, "a") not in lazy.cache
+    assert lazy.stats.as_dict() == {"hits": 1, "misses": 4, "evictions": 2}
+
+
+def test_shared_cache_across_strings():
+    nfa = random_nfa(random.Random(7))
+    lazy = LazyDFA(*nfa)
+    lazy.accepts("abab")
+    misses = lazy.stats.misses
+    # Later runs of the same string only hit the cache
+    accepts_many(lazy, ["abab"] * 2)
+    assert lazy.stats.misses == misses
+    assert lazy.stats.hits == 2 * misses
+
+
+def test_cache_size_must_be_positive():
+    with pytest.raises(ValueError):
+        LazyDFA({"p"}, "p", set(), {}, cache_size=0)
@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+import nfa_to_dfa
+from automaton import Automaton
+from nfa_to_dfa import StateLimitExceeded, convert_nfa_to_dfa
+from reference import dfa_accepts, language, nfa_accepts, random_nfa
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_set_engine_matches_naive_simulation(seed):
+    nfa = random_nfa(random.Random(seed))
+    dfa = convert_nfa_to_dfa(*nfa, engine="set")
+    assert language(dfa_accepts, dfa, "ab", 7) == language(nfa_accepts, nfa, "ab", 7)
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_bitset_matches_set_engine(seed):
+    nfa = random_nfa(random.Random(seed))
+    expected = convert_nfa_to_dfa(*nfa, engine="set")
+    assert convert_nfa_to_dfa(*nfa, engine="bitset") == expected
+    assert convert_nfa_to_dfa(*nfa, compact=True).to_dict() == Automaton.from_dict(*expected).to_dict()
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_parallel_engine_matches_bitset(seed, monkeypatch):
+    # Send every level to the pool, however small
+    monkeypatch.setattr(nfa_to_dfa, "PARALLEL_MIN_FRONTIER", 1)
+    nfa = random_nfa(random.Random(seed), max_states=8)
+    expected = convert_nfa_to_dfa(*nfa, compact=True)
+    result = convert_nfa_to_dfa(*nfa, compact=True, engine="parallel", workers=2)
+    assert result.labels == expected.labels
+    assert result.table == expected.table
+    assert result.accepting == expected.accepting
+
+
+def test_state_limit():
+    # "The 4th symbol from the end is a": 16 DFA states
+    transitions = {"p0": {"a": {"p0", "p1"}, "b": {"p0"}},
+                   "p1": {"a": {"p2"}, "b": {"p2"}}, "p2": {"a": {"p3"}, "b": {"p3"}},
+                   "p3": {"a": {"p4"}, "b": {"p4"}}}
+    nfa = ({"p0", "p1", "p2", "p3", "p4"}, "p0", {"p4"}, transitions)
+    assert convert_nfa_to_dfa(*nfa, compact=True, max_states=16).num_states == 16
+    for engine in ("set", "bitset"):
+        with pytest.raises(StateLimitExceeded):
+            convert_nfa_to_dfa(*nfa, engine=engine, max_states=15)
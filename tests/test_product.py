@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from dfa_minimizer import minimize_dfa
+from nfa_to_dfa import StateLimitExceeded
+from product import OPERATIONS, is_empty, product, product_witness
+from reference import automaton_accepts, dfa_accepts, random_dfa, words
+
+
+def _pair(seed: int):
+    rng = random.Random(seed)
+    first = random_dfa(rng, max_states=4)
+    # Every other pair mixes the alphabets "ab" and "bc"
+    second = random_dfa(rng, max_states=4, symbols="ab" if seed % 2 else "bc")
+    return first, second, "ab" if seed % 2 else "abc"
+
+
+@pytest.mark.parametrize("operation", sorted(OPERATIONS))
+@pytest.mark.parametrize("seed", range(30))
+def test_product_matches_brute_force(seed, operation):
+    first, second, symbols = _pair(seed)
+    combine = OPERATIONS[operation]
+    result = product(first, second, operation)
+    numbered = product(first, second, operation, labels=False)
+    assert numbered.labels == list(range(numbered.num_states))
+    assert numbered.table == result.table
+    minimal = minimize_dfa(result)
+    for word in words(symbols, 5):
+        expected = combine(dfa_accepts(first, word), dfa_accepts(second, word))
+        assert automaton_accepts(result, word) == expected
+        assert automaton_accepts(minimal, word) == expected
+
+
+@pytest.mark.parametrize("operation", sorted(OPERATIONS))
+@pytest.mark.parametrize("seed", range(30))
+def test_witness_is_shortest(seed, operation):
+    first, second, symbols = _pair(seed)
+    combine = OPERATIONS[operation]
+    # 5 x 5 pairs with sinks: a non-empty product accepts a word shorter than 25 letters,
+    # but enumeration stops at 7; any witness found must still be the shortest
+    shortest = next((len(word) for word in words(symbols, 7)
+                     if combine(dfa_accepts(first, word), dfa_accepts(second, word))), None)
+    witness = product_witness(first, second, operation)
+    assert is_empty(first, second, operation) == (witness is None)
+    if witness is None:
+        assert shortest is None
+    else:
+        assert combine(dfa_accepts(first, witness), dfa_accepts(second, witness))
+        assert shortest is None or len(witness) == shortest
+
+
+def test_state_limit():
+    # Counters modulo 3 and 4: all 12 pairs are reachable
+    first = ({"0", "1", "2"}, "0", {"0"}, {(str(i), "a"): str((i + 1) % 3) for i in range(3)})
+    second = ({"0", "1", "2", "3"}, "0", {"0"}, {(str(i), "a"): str((i + 1) % 4) for i in range(4)})
+    assert product(first, second, "union", max_states=12).num_states == 12
+    with pytest.raises(StateLimitExceeded):
+        product(first, second, "union", max_states=11)
+    assert product_witness(first, second, "intersection") == []
+    assert product_witness(first, second, "difference") == ["a"] * 3
@@ -0,0 +1,93 @@
+import json
+import pickle
+
+import pytest
+
+from dfa_minimizer import minimize_dfa
+from nfa_to_dfa import convert_nfa_to_dfa
+from result_cache import (ResultCache, automaton_key, canonical_label, decode_result, encode_result,
+                          result_key)
+
+NFA = ({"p", "q"}, "p", {"q"}, {"p": {"a": {"p", "q"}}, "q": {"b": {"p"}}})
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(directory=str(tmp_path / "cache"))
+
+
+def test_key_ignores_ordering():
+    shuffled = ({"q", "p"}, "p", {"q"}, {"q": {"b": {"p"}}, "p": {"a": {"q", "p"}}})
+    assert automaton_key(*NFA) == automaton_key(*shuffled)
+
+
+def test_labels_are_type_exact():
+    assert canonical_label(1) != canonical_label("1")
+    assert canonical_label(frozenset({"a,b"})) != canonical_label(frozenset({"a", "b"}))
+    assert canonical_label(("a", "b")) != canonical_label(frozenset({"a", "b"}))
+    one = ({1}, 1, set(), {})
+    assert automaton_key(*one) != automaton_key({"1"}, "1", set(), {})
+
+
+def test_options_are_part_of_the_key():
+    assert result_key(NFA, {"prune": False}) != result_key(NFA, {"prune": True})
+    assert result_key(NFA, {"engine": "set"}) != result_key(NFA, {"engine": "bitset"})
+    assert result_key(NFA, {"engine": "set", "prune": True}) == result_key(NFA, {"prune": True, "engine": "set"})
+
+
+def test_version_is_part_of_the_key(monkeypatch):
+    before = result_key(NFA)
+    monkeypatch.setattr("result_cache.CACHE_VERSION", 0)
+    assert result_key(NFA) != before
+
+
+def test_hit_and_miss(cache):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return ({frozenset({"p"})}, frozenset({"p"}), set(), {})
+
+    first = cache.get_or_compute("dfa", NFA, compute, {"engine": "bitset"})
+    second = cache.get_or_compute("dfa", NFA, compute, {"engine": "bitset"})
+    assert first == second
+    assert len(calls) == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    cache.get_or_compute("dfa", NFA, compute, {"engine": "set"})
+    assert len(calls) == 2
+    assert cache.stats.misses == 2
+
+
+class FakeDB:
+    def __init__(self):
+        self.rows = {}
+
+    def fetch_cached_result(self, key, kind):
+        return self.rows.get((key, kind))
+
+    def save_cached_result(self, key, kind, payload):
+        self.rows[(key, kind)] = payload
+
+
+def test_payload_round_trip():
+    dfa = convert_nfa_to_dfa(*NFA)
+    minimal = minimize_dfa(*dfa)
+    assert decode_result(encode_result(dfa)) == dfa
+    assert decode_result(encode_result(minimal)) == minimal
+
+
+def test_database_tier_is_data_only(tmp_path):
+    db = FakeDB()
+    cache = ResultCache(directory=str(tmp_path / "cache"), db=db)
+    dfa = convert_nfa_to_dfa(*NFA)
+    cache.put("dfa", "k", dfa)
+    assert json.loads(db.rows[("k", "dfa")])["start"] == sorted(dfa[1])
+
+    other = ResultCache(directory=str(tmp_path / "other"), db=db)
+    assert other.get("dfa", "k") == dfa
+    assert other.stats.db_hits == 1
+
+    # A pickle planted in the shared table is a miss, never unpickled
+    db.rows[("bad", "dfa")] = pickle.dumps(dfa)
+    assert other.get("dfa", "bad") is None
+    assert other.stats.misses == 1
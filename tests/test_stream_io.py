@@ -0,0 +1,70 @@
+import io
+import json
+import random
+
+import pytest
+
+from dfa_minimizer import minimize_dfa
+from nfa_to_dfa import convert_nfa_to_dfa
+from reference import random_nfa
+from stream_io import (AutomatonWriter, FORMAT_NAME, decode_label, encode_label, iter_records,
+                       iter_transitions, load_dfa, load_nfa, read_header, write_dfa)
+
+
+def _write_nfa(target, nfa, name=None):
+    states, start, finals, transitions = nfa
+    with AutomatonWriter(target, "NFA", start, name) as out:
+        for state in states:
+            out.state(state, state in finals)
+        for from_state, row in transitions.items():
+            for symbol, targets in row.items():
+                for to_state in targets:
+                    out.transition(from_state, symbol, to_state)
+    return out
+
+
+def test_label_encoding_round_trip():
+    for label in ["q0", 3, frozenset({"a", "b"}), frozenset({frozenset({"x"}), frozenset()})]:
+        assert decode_label(json.loads(json.dumps(encode_label(label)))) == label
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_dfa_round_trip(tmp_path, seed):
+    dfa = convert_nfa_to_dfa(*random_nfa(random.Random(seed)))
+    minimal = minimize_dfa(*dfa)
+    path = str(tmp_path / "dfa.jsonl")
+    write_dfa(path, *minimal, name="minimal")
+    assert load_dfa(path) == minimal
+    header = read_header(path)
+    assert (header["format"], header["type"], header["name"]) == (FORMAT_NAME, "DFA", "minimal")
+    transitions = list(iter_transitions(path))
+    assert len(transitions) == len(minimal[3])
+    assert set(transitions) == {(p, sym, t) for (p, sym), t in minimal[3].items()}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_nfa_round_trip_through_a_stream(seed):
+    nfa = random_nfa(random.Random(seed))
+    buffer = io.StringIO()
+    writer = _write_nfa(buffer, nfa)
+    assert writer.states_written == len(nfa[0])
+    buffer.seek(0)
+    states, start, finals, transitions = load_nfa(buffer)
+    assert (states, start, finals) == nfa[:3]
+    assert transitions == {p: row for p, row in nfa[3].items() if row}
+
+
+def test_records_are_read_lazily():
+    lines = [json.dumps({"format": FORMAT_NAME, "version": 1, "type": "DFA", "startState": "q"}),
+             json.dumps(["s", "q", 1]), "not json"]
+    records = iter_records(io.StringIO("\n".join(lines) + "\n"))
+    assert next(records) == ("s", "q", True)
+    with pytest.raises(json.JSONDecodeError):
+        next(records)
+
+
+def test_rejects_other_files():
+    with pytest.raises(ValueError):
+        read_header(io.StringIO('{"states": []}\n'))
+    with pytest.raises(ValueError):
+        read_header(io.StringIO(json.dumps({"format": FORMAT_NAME, "version": 99}) + "\n"))
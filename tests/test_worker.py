@@ -0,0 +1,40 @@
+import argparse
+import json
+import sys
+
+import pytest
+
+import worker
+
+
+def _exits(args):
+    sys.exit(int(args[0]) if args[0].isdigit() else args[0])
+
+
+def _parses(args):
+    parser = argparse.ArgumentParser(prog="parses")
+    parser.add_argument("count", type=int)
+    print(parser.parse_args(args).count)
+    return 0
+
+
+@pytest.fixture
+def automaton_worker(monkeypatch):
+    monkeypatch.setattr(worker, "load_scripts", lambda: {"exits": _exits, "parses": _parses})
+    return worker.AutomatonWorker()
+
+
+def test_system_exit_becomes_a_response(automaton_worker):
+    assert automaton_worker.handle({"command": "exits", "args": ["3"]})["exit_code"] == 3
+    assert automaton_worker.handle({"command": "exits", "args": ["0"]})["exit_code"] == 0
+    response = automaton_worker.handle({"command": "exits", "args": ["bad input"]})
+    assert response == {"exit_code": 1, "output": "bad input\n"}
+    assert automaton_worker.handle({"command": "ping"})["output"] == "pong\n"
+
+
+def test_argparse_errors_keep_the_worker_alive(automaton_worker):
+    response = json.loads(automaton_worker.handle_line(json.dumps({"command": "parses", "args": ["x"], "id": 7})))
+    assert response["exit_code"] == 2
+    assert response["id"] == 7
+    assert "invalid int value" in response["output"]
+    assert automaton_worker.handle({"command": "parses", "args": ["5"]}) == {"exit_code": 0, "output": "5\n"}
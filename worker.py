@@ -0,0 +1,135 @@
+import argparse
+import io
+import json
+import os
+import socketserver
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, Callable, Dict, TextIO
+
+
+def load_scripts() -> Dict[str, Callable[..., int]]:
+    """Script name -> in-process entry point, mirroring ``python <script>.py <args>``."""
+    import db_operation
+    import dfa_minimizer
+    import display
+    import nfa_to_dfa
+
+    return {
+        "db_operation": db_operation.main,
+        "nfa_to_dfa": nfa_to_dfa.main,
+        "dfa_minimizer": dfa_minimizer.main,
+        "display": display.main,
+    }
+
+
+class AutomatonWorker:
+    """Serves the per-script commands from one long-lived interpreter.
+
+    Modules, the shared connection pool and automata loaded from the
+    database stay warm between requests. A request is one JSON object per
+    line, {"command": "db_operation", "args": ["list"], "cwd": "..."}, and
+    the reply carries the exit code and everything the command printed.
+    """
+
+    def __init__(self):
+        self.scripts = load_scripts()
+        self.loaded: Dict[int, Any] = {}
+        self.running = True
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        command = request.get("command")
+        if command == "ping":
+            return {"exit_code": 0, "output": "pong\n"}
+        if command == "shutdown":
+            self.running = False
+            return {"exit_code": 0, "output": ""}
+        entry = self.scripts.get(command)
+        if entry is None:
+            return {"exit_code": 1, "output": f"Unknown command: {command}\n"}
+
+        args = [str(arg) for arg in request.get("args", [])]
+        previous_cwd = os.getcwd()
+        output = io.StringIO()
+        try:
+            if request.get("cwd"):
+                os.chdir(request["cwd"])
+            with redirect_stdout(output), redirect_stderr(output):
+                if command == "db_operation":
+                    exit_code = entry(args, cache=self.loaded)
+                else:
+                    exit_code = entry(args)
+        except SystemExit as e:
+            # sys.exit() or an argparse error ends the command, not the worker
+            if e.code is None or isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                output.write(f"{e.code}\n")
+                exit_code = 1
+        except Exception as e:
+            output.write(f"ERROR: {e}\n")
+            exit_code = 1
+        finally:
+            os.chdir(previous_cwd)
+        return {"exit_code": exit_code if exit_code is not None else 0, "output": output.getvalue()}
+
+    def handle_line(self, line: str) -> str:
+        try:
+            request = json.loads(line)
+            response = self.handle(request)
+            if "id" in request:
+                response["id"] = request["id"]
+        except json.JSONDecodeError as err:
+            response = {"exit_code": 1, "output": f"Invalid request: {err}\n"}
+        return json.dumps(response) + "\n"
+
+
+def serve_stdio(worker: AutomatonWorker, stdin: TextIO, stdout: TextIO) -> None:
+    """Newline-delimited JSON over stdin/stdout (for a parent that spawns the worker)."""
+    for line in stdin:
+        if not line.strip():
+            continue
+        stdout.write(worker.handle_line(line))
+        stdout.flush()
+        if not worker.running:
+            break
+
+
+def serve_socket(worker: AutomatonWorker, path: str) -> None:
+    """Newline-delimited JSON over a Unix socket; requests are handled one at a time."""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                line = raw.decode("utf-8")
+                if not line.strip():
+                    continue
+                self.wfile.write(worker.handle_line(line).encode("utf-8"))
+                self.wfile.flush()
+                if not worker.running:
+                    break
+
+    if os.path.exists(path):
+        os.unlink(path)
+    with socketserver.UnixStreamServer(path, Handler) as server:
+        print(f"Automaton worker listening on {path}")
+        try:
+            while worker.running:
+                server.handle_request()
+        finally:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Long-lived automaton worker")
+    parser.add_argument("--socket", help="serve on this Unix socket instead of stdin/stdout")
+    args = parser.parse_args()
+
+    # Keep stray prints (e.g. import notices) off the protocol stream
+    protocol_out = sys.stdout
+    sys.stdout = sys.stderr
+    worker = AutomatonWorker()
+    if args.socket:
+        serve_socket(worker, args.socket)
+    else:
+        serve_stdio(worker, sys.stdin, protocol_out)
@@ -0,0 +1,54 @@
+import json
+import os
+import socket
+import sys
+from typing import Any, Callable, Dict, List, Optional
+
+# Path of the Unix socket served by ``python worker.py --socket PATH``
+SOCKET_ENV = "AUTOMATA_WORKER_SOCKET"
+
+# Scripts the worker serves; ``python worker_client.py <script> <args>`` runs one
+SCRIPTS = ("db_operation", "nfa_to_dfa", "dfa_minimizer", "display")
+
+
+def call_worker(command: str, args: List[str], socket_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Send one request to a running worker; None if no worker is reachable."""
+    socket_path = socket_path or os.environ.get(SOCKET_ENV)
+    if not socket_path or not hasattr(socket, "AF_UNIX"):
+        return None
+    request = {"command": command, "args": list(args), "cwd": os.getcwd()}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            with sock.makefile("rw", encoding="utf-8") as stream:
+                stream.write(json.dumps(request) + "\n")
+                stream.flush()
+                line = stream.readline()
+    except OSError:
+        return None
+    return json.loads(line) if line else None
+
+
+def run_cli(command: str, args: List[str], local: Callable[[List[str]], int]) -> int:
+    """Run a script command through the worker if one is up, else in this process."""
+    response = call_worker(command, args)
+    if response is None:
+        return local(args)
+    sys.stdout.write(response.get("output", ""))
+    return response.get("exit_code", 1)
+
+
+def _run_local(script: str) -> Callable[[List[str]], int]:
+    def local(args: List[str]) -> int:
+        import importlib
+        return importlib.import_module(script).main(args)
+    return local
+
+
+if __name__ == "__main__":
+    # Thin entry point for main.cpp: only this module is imported before the
+    # request is forwarded, so a warm worker saves the whole import graph
+    if len(sys.argv) < 2 or sys.argv[1] not in SCRIPTS:
+        print(f"Usage: python worker_client.py <{'|'.join(SCRIPTS)}> [args]")
+        sys.exit(2)
+    sys.exit(run_cli(sys.argv[1], sys.argv[2:], _run_local(sys.argv[1])))